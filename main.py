@@ -1,137 +1,117 @@
 import pandas as pd
 import numpy as np
 import os
+import logging
+import argparse
 import matplotlib.pyplot as plt
 import seaborn as sns
-from model.team_model import TeamModel, calculate_team_needs
+from model import instrumentation
+from model.team_needs import calculate_team_needs
+from model.need_matrix import NeedMatrix
+from model.simulation import run_free_agency, simulate_free_agency, get_signing_probabilities, get_contract_distributions
 
 
 import model.free_agency as free_agency
 # Choose a year to evaluate
 year = 2024
-# Load free agent data
-free_agents = free_agency.get_free_agents_by_year(year)
-print(free_agents)
-
-# Load team data from that year
-teams = free_agency.get_teams_by_year(year)
-
-# Calculate team need for each free agent
-need_matrix = calculate_team_needs(free_agents, teams)
-
-# Get team cap for each team
-team_caps = {}
-for team in teams['team_name']:
-    team_cap = free_agency.get_team_cap_for_year(team, year)
-    team_caps[team] = team_cap
-print(team_caps)
-
-# Visualize the results
-print(need_matrix)
-
-# Visualize the need matrix as a heatmap
-if not need_matrix.empty:
-    plt.figure(figsize=(16, 12))
-    sns.heatmap(need_matrix, cmap='RdYlGn', annot=True, fmt='.2f')
-    plt.title(f'Team Need Matrix for {year} Free Agents')
-    plt.ylabel('Free Agent')
-    plt.xlabel('Team')
-    plt.tight_layout()
-    
-    # Save the heatmap
-    output_dir = os.path.join('.', 'output')
-    os.makedirs(output_dir, exist_ok=True)
-    plt.savefig(os.path.join(output_dir, f'need_matrix_heatmap_{year}.png'))
-    
-    print(f"\nHeatmap saved to {output_dir}/need_matrix_heatmap_{year}.png")
-else:
-    print("Need matrix is empty, cannot create heatmap.")
-
-# Run simulation 
-
-def get_max_bid(team_name, player_name, team_caps, need_matrix, scaling_factor=1.0):
-    """
-    Returns the maximum amount a team can bid for a player based on need and available cap.
-    Need score is scaled to reflect aggressiveness.
-    """
-    cap = team_caps.get(team_name, 0)
-    need_score = need_matrix.at[player_name, team_name]
-    
-    # Normalize: turn need score into a % of cap to bid
-    bid = min(cap, need_score * scaling_factor)
-    return round(bid, 2)
-
-def run_auction_for_player(player_name, need_matrix, team_caps):
+
+logger = logging.getLogger(__name__)
+
+def run(num_simulations=0):
     """
-    Runs an auction for a player between the top 2 bidding teams.
-    Returns the winning team and final bid amount.
+    Compute the need matrix for the year and run free agency.
+
+    Args:
+        num_simulations (int): Number of randomized free agency simulations to run
+                               (0 runs only the single deterministic pass)
     """
-    # Get all bids
-    bids = {
-        team: get_max_bid(team, player_name, team_caps, need_matrix)
-        for team in need_matrix.columns
-    }
-
-    # Sort by bid descending
-    top_bidders = sorted(bids.items(), key=lambda x: x[1], reverse=True)[:2]
-
-    if len(top_bidders) < 2:
-        return top_bidders[0][0], top_bidders[0][1]  # Only one bidder
-
-    team1, bid1 = top_bidders[0]
-    team2, bid2 = top_bidders[1]
-
-    # Simulate a small bidding war 
-    winning_bid = max(bid1, bid2) + 0.1 * min(bid1, bid2)
-    winning_bid = min(winning_bid, team_caps[team1])  # Cannot bid more than cap
-
-    return team1, round(winning_bid, 2)
-
-
-
-
-# GAME
-draft_picks = {}
-contract_amounts = {}
-
-# While there are still players and teams to pick
-remaining_free_agents = need_matrix.index.tolist()
-remaining_teams = need_matrix.columns.tolist()
-
-while remaining_free_agents and remaining_teams:
-    for team in remaining_teams[:]:  # Use a copy so we can modify the list inside the loop
-        if team not in need_matrix.columns:
-            continue  # Skip if team already drafted
-        
-        # Get the team's highest need free agent still available
-        team_needs = need_matrix[team].loc[remaining_free_agents]
-        
-        if team_needs.empty:
-            continue  # No players left for this team to pick
-        
-        # Choose the top priority player
-        top_pick = team_needs.idxmax()
-        
-        # Run auction
-        winner, final_bid = run_auction_for_player(top_pick, need_matrix, team_caps)
-
-        # Update results
-        draft_picks[winner] = top_pick
-        team_caps[winner] -= final_bid  # Deduct bid from cap
-        print(f"{winner} wins the auction for {top_pick} with a bid of ${final_bid}M")
-        contract_amounts[winner] = final_bid
-
-        # Remove drafted player
-        remaining_free_agents.remove(top_pick)
-        need_matrix = need_matrix.drop(index=top_pick)
-        need_matrix = need_matrix.drop(columns=winner)
-        
-        # print(f"Remaining free agents: {remaining_free_agents}")
-        # print(f"Remaining teams: {remaining_teams}")
-        # print(f"Winner: {winner}")
-        remaining_teams.remove(winner)
-
-# Show final draft picks
-print("\nFinal Free Agent Signings:")
-for team, player in draft_picks.items():
-    print(f"{team}: {player} for ${contract_amounts[team]}M")
+    # Load free agent data
+    with instrumentation.stage('load_data'):
+        free_agents = free_agency.get_free_agents_by_year(year)
+        # Load team data from that year
+        teams = free_agency.get_teams_by_year(year)
+    logger.debug("Free agents:\n%s", free_agents)
+
+    # Calculate team need for each free agent
+    with instrumentation.stage('calculate_team_needs'):
+        need_matrix = calculate_team_needs(free_agents, teams)
+
+    # Get team cap for each team
+    with instrumentation.stage('cap_lookup'):
+        team_caps = dict(zip(teams['team_name'], free_agency.get_all_team_caps(year, teams['team_name']).tolist()))
+    logger.debug("Team caps: %s", team_caps)
+
+    # Visualize the results
+    logger.info("Need matrix:\n%s", need_matrix)
+
+    # Visualize the need matrix as a heatmap
+    with instrumentation.stage('heatmap'):
+        save_heatmap(need_matrix)
+
+    # Run simulation
+    if num_simulations > 0:
+        with instrumentation.stage('simulate_free_agency'):
+            signings = simulate_free_agency(need_matrix, team_caps, num_runs=num_simulations)
+
+        logger.info("Signing probabilities over %d simulations:\n%s", num_simulations,
+                    get_signing_probabilities(signings, num_simulations))
+        logger.info("Contract amount distributions:\n%s", get_contract_distributions(signings))
+
+    # GAME
+    with instrumentation.stage('run_free_agency'):
+        draft_picks, contract_amounts = run_free_agency(NeedMatrix(need_matrix), team_caps)
+
+    # Show final draft picks
+    logger.info("Final Free Agent Signings:")
+    for team, player in draft_picks.items():
+        logger.info("%s: %s for $%sM", team, player, contract_amounts[team])
+
+def save_heatmap(need_matrix):
+    if not need_matrix.empty:
+        plt.figure(figsize=(16, 12))
+        sns.heatmap(need_matrix, cmap='RdYlGn', annot=True, fmt='.2f')
+        plt.title(f'Team Need Matrix for {year} Free Agents')
+        plt.ylabel('Free Agent')
+        plt.xlabel('Team')
+        plt.tight_layout()
+
+        # Save the heatmap
+        output_dir = os.path.join('.', 'output')
+        os.makedirs(output_dir, exist_ok=True)
+        plt.savefig(os.path.join(output_dir, f'need_matrix_heatmap_{year}.png'))
+
+        logger.info("Heatmap saved to %s/need_matrix_heatmap_%d.png", output_dir, year)
+    else:
+        logger.warning("Need matrix is empty, cannot create heatmap.")
+
+def main():
+    parser = argparse.ArgumentParser(description="Compute the need matrix and run free agency")
+    parser.add_argument('--trace', nargs='?', const=instrumentation.DEFAULT_TRACE_PATH, default=None, metavar='PATH',
+                        help="write stage timings and counters as JSON to PATH (default: %s); "
+                             "the %s environment variable does the same" % (instrumentation.DEFAULT_TRACE_PATH,
+                                                                             instrumentation.TRACE_ENV_VAR))
+    parser.add_argument('--simulations', type=int, default=0, metavar='N',
+                        help="number of randomized free agency simulations to run (default: 0, only the deterministic pass)")
+    parser.add_argument('--log-level', default='INFO', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
+                        help="least severe messages to show (default: INFO; DEBUG also shows the input data)")
+    args = parser.parse_args()
+    if args.simulations < 0:
+        parser.error("--simulations must be 0 or more")
+
+    logging.basicConfig(level=args.log_level, format='%(message)s')
+
+    trace_path = instrumentation.get_trace_path(args.trace)
+    if trace_path is not None:
+        instrumentation.enable()
+
+    with instrumentation.stage('total'):
+        run(args.simulations)
+
+    if trace_path is not None:
+        trace = instrumentation.write_trace(trace_path)
+        logger.info("Trace written to %s", trace_path)
+        for stage in trace['stages']:
+            logger.debug("%s: %.1f ms", stage['name'], stage['seconds'] * 1000)
+
+if __name__ == "__main__":
+    main()
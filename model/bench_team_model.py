@@ -0,0 +1,54 @@
+"""
+Time TeamModel training in each of its TRAINING_MODES.
+
+Trains a fresh model per mode and seed on the Madden team data without
+saving it, and reports the epochs run, epochs per second, wall time and test
+R² of each mode, optionally also with early stopping. Run from the project root:
+
+    python model/bench_team_model.py --seeds 3 --patience 50
+"""
+
+import os
+import sys
+import time
+import argparse
+import contextlib
+import numpy as np
+import torch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from model.team_model import TeamModel, TRAINING_MODES, load_team_data
+
+def time_mode(data, mode, seed, patience=None):
+    """Train one model; return (epochs run, seconds, test R²)."""
+    torch.manual_seed(seed)
+    model = TeamModel()
+    start = time.perf_counter()
+    # train reports its own progress; only the timings are wanted here
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        _, r2 = model.train(data=data, force_train=True, mode=mode, save=False, verbose=False,
+                            **({'patience': patience} if patience else {}))
+    return model.epochs_trained, time.perf_counter() - start, r2
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark TeamModel training modes")
+    parser.add_argument('--modes', nargs='+', default=list(TRAINING_MODES), choices=list(TRAINING_MODES))
+    parser.add_argument('--seeds', type=int, default=3, help="models trained per mode; R² is averaged over them")
+    parser.add_argument('--patience', type=int, default=None, help="also time each mode with early stopping after this many epochs")
+    args = parser.parse_args()
+
+    data = load_team_data()
+    print(f"{len(data)} teams, {torch.get_num_threads()} torch threads")
+    print(f"{'mode':<16} {'epochs':>7} {'epochs/s':>9} {'seconds':>8} {'R²':>13}")
+    runs_to_time = [(mode, None) for mode in args.modes]
+    if args.patience:
+        runs_to_time += [(mode, args.patience) for mode in args.modes]
+    for mode, patience in runs_to_time:
+        runs = [time_mode(data, mode, seed, patience) for seed in range(args.seeds)]
+        epochs, seconds, r2 = (np.array(values, dtype=float) for values in zip(*runs))
+        label = f"{mode}+stop" if patience else mode
+        print(f"{label:<16} {epochs.mean():>7.0f} {epochs.sum() / seconds.sum():>9.1f} {seconds.mean():>8.2f} "
+              f"{r2.mean():>7.3f} ± {r2.std():.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""
+Columnar store for the project's input data.
+
+Each input file is converted once into a Parquet dataset partitioned by year
+under data/store, so loaders can read only the years and columns they need
+instead of parsing the whole Excel or CSV file. Run from the project root:
+
+    python model/data_store.py
+"""
+
+import pandas as pd
+import argparse
+import shutil
+import os
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+except ImportError:  # The store is optional; loaders fall back to the original files
+    pa = None
+    ds = None
+
+def get_project_root():
+    """Get the absolute path to the project root directory"""
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.dirname(current_dir)
+
+STORE_DIR = os.path.join(get_project_root(), "data", "store")
+
+# Dataset name -> (source file relative to the project root, year column used to partition)
+DATASETS = {
+    'teams': ("model/madden_data_processed.xlsx", 'year'),
+    'free_agents': ("model/nfl_rb_free_agents_madden_2015_2024.csv", 'Season'),
+    'cap_space': ("model/nfl_cap_space_2015_2025.csv", 'year'),
+    'player_data': ("data/player_data.csv", 'Season'),
+}
+
+# Dataset name -> (dtype of named columns, dtype of every other numeric column). Depth chart
+# ratings and wins are int8, stats float32 and names categorical. Cap space is whole dollars
+# in a nullable Int32: in cents the largest cap figures (about $36M) would not fit in an int32.
+DTYPES = {
+    'teams': ({'team_name': 'category', 'year': 'int16', 'regular_season_wins': 'int8',
+               'playoff_wins': 'int8', 'total_wins': 'int8'}, 'int8'),
+    'free_agents': ({'Season': 'int16', 'Player Name': 'category', 'Madden OVR': 'int8'}, 'float32'),
+    'cap_space': ({'Team': 'category', 'year': 'int16', 'cap_space': 'Int32'}, 'float32'),
+    'player_data': ({'Name': 'category', 'Season': 'int16', 'Age': 'int8', 'Team': 'category',
+                     'Lg': 'category', 'Pos': 'category'}, 'float32'),
+}
+
+def _cast(column, dtype):
+    converted = column.astype(dtype)
+    # Integer casts wrap around or truncate silently, so they are checked against the original
+    if pd.api.types.is_integer_dtype(converted) and not (converted == column).fillna(True).all():
+        raise ValueError(f"{column.name} does not fit in {dtype}")
+    return converted
+
+def apply_dtypes(name, data):
+    """
+    Cast a dataset's columns to the dtypes in DTYPES.
+
+    Columns that already have their dtype are left as they are, and text
+    columns not named in DTYPES stay text.
+
+    Args:
+        name (str): Dataset name, one of DATASETS
+        data (DataFrame): The dataset, e.g. from load_source or a CSV file
+
+    Returns:
+        DataFrame: The dataset with its columns cast
+    """
+    column_dtypes, numeric_dtype = DTYPES[name]
+    casts = {}
+    # Decided from the dtypes alone; only the columns that change are taken out of the frame
+    for col, current in data.dtypes.items():
+        dtype = column_dtypes.get(col)
+        if dtype is None and pd.api.types.is_numeric_dtype(current) and not pd.api.types.is_bool_dtype(current):
+            dtype = numeric_dtype
+        if dtype is not None and current != dtype:
+            casts[col] = _cast(data[col], dtype)
+    if not casts:
+        return data
+    data = data.copy(deep=False)
+    for col, column in casts.items():
+        data[col] = column
+    return data
+
+def parse_dollars(values):
+    """
+    Parse dollar strings such as "$3,807,890" into whole dollars.
+
+    Args:
+        values (Series): Dollar strings; anything else (e.g. a blank cell) becomes missing
+
+    Returns:
+        Series: Nullable Int32 dollar amounts
+    """
+    numbers = pd.to_numeric(values.astype(str).str.replace(r'[$,"]', '', regex=True), errors='coerce')
+    return _cast(numbers.round(), 'Int32')
+
+def get_dataset_path(name):
+    return os.path.join(STORE_DIR, name)
+
+def has_dataset(name):
+    """Return True if the dataset has been converted and pyarrow is available to read it."""
+    return pa is not None and os.path.isdir(get_dataset_path(name))
+
+def _get_partitioning(name):
+    return ds.partitioning(pa.schema([(DATASETS[name][1], pa.int16())]), flavor='hive')
+
+def load_source(name):
+    """
+    Load a dataset from its original Excel or CSV file.
+
+    Cap space is reshaped from one column per year into one row per team and
+    year, with the dollar strings parsed into whole dollars. Columns are cast
+    to the dtypes in DTYPES.
+
+    Args:
+        name (str): Dataset name, one of DATASETS
+
+    Returns:
+        DataFrame: The dataset with its year column as integers
+    """
+    relative_path, year_column = DATASETS[name]
+    file_path = os.path.join(get_project_root(), relative_path)
+
+    if file_path.endswith('.xlsx'):
+        data = pd.read_excel(file_path)
+    else:
+        data = pd.read_csv(file_path)
+
+    if name == 'cap_space':
+        # Team cells look like "ARI  ARI"; summary rows (Averages, Totals) have no abbreviation pair
+        data['Team'] = data['Team'].str.split().str[0]
+        data = data.melt(id_vars='Team', var_name=year_column, value_name='cap_space')
+        data['cap_space'] = parse_dollars(data['cap_space'])
+
+    # Rows without a year (e.g. career totals in player_data) cannot be placed in a partition
+    years = pd.to_numeric(data[year_column], errors='coerce')
+    data = data[years.notna()].copy()
+    data[year_column] = years[years.notna()].astype('int64')
+
+    # Text columns that only held numbers next to those rows are stored as numbers
+    for col in data.columns:
+        if data[col].dtype == object or pd.api.types.is_string_dtype(data[col]):
+            numbers = pd.to_numeric(data[col], errors='coerce')
+            if numbers.notna().sum() == data[col].notna().sum():
+                data[col] = numbers
+    return apply_dtypes(name, data)
+
+def convert_dataset(name):
+    """
+    Convert one dataset into a Parquet dataset partitioned by year, replacing
+    any previous version of it.
+
+    Args:
+        name (str): Dataset name, one of DATASETS
+    """
+    if pa is None:
+        raise ImportError("pyarrow is required to build the data store")
+
+    data = load_source(name)
+    table = pa.Table.from_pandas(data, preserve_index=True)
+
+    dataset_path = get_dataset_path(name)
+    shutil.rmtree(dataset_path, ignore_errors=True)
+    ds.write_dataset(table, dataset_path, format='parquet', partitioning=_get_partitioning(name))
+
+    print(f"Wrote {len(data)} rows of {name} to {dataset_path}")
+
+def read_dataset(name, columns=None, years=None):
+    """
+    Read a dataset from the store, loading only the requested columns and years.
+
+    Args:
+        name (str): Dataset name, one of DATASETS
+        columns (list, optional): Columns to load. If None, loads every column.
+        years (list, optional): Years to load. If None, loads every year.
+
+    Returns:
+        DataFrame: The requested data, or None if the dataset has not been converted
+    """
+    if not has_dataset(name):
+        return None
+
+    year_column = DATASETS[name][1]
+    dataset = ds.dataset(get_dataset_path(name), format='parquet', partitioning=_get_partitioning(name))
+    pandas_metadata = dataset.schema.pandas_metadata or {}
+    index_columns = [col for col in pandas_metadata.get('index_columns', []) if isinstance(col, str)]
+
+    # Column order of the original file; the year column is moved to the end by partitioning
+    all_columns = [col['name'] for col in pandas_metadata.get('columns', [])
+                   if col['name'] is not None and col['name'] not in index_columns]
+    if columns is None:
+        columns = all_columns or dataset.schema.names
+
+    # Partitions for other years are skipped without being opened
+    year_filter = ds.field(year_column).isin([int(year) for year in years]) if years is not None else None
+    table = dataset.to_table(columns=list(columns) + index_columns, filter=year_filter)
+
+    # A store built before DTYPES comes back with its wider types
+    data = apply_dtypes(name, table.to_pandas())
+    return data[[col for col in columns if col in data.columns]]
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert the input data files into the columnar store")
+    parser.add_argument(
+        '--datasets',
+        nargs='+',
+        choices=list(DATASETS),
+        default=list(DATASETS),
+        help="datasets to convert (default: all)"
+    )
+    args = parser.parse_args()
+
+    for name in args.datasets:
+        convert_dataset(name)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+"""
+Compact depth charts for the Madden team data.
+
+The processed team frame has one column per depth chart slot (C1..C6,
+CB1..CB12, ..., WR1..WR13), about 150 in all and half of them empty. A
+DepthChart keeps each team's ratings as int8, sorted best first within each
+position, with 0 in the slots that hold no player: a few hundred bytes
+per team instead of a row of float64 columns. Candidate rosters are built on
+those arrays, and to_dense lays them out as the model's float32 feature
+matrix only at the end.
+"""
+
+import re
+import functools
+import numpy as np
+
+# Highest rating an int8 slot can hold; Madden ratings stop at 99
+MAX_RATING = np.iinfo(np.int8).max
+
+def get_position_columns(columns, player_position):
+    """
+    Get the depth chart columns for a position (e.g., HB1, HB2, ... for 'HB').
+
+    Args:
+        columns (Index): Columns of the Madden team data
+        player_position (str): Position to look up (e.g., 'HB')
+
+    Returns:
+        list: Column names for the position, ordered by depth chart slot
+    """
+    pattern = re.compile(rf'^{re.escape(player_position)}(\d+)$')
+    slots = []
+    for col in columns:
+        match = pattern.match(str(col))
+        if match:
+            slots.append((int(match.group(1)), col))
+    return [col for _, col in sorted(slots)]
+
+def get_position_families(columns):
+    """
+    Group the depth chart columns of the Madden team data by position.
+
+    Args:
+        columns (Index): Columns of the Madden team data
+
+    Returns:
+        dict: Maps each position (e.g., 'QB', 'WR', 'LT') to its ordered columns
+    """
+    return {position: list(position_columns) for position, position_columns in _position_families(tuple(columns))}
+
+# The same few column sets are grouped on every call, so each is parsed once
+@functools.lru_cache(maxsize=32)
+def _position_families(columns):
+    positions = []
+    for col in columns:
+        match = re.match(r'^([A-Z]+)\d+$', str(col))
+        if match and match.group(1) not in positions:
+            positions.append(match.group(1))
+    return tuple((position, tuple(get_position_columns(columns, position))) for position in positions)
+
+def insert_player_ratings(position_ratings, player_ratings):
+    """
+    Insert each candidate rating into each team's depth chart for one position.
+
+    Mirrors calculate_team_need: a player joins a team only if better than
+    its worst player at the position, in which case the ratings are re-sorted in
+    descending order and the lowest one is dropped.
+
+    Args:
+        position_ratings (ndarray): Array of shape (teams, slots) with the current ratings
+        player_ratings (ndarray): Array of shape (players,) with the candidate ratings
+
+    Returns:
+        ndarray: Array of shape (players, teams, slots) with the updated ratings
+    """
+    num_slots = position_ratings.shape[1]
+
+    # Each team's depth chart is sorted once, best player first
+    sorted_ratings = -np.sort(-position_ratings, axis=1)
+
+    # Slot the candidate lands in on each team: the number of players rated at least as high
+    insert_at = (sorted_ratings[None, :, :] >= player_ratings[:, None, None]).sum(axis=2)
+
+    # Players above the candidate keep their slot, players below move down one
+    slot = np.arange(num_slots)[None, None, :]
+    moved_down = np.concatenate([sorted_ratings[:, :1], sorted_ratings[:, :-1]], axis=1)
+    with_player = np.where(slot < insert_at[:, :, None], sorted_ratings[None, :, :],
+                           np.where(slot == insert_at[:, :, None], player_ratings[:, None, None],
+                                    moved_down[None, :, :]))
+
+    improves = player_ratings[:, None] > sorted_ratings[None, :, -1]
+    return np.where(improves[:, :, None], with_player, position_ratings[None, :, :])
+
+def to_ratings(values):
+    """Convert ratings to int8, refusing values that int8 would not hold exactly."""
+    values = np.asarray(values)
+    if values.size and (values.min() < 0 or values.max() > MAX_RATING or np.any(values != np.round(values))):
+        raise ValueError(f"Ratings must be whole numbers from 0 to {MAX_RATING}")
+    return values.astype(np.int8)
+
+class DepthChart:
+    """
+    The depth charts of several teams: int8 ratings of shape (teams, slots),
+    each position's slots side by side and sorted best first. Empty slots
+    have rating 0.
+    """
+    def __init__(self, team_names, positions, ratings):
+        """
+        Args:
+            team_names (ndarray): Name of each team
+            positions (dict): Each position's slot columns in order (see get_position_families)
+            ratings (ndarray): Ratings of shape (teams, slots), laid out position by position,
+                               with 0 for an empty slot
+        """
+        self.team_names = np.asarray(team_names, dtype=object)
+        self.positions = {position: list(columns) for position, columns in positions.items()}
+        self.ratings = to_ratings(ratings)
+
+        # Slot range of each position and slot of each column, e.g. 'HB2' -> the second HB slot
+        self.position_slots = {}
+        self.slot_of_column = {}
+        start = 0
+        for position, columns in self.positions.items():
+            self.position_slots[position] = slice(start, start + len(columns))
+            self.slot_of_column.update({col: start + i for i, col in enumerate(columns)})
+            start += len(columns)
+
+        # Best player first at each position, the order a signing leaves a depth chart in
+        for slots in self.position_slots.values():
+            self.ratings[:, slots] = -np.sort(-self.ratings[:, slots], axis=1)
+
+    @classmethod
+    def from_frame(cls, teams, columns=None):
+        """
+        Build the depth charts from rows of the Madden team data.
+
+        Args:
+            teams (DataFrame): One row per team, with team_name and the depth chart columns
+            columns (list, optional): Depth chart columns to keep. If None, keeps every column
+                                      named like a slot (e.g. C1, HB3, WR13).
+
+        Returns:
+            DepthChart: The teams' depth charts
+        """
+        positions = get_position_families(teams.columns if columns is None else columns)
+        slot_columns = [col for position_columns in positions.values() for col in position_columns]
+
+        # Picking the columns out of the values array is much cheaper than a column selection
+        indexer = teams.columns.get_indexer(slot_columns)
+        if (indexer < 0).any():
+            missing = [col for col, position in zip(slot_columns, indexer) if position < 0]
+            raise KeyError(f"Missing depth chart columns: {missing}")
+        ratings = teams.to_numpy()[:, indexer].astype(float)
+
+        team_names = teams['team_name'].to_numpy() if 'team_name' in teams.columns else np.arange(len(teams))
+        return cls(team_names, positions, ratings)
+
+    def __len__(self):
+        return len(self.ratings)
+
+    @property
+    def nbytes(self):
+        """Bytes held by the ratings."""
+        return self.ratings.nbytes
+
+    def get_gather_index(self, feature_columns):
+        """
+        Slot of each feature column, for laying ratings out in the model's column order.
+
+        Args:
+            feature_columns (list): Feature columns in training order; all must be depth chart slots
+
+        Returns:
+            ndarray: Index into the slot axis for each feature column
+        """
+        try:
+            return np.array([self.slot_of_column[col] for col in feature_columns], dtype=np.intp)
+        except KeyError as e:
+            raise KeyError(f"{e.args[0]} is not a depth chart column of these teams") from None
+
+    def to_dense(self, feature_columns, ratings=None):
+        """
+        Lay ratings out as a float32 feature matrix in the model's column order.
+
+        Args:
+            feature_columns (list): Feature columns in training order
+            ratings (ndarray, optional): int8 ratings of shape (..., slots), e.g. from with_players.
+                                         If None, uses the teams' own ratings.
+
+        Returns:
+            ndarray: float32 array of shape (rows, features)
+        """
+        ratings = self.ratings if ratings is None else ratings
+        ratings = ratings.reshape(-1, ratings.shape[-1])
+        return ratings[:, self.get_gather_index(feature_columns)].astype(np.float32)
+
+    def with_players(self, player_ratings, player_positions):
+        """
+        Depth charts of every team with each candidate added at the candidate's position.
+
+        Args:
+            player_ratings (array-like): Overall rating of each candidate
+            player_positions (str or array-like): Position of each candidate, or a single
+                                                  position shared by all of them (e.g., 'HB')
+
+        Returns:
+            ndarray: int8 ratings of shape (players, teams, slots); a candidate whose position
+                     has no slots, or who is no better than a team's worst player there,
+                     leaves that team as it is
+        """
+        player_ratings = to_ratings(player_ratings)
+        num_players = len(player_ratings)
+        if isinstance(player_positions, str):
+            player_positions = [player_positions] * num_players
+        player_positions = np.asarray(player_positions, dtype=object)
+
+        rosters = np.broadcast_to(self.ratings, (num_players,) + self.ratings.shape).copy()
+        for position in dict.fromkeys(player_positions):
+            if position not in self.position_slots:
+                continue
+            players = np.flatnonzero(player_positions == position)
+            slots = self.position_slots[position]
+            rosters[players, :, slots] = insert_player_ratings(self.ratings[:, slots], player_ratings[players])
+        return rosters
@@ -1,6 +1,14 @@
 import pandas as pd
+import numpy as np
 import os
 
+try:
+    from model import data_store, instrumentation, team_ids
+except ImportError:  # Run as a script from the model directory
+    import data_store
+    import instrumentation
+    import team_ids
+
 def get_project_root():
     """Get the absolute path to the project root directory"""
     # Assume this file is in the model directory, get parent directory
@@ -12,111 +20,169 @@ def get_file_path(relative_path):
     """Convert a relative path to an absolute path from project root"""
     return os.path.join(get_project_root(), relative_path)
 
-def get_free_agents_by_year(year):
+# Parsed data files keyed by path, each stored with the modification time it was read at
+_cache = {}
+
+def load_cached(relative_path, loader, key=None):
+    """
+    Load a data file once and keep the parsed result in memory. The file is
+    parsed again only when its modification time changes.
+
+    Args:
+        relative_path (str): Path to the file (or store dataset directory) from the project root
+        loader (callable): Function that parses the file at the given absolute path
+        key (hashable, optional): Distinguishes several results loaded from the same file
+
+    Returns:
+        object: Whatever the loader returned for the current version of the file
+    """
+    file_path = get_file_path(relative_path)
+    mtime = os.stat(file_path).st_mtime_ns
+
+    cached = _cache.get((file_path, key))
+    instrumentation.record_cache('data_cache', cached is not None and cached[0] == mtime)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, loader(file_path))
+        _cache[(file_path, key)] = cached
+    return cached[1]
+
+def clear_cache():
+    """Drop every cached data file so the next lookup reads from disk."""
+    _cache.clear()
+
+def _load_by_year(data, year_column):
+    """Split a DataFrame into one frame per year, plus an empty frame for unknown years."""
+    frames = {year: frame for year, frame in data.groupby(year_column)}
+    return frames, data.iloc[0:0]
+
+def _load_free_agents(file_path):
+    return _load_by_year(data_store.apply_dtypes('free_agents', pd.read_csv(file_path)), 'Season')
+
+def _load_teams(file_path):
+    return _load_by_year(data_store.apply_dtypes('teams', pd.read_excel(file_path)), 'year')
+
+def _load_cap_space(file_path):
+    """
+    Parse the cap space table into a DataFrame indexed by team id with one
+    column of whole dollars (nullable Int32) per year.
+    """
+    cap_space_df = pd.read_csv(file_path)
+
+    # Team cells look like "ARI  ARI"; summary rows (Averages, Totals) are not a team
+    cap_space_df.index = team_ids.get_team_ids(cap_space_df['Team'].str.split().str[0])
+    cap_space_df = cap_space_df.drop(columns='Team')
+
+    cap_space_df = cap_space_df.apply(data_store.parse_dollars)
+    cap_space_df.columns = cap_space_df.columns.astype(int)
+    # A relocated team has a row per city (OAK and LV); each year takes the one that has a value
+    return cap_space_df[cap_space_df.index != team_ids.UNKNOWN_TEAM].groupby(level=0).first()
+
+def _read_store_year(name, year, columns=None):
+    """Read one year of a store dataset, cached until the dataset is converted again."""
+    columns = tuple(columns) if columns is not None else None
+    return load_cached(
+        os.path.join("data", "store", name),
+        lambda _: data_store.read_dataset(name, columns, [year]),
+        key=(int(year), columns)
+    )
+
+def _caps_by_team_id(caps):
+    """Turn one year of the cap space store (Team, cap_space) into a Series indexed by team id."""
+    caps = pd.Series(caps['cap_space'].to_numpy(dtype=float, na_value=np.nan), index=team_ids.get_team_ids(caps['Team']))
+    caps = caps[(caps.index != team_ids.UNKNOWN_TEAM) & caps.notna()]
+    return caps[~caps.index.duplicated(keep='first')]
+
+def _get_caps_for_year(year):
+    """Get a Series of cap space indexed by team id, or None for an unknown year."""
+    if data_store.has_dataset('cap_space'):
+        # Cached already keyed by team id, so lookups skip the conversion
+        caps = load_cached(
+            os.path.join("data", "store", "cap_space"),
+            lambda _: _caps_by_team_id(data_store.read_dataset('cap_space', ['Team', 'cap_space'], [year])),
+            key=(int(year), 'team_id')
+        )
+        return caps if not caps.empty else None
+
+    cap_space_df = load_cached("./model/nfl_cap_space_2015_2025.csv", _load_cap_space)
+    if int(year) not in cap_space_df.columns:
+        return None
+    return cap_space_df[int(year)].astype(float)
+
+def get_free_agents_by_year(year, columns=None):
     """
     Returns a list of free agent running backs for a given year.
     
     Args:
         year (int): The year to filter free agents for
+        columns (list, optional): Columns to load. If None, loads every column.
         
     Returns:
         pandas.DataFrame: DataFrame containing free agents for the specified year
     """
-    file_path = get_file_path("./model/nfl_rb_free_agents_madden_2015_2024.csv")
-    free_agents_df = pd.read_csv(file_path)
-    free_agents_df = free_agents_df[free_agents_df['Season'] == year]
-    return free_agents_df
+    if data_store.has_dataset('free_agents'):
+        return _read_store_year('free_agents', year, columns).copy()
+
+    free_agents_by_year, no_free_agents = load_cached("./model/nfl_rb_free_agents_madden_2015_2024.csv", _load_free_agents)
+    free_agents_df = free_agents_by_year.get(year, no_free_agents)
+    return (free_agents_df[columns] if columns is not None else free_agents_df).copy()
     
-def get_teams_by_year(year):
+def get_teams_by_year(year, columns=None):
     """
     Returns a list of NFL teams for a given year.
     
     Args:
         year (int): The year to filter teams for
+        columns (list, optional): Columns to load. If None, loads every column.
         
     Returns:
         pandas.DataFrame: DataFrame containing teams for the specified year
     """
-    file_path = get_file_path("./model/madden_data_processed.xlsx")
-    teams_df = pd.read_excel(file_path)
-    teams_df = teams_df[teams_df['year'] == year]
-    return teams_df
+    if data_store.has_dataset('teams'):
+        return _read_store_year('teams', year, columns).copy()
+
+    teams_by_year, no_teams = load_cached("./model/madden_data_processed.xlsx", _load_teams)
+    teams_df = teams_by_year.get(year, no_teams)
+    return (teams_df[columns] if columns is not None else teams_df).copy()
 
 def get_team_cap_for_year(team_name, year):
     """
     Returns the cap space for a specific team in a given year.
     
     Args:
-        team_name (str): The name of the team (e.g., "PHI")
+        team_name (str): The name of the team (e.g., "Philadelphia Eagles")
         year (int): The year to get cap space for
         
     Returns:
         float: The cap space value for the specified team and year
     """
-    # Dictionary to convert full team names to abbreviations
-    team_name_to_abbr = {
-        "Arizona Cardinals": "ARI",
-        "Atlanta Falcons": "ATL",
-        "Baltimore Ravens": "BAL",
-        "Buffalo Bills": "BUF",
-        "Carolina Panthers": "CAR",
-        "Chicago Bears": "CHI",
-        "Cincinnati Bengals": "CIN",
-        "Cleveland Browns": "CLE",
-        "Dallas Cowboys": "DAL",
-        "Denver Broncos": "DEN",
-        "Detroit Lions": "DET",
-        "Green Bay Packers": "GB",
-        "Houston Texans": "HOU",
-        "Indianapolis Colts": "IND",
-        "Jacksonville Jaguars": "JAX",
-        "Kansas City Chiefs": "KC",
-        "Los Angeles Chargers": "LAC",
-        "Los Angeles Rams": "LAR",
-        "Las Vegas Raiders": "LV",
-        "Miami Dolphins": "MIA",
-        "Minnesota Vikings": "MIN",
-        "New England Patriots": "NE",
-        "New Orleans Saints": "NO",
-        "New York Giants": "NYG",
-        "New York Jets": "NYJ",
-        "Oakland Raiders": "OAK",
-        "Philadelphia Eagles": "PHI",
-        "Pittsburgh Steelers": "PIT",
-        "San Diego Chargers": "SD",
-        "Seattle Seahawks": "SEA",
-        "San Francisco 49ers": "SF",
-        "St. Louis Rams": "STL",
-        "Tampa Bay Buccaneers": "TB",
-        "Tennessee Titans": "TEN",
-        "Washington Commanders": "WAS",
-        "Washington Football Team": "WAS",
-        "Washington Redskins": "WAS"
-    }
+    team_id = team_ids.get_team_id(team_name)
+    if team_id is None:
+        return None
     
-    # Get team abbreviation
-    team_abbr = team_name_to_abbr.get(team_name)
-    if not team_abbr:
+    caps = _get_caps_for_year(year)
+    if caps is None or team_id not in caps.index:
         return None
     
-    file_path = get_file_path("./model/nfl_cap_space_2015_2025.csv")
-    cap_space_df = pd.read_csv(file_path)
+    return float(caps[team_id])
+
+def get_all_team_caps(year, team_names):
+    """
+    Returns the cap space of several teams in a given year in one lookup.
     
-    # Find the row for the specified team
-    team_row = cap_space_df[cap_space_df['Team'].str.contains(team_abbr)]
+    Args:
+        year (int): The year to get cap space for
+        team_names (list): Team names or abbreviations (e.g., "Philadelphia Eagles")
+        
+    Returns:
+        numpy.ndarray: Cap space of each team in the order given, NaN where unknown
+    """
+    ids = team_ids.get_team_ids(team_names)
     
-    if team_row.empty:
-        return None
+    caps = _get_caps_for_year(year)
+    if caps is None:
+        return np.full(len(ids), np.nan)
     
-    # Get the cap space for the specified year
-    if str(year) in team_row.columns:
-        cap_space = team_row[str(year)].values[0]
-        # Remove $ and commas, then convert to float
-        if isinstance(cap_space, str):
-            cap_space = float(cap_space.replace('$', '').replace(',', '').replace('"', ''))
-        return cap_space
-    else:
-        return None
+    return caps.reindex(ids).to_numpy(dtype=float, na_value=np.nan)
 
 if __name__ == "__main__":
     # Test the free agency functions
@@ -148,3 +214,7 @@ if __name__ == "__main__":
     # Test getting team cap for 2024
     team_cap = get_team_cap_for_year("Philadelphia Eagles", test_year)
     print(f"\nTeam cap for Philadelphia Eagles in {test_year}: {team_cap}")
+
+    # Test getting every team's cap for 2024 in one call
+    team_caps = get_all_team_caps(test_year, teams['team_name'])
+    print(f"\nCap space for all teams in {test_year}: {team_caps}")
@@ -0,0 +1,142 @@
+"""
+Lightweight instrumentation for the free agency pipeline.
+
+Stage timers and counters (model forward calls and the rows they evaluate,
+data cache hits and misses, auctions run) are collected only while tracing
+is enabled, and are written out as a JSON trace whose numbers can be compared
+between runs to catch regressions without a profiler. Tracing is switched on
+by setting the RB_TRACE environment variable to the path of the trace (or to
+1 for output/trace.json), or with main.py --trace. While it is off, every call
+here returns at once. Run from the project root:
+
+    python main.py --trace
+    RB_TRACE=output/trace.json python main.py
+"""
+
+import os
+import json
+import time
+import contextlib
+
+try:
+    from model.atomic_io import atomic_write
+except ImportError:  # Run as a script from the model directory
+    from atomic_io import atomic_write
+
+TRACE_ENV_VAR = "RB_TRACE"
+DEFAULT_TRACE_PATH = os.path.join("output", "trace.json")
+
+# Values of the environment variable that mean "trace to the default path"
+_DEFAULT_PATH_VALUES = {'1', 'true', 'yes', 'on'}
+
+_enabled = False
+_start = None
+_stages = []
+_counters = {}
+
+def get_trace_path(path=None):
+    """
+    Get the path a trace should be written to.
+
+    Args:
+        path (str, optional): Path given on the command line; takes precedence over RB_TRACE
+
+    Returns:
+        str: The trace path, or None if tracing was not asked for
+    """
+    value = path or os.environ.get(TRACE_ENV_VAR, '').strip()
+    if not value or value.lower() in {'0', 'false', 'no', 'off'}:
+        return None
+    return DEFAULT_TRACE_PATH if value.lower() in _DEFAULT_PATH_VALUES else value
+
+def enable():
+    """Start collecting, discarding anything collected before."""
+    global _enabled, _start
+    reset()
+    _enabled = True
+    _start = time.perf_counter()
+
+def disable():
+    global _enabled
+    _enabled = False
+
+def is_enabled():
+    return _enabled
+
+def reset():
+    """Drop the stages and counters collected so far."""
+    global _start
+    _stages.clear()
+    _counters.clear()
+    _start = time.perf_counter()
+
+@contextlib.contextmanager
+def stage(name):
+    """
+    Time a stage of the pipeline.
+
+    Stages may nest; each is recorded when it ends, with its start relative
+    to when tracing was enabled.
+
+    Args:
+        name (str): Name of the stage, e.g. 'calculate_team_needs'
+    """
+    if not _enabled:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        end = time.perf_counter()
+        _stages.append({'name': name, 'start': start - _start, 'seconds': end - start})
+
+def count(name, amount=1):
+    """Add to a counter, e.g. count('model.rows', len(rows))."""
+    if _enabled:
+        _counters[name] = _counters.get(name, 0) + amount
+
+def record_cache(name, hit):
+    """Count a lookup in a cache as a hit or a miss."""
+    if _enabled:
+        count(f"{name}.hits" if hit else f"{name}.misses")
+
+def get_trace():
+    """
+    Get what has been collected.
+
+    Returns:
+        dict: 'stages' in the order they ended, 'counters' and, for every cache
+              with lookups, its 'cache_hit_rates'
+    """
+    hit_rates = {}
+    for name in _counters:
+        if name.endswith('.hits') or name.endswith('.misses'):
+            cache = name.rsplit('.', 1)[0]
+            hits = _counters.get(f"{cache}.hits", 0)
+            lookups = hits + _counters.get(f"{cache}.misses", 0)
+            hit_rates[cache] = hits / lookups
+    return {
+        'stages': list(_stages),
+        'counters': dict(sorted(_counters.items())),
+        'cache_hit_rates': dict(sorted(hit_rates.items())),
+    }
+
+def write_trace(path):
+    """
+    Write the trace as JSON.
+
+    Args:
+        path (str): Path of the trace file; its directory is created if needed
+
+    Returns:
+        dict: The trace that was written
+    """
+    trace = get_trace()
+    with atomic_write(path) as f:
+        json.dump(trace, f, indent=4)
+    return trace
+
+# Processes started with RB_TRACE set collect from the start
+if get_trace_path() is not None:
+    enable()
@@ -0,0 +1,179 @@
+"""
+Versioned store of trained team win models.
+
+Every model TeamModel.train saves is also filed under
+model/saved_models/registry/<key>, where the key is made from a hash of its
+feature schema (the set of feature column names) and a hash of the data it
+was trained on. Each entry keeps the model files with a metadata.json that
+records the input size, the feature columns in training order and the test
+metrics. index.json maps each schema to its entries, so the model for a set
+of columns is found with one dictionary lookup instead of loading a model
+and failing on a shape mismatch. This module does not import torch. List the
+registered models from the project root:
+
+    python model/model_registry.py
+    python model/model_registry.py --add-saved
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import argparse
+from datetime import datetime, timezone
+import numpy as np
+
+try:
+    from model import team_runtime
+    from model.atomic_io import atomic_write
+except ImportError:  # Run as a script from the model directory
+    import team_runtime
+    from atomic_io import atomic_write
+
+REGISTRY_DIR = os.path.join(team_runtime.get_model_dir(), "registry")
+INDEX_FILENAME = "index.json"
+METADATA_FILENAME = "metadata.json"
+
+# Files of a saved model; the ones that exist are copied into its entry
+ARTIFACT_FILENAMES = ["team_model.pt", "team_scaler.pkl", "team_model_config.json",
+                      team_runtime.BUNDLE_FILENAME, "team_model.pt2"]
+
+def get_schema_hash(feature_columns):
+    """Hash of a feature schema. Column order does not matter, since models select their columns by name."""
+    return hashlib.sha256(json.dumps(sorted(feature_columns)).encode()).hexdigest()
+
+def get_data_hash(X, y, columns):
+    """Hash of the features, targets and feature names a model is trained on."""
+    digest = hashlib.sha256()
+    digest.update(json.dumps(list(columns)).encode())
+    digest.update(np.ascontiguousarray(X, dtype=np.float64).tobytes())
+    digest.update(np.ascontiguousarray(y, dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
+def get_artifact_key(schema_hash, data_hash):
+    return f"{schema_hash[:16]}-{data_hash[:16]}"
+
+def load_index(registry_dir=REGISTRY_DIR):
+    """
+    Read the registry index.
+
+    Returns:
+        dict: Schema hash -> {'latest': key of the newest entry, 'artifacts': {data hash: key}}
+    """
+    path = os.path.join(registry_dir, INDEX_FILENAME)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+def _save_index(index, registry_dir):
+    with atomic_write(os.path.join(registry_dir, INDEX_FILENAME)) as f:
+        json.dump(index, f, indent=4)
+
+def register(model_dir, feature_columns, data_hash, metrics=None, registry_dir=REGISTRY_DIR):
+    """
+    File a saved model in the registry and make it the latest one for its schema.
+
+    Args:
+        model_dir (str): Directory the model was saved to by TeamModel.save_model
+        feature_columns (list): Feature columns in training order
+        data_hash (str): Hash of the training data, from get_data_hash
+        metrics (dict, optional): Test metrics, such as mse and r2
+        registry_dir (str): Root directory of the registry
+
+    Returns:
+        str: Directory of the registry entry
+    """
+    schema_hash = get_schema_hash(feature_columns)
+    key = get_artifact_key(schema_hash, data_hash)
+    artifact_dir = os.path.join(registry_dir, key)
+    os.makedirs(artifact_dir, exist_ok=True)
+
+    # copy2 keeps the modification times, so the bundle is still seen as current
+    for filename in ARTIFACT_FILENAMES:
+        source = os.path.join(model_dir, filename)
+        if os.path.exists(source):
+            shutil.copy2(source, os.path.join(artifact_dir, filename))
+
+    metadata = {
+        'key': key,
+        'schema_hash': schema_hash,
+        'data_hash': data_hash,
+        'input_size': len(feature_columns),
+        'feature_columns': list(feature_columns),
+        'metrics': metrics or {},
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+    }
+    config_path = os.path.join(model_dir, "team_model_config.json")
+    if os.path.exists(config_path):
+        with open(config_path) as f:
+            metadata['config'] = json.load(f)
+    with open(os.path.join(artifact_dir, METADATA_FILENAME), 'w') as f:
+        json.dump(metadata, f, indent=4)
+
+    index = load_index(registry_dir)
+    entry = index.setdefault(schema_hash, {'latest': key, 'artifacts': {}})
+    entry['artifacts'][data_hash] = key
+    entry['latest'] = key
+    _save_index(index, registry_dir)
+
+    print(f"Model registered as {key}")
+    return artifact_dir
+
+def find_model(feature_columns, data_hash=None, registry_dir=REGISTRY_DIR):
+    """
+    Look up the registered model for a feature schema.
+
+    Args:
+        feature_columns (list): Feature columns the model must take, in any order
+        data_hash (str, optional): Only accept the model trained on this data. If None,
+                                   takes the latest model for the schema.
+        registry_dir (str): Root directory of the registry
+
+    Returns:
+        str: Directory of the registry entry, or None if no model matches
+    """
+    entry = load_index(registry_dir).get(get_schema_hash(feature_columns))
+    if entry is None:
+        return None
+    key = entry['artifacts'].get(data_hash) if data_hash else entry['latest']
+    if key is None:
+        return None
+    artifact_dir = os.path.join(registry_dir, key)
+    return artifact_dir if os.path.exists(os.path.join(artifact_dir, METADATA_FILENAME)) else None
+
+def load_metadata(artifact_dir):
+    """Read the metadata.json of a registry entry."""
+    with open(os.path.join(artifact_dir, METADATA_FILENAME)) as f:
+        return json.load(f)
+
+def main():
+    parser = argparse.ArgumentParser(description="List the registered team models")
+    parser.add_argument('--add-saved', action='store_true',
+                        help="register the model in saved_models, assuming it was trained on the team data in this repository")
+    args = parser.parse_args()
+
+    if args.add_saved:
+        import sys
+        sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        from model.team_model import TeamModel, load_team_data
+        model = TeamModel()
+        if not model.load_model():
+            raise SystemExit(1)
+        X, y = model.preprocess_data(load_team_data())
+        register(team_runtime.get_model_dir(), list(X.columns), get_data_hash(X.to_numpy(dtype=float),
+                 y.to_numpy(dtype=float), X.columns))
+
+    index = load_index()
+    if not index:
+        print("No registered models.")
+    for schema_hash, entry in index.items():
+        print(f"Schema {schema_hash[:16]}:")
+        for key in entry['artifacts'].values():
+            metadata = load_metadata(os.path.join(REGISTRY_DIR, key))
+            metrics = ', '.join(f"{name} {value:.3f}" for name, value in metadata['metrics'].items())
+            latest = " (latest)" if key == entry['latest'] else ""
+            print(f"  {key}: {metadata['input_size']} features, {metadata['created']}{latest}  {metrics}")
+
+if __name__ == "__main__":
+    main()
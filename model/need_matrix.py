@@ -0,0 +1,97 @@
+import pandas as pd
+import numpy as np
+
+class NeedMatrix:
+    """
+    Read-only view of a need matrix that tracks which free agents and teams are
+    still in play, so signings never copy the underlying data.
+    """
+    def __init__(self, need_matrix):
+        """
+        Args:
+            need_matrix (DataFrame): Rows are free agents, columns are teams and
+                                     values are need scores
+        """
+        self._setup(need_matrix.to_numpy(), need_matrix.index.tolist(), need_matrix.columns.tolist())
+
+    @classmethod
+    def from_values(cls, values, players, teams):
+        """
+        Build a need matrix directly from an array of need scores.
+
+        Args:
+            values (ndarray): Array of shape (players, teams) with the need scores
+            players (list): Free agent names, one per row
+            teams (list): Team names, one per column
+
+        Returns:
+            NeedMatrix: Need matrix with every free agent and team still in play
+        """
+        need_matrix = cls.__new__(cls)
+        need_matrix._setup(values, list(players), list(teams))
+        return need_matrix
+
+    def _setup(self, values, players, teams):
+        self.players = players
+        self.teams = teams
+        self.values = values
+
+        self.player_index = {player: i for i, player in enumerate(self.players)}
+        self.team_index = {team: i for i, team in enumerate(self.teams)}
+
+        self.active_players = np.ones(len(self.players), dtype=bool)
+        self.active_teams = np.ones(len(self.teams), dtype=bool)
+
+    @property
+    def remaining_players(self):
+        return [self.players[i] for i in np.flatnonzero(self.active_players)]
+
+    @property
+    def remaining_teams(self):
+        return [self.teams[i] for i in np.flatnonzero(self.active_teams)]
+
+    def has_remaining(self):
+        """Return True while at least one free agent and one team are left."""
+        return bool(self.active_players.any() and self.active_teams.any())
+
+    def is_active_team(self, team_name):
+        return bool(self.active_teams[self.team_index[team_name]])
+
+    def get_need(self, player_name, team_name):
+        return self.values[self.player_index[player_name], self.team_index[team_name]]
+
+    def remove_player(self, player_name):
+        self.active_players[self.player_index[player_name]] = False
+
+    def remove_team(self, team_name):
+        self.active_teams[self.team_index[team_name]] = False
+
+    def top_player(self, team_name):
+        """
+        Get the remaining free agent the team needs the most.
+
+        Ties go to the free agent listed first, matching DataFrame.idxmax.
+
+        Args:
+            team_name (str): Team to look up
+
+        Returns:
+            str: Name of the free agent, or None if no free agents are left
+        """
+        if not self.active_players.any():
+            return None
+
+        needs = self.values[:, self.team_index[team_name]]
+        needs = np.where(self.active_players & ~np.isnan(needs), needs, -np.inf)
+        top = int(np.argmax(needs))
+        if needs[top] == -np.inf:
+            return None
+        return self.players[top]
+
+    def to_frame(self):
+        """Return the remaining free agents and teams as a DataFrame."""
+        return pd.DataFrame(
+            self.values[np.ix_(self.active_players, self.active_teams)],
+            index=self.remaining_players,
+            columns=self.remaining_teams
+        )
@@ -0,0 +1,258 @@
+import pandas as pd
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+import logging
+import os
+
+from model import instrumentation
+from model.need_matrix import NeedMatrix
+
+logger = logging.getLogger(__name__)
+
+# Need scores and cap vector handed to each worker once, when the pool starts
+_shared = {}
+
+def get_bids(need_scores, cap_vector, scaling_factor=1.0):
+    """
+    Returns the maximum amount each team can bid for a player based on need and available cap.
+    Need score is scaled to reflect aggressiveness.
+
+    Args:
+        need_scores (ndarray): Need scores of shape (teams,) or (players, teams)
+        cap_vector (ndarray): Cap space of each team, shape (teams,)
+        scaling_factor (float): Multiplier turning need scores into bids
+
+    Returns:
+        ndarray: Bids with the same shape as need_scores, rounded to two decimals
+    """
+    return np.round(np.minimum(cap_vector, need_scores * scaling_factor), 2)
+
+def run_auctions(need_scores, cap_vector, active_teams=None, scaling_factor=1.0):
+    """
+    Runs independent auctions for one or more players at once. Each player goes
+    to the highest bidder, which pays its bid plus 10% of the runner-up's bid,
+    capped by its cap space. Ties go to the team listed first. Teams with
+    unknown (NaN) cap space do not bid.
+
+    Args:
+        need_scores (ndarray): Need scores of shape (teams,) or (players, teams)
+        cap_vector (ndarray): Cap space of each team, shape (teams,)
+        active_teams (ndarray, optional): Boolean mask of the teams allowed to bid
+        scaling_factor (float): Multiplier turning need scores into bids
+
+    Returns:
+        tuple: (winners, winning_bids) arrays with one entry per player. Winners
+               are team indices, or -1 if no team was allowed to bid.
+    """
+    bids = get_bids(np.atleast_2d(need_scores), cap_vector, scaling_factor)
+    # argmax would take a NaN bid, from a team missing from the cap table, as the highest
+    bids = np.where(np.isfinite(bids), bids, -np.inf)
+    if active_teams is not None:
+        bids = np.where(active_teams, bids, -np.inf)
+    rows = np.arange(len(bids))
+
+    # Top two bidders
+    first = np.argmax(bids, axis=1)
+    bid1 = bids[rows, first]
+    bids[rows, first] = -np.inf
+    bid2 = bids[rows, np.argmax(bids, axis=1)]
+
+    # Simulate a small bidding war, which a lone bidder wins at its own bid
+    winning_bids = np.round(np.minimum(bid1 + 0.1 * bid2, cap_vector[first]), 2)
+    winning_bids = np.where(np.isneginf(bid2), bid1, winning_bids)
+    winners = np.where(np.isneginf(bid1), -1, first)
+
+    return winners, winning_bids
+
+def run_auction_for_player(player_name, need_matrix, cap_vector, scaling_factor=1.0):
+    """
+    Runs an auction for a player between the top 2 bidding teams still in play.
+    Returns the winning team and final bid amount, or (None, None) if no team
+    still in play can bid.
+    """
+    need_scores = need_matrix.values[need_matrix.player_index[player_name]]
+    winners, winning_bids = run_auctions(need_scores, cap_vector, need_matrix.active_teams, scaling_factor)
+    if winners[0] < 0:
+        return None, None
+    return need_matrix.teams[winners[0]], float(winning_bids[0])
+
+def run_free_agency(need_matrix, team_caps, scaling_factor=1.0, team_order=None, verbose=True):
+    """
+    Run free agency until every free agent or every team is gone. In each round
+    the teams take turns nominating the free agent they need most, who is then
+    auctioned off; a team leaves once it signs a player.
+
+    Args:
+        need_matrix (NeedMatrix): Need scores for every free agent and team
+        team_caps (dict): Cap space for each team, updated as players sign
+        scaling_factor (float): Multiplier turning need scores into bids
+        team_order (list, optional): Order in which teams pick. Defaults to the
+                                     column order of the need matrix.
+        verbose (bool): If True, log each signing
+
+    Returns:
+        tuple: (draft_picks, contract_amounts) dictionaries keyed by team
+    """
+    draft_picks = {}
+    contract_amounts = {}
+
+    if team_order is None:
+        team_order = need_matrix.teams
+
+    # Cap space aligned with the need matrix columns for the auction kernel
+    cap_vector = np.array([team_caps.get(team, 0) for team in need_matrix.teams], dtype=float)
+
+    while need_matrix.has_remaining():
+        for team in team_order:
+            if not need_matrix.is_active_team(team):
+                continue  # Skip if team already drafted
+
+            # Get the team's highest need free agent still available
+            top_pick = need_matrix.top_player(team)
+
+            if top_pick is None:
+                continue  # No players left for this team to pick
+
+            # Run auction
+            winner, final_bid = run_auction_for_player(top_pick, need_matrix, cap_vector, scaling_factor)
+            instrumentation.count('simulation.auctions')
+
+            if winner is None:
+                # No team still in play can bid, so the player goes unsigned
+                need_matrix.remove_player(top_pick)
+                continue
+
+            # Update results
+            draft_picks[winner] = top_pick
+            team_caps[winner] -= final_bid  # Deduct bid from cap
+            cap_vector[need_matrix.team_index[winner]] -= final_bid
+            if verbose:
+                logger.info("%s wins the auction for %s with a bid of $%sM", winner, top_pick, final_bid)
+            contract_amounts[winner] = final_bid
+
+            # Remove the drafted player and the team that signed the player
+            need_matrix.remove_player(top_pick)
+            need_matrix.remove_team(winner)
+
+    return draft_picks, contract_amounts
+
+def _init_worker(values, players, teams, caps):
+    _shared['values'] = values
+    _shared['players'] = players
+    _shared['teams'] = teams
+    _shared['caps'] = caps
+
+def _run_simulations(runs, need_noise, scaling_factor, scaling_noise, shuffle_order):
+    """
+    Run a chunk of randomized free agency simulations inside a worker.
+
+    Args:
+        runs (list): (run number, SeedSequence) pairs to simulate
+
+    Returns:
+        list: (run, player_name, team_name, contract_amount) for every signing
+    """
+    values = _shared['values']
+    players = _shared['players']
+    teams = _shared['teams']
+    caps = _shared['caps']
+
+    signings = []
+    for run, seed in runs:
+        rng = np.random.default_rng(seed)
+
+        # Perturb need scores (in wins), team aggressiveness and pick order
+        noisy_values = np.maximum(values + rng.normal(0.0, need_noise, size=values.shape), 0.0)
+        run_scaling_factor = scaling_factor * rng.lognormal(0.0, scaling_noise)
+        team_order = [teams[i] for i in rng.permutation(len(teams))] if shuffle_order else teams
+
+        need_matrix = NeedMatrix.from_values(noisy_values, players, teams)
+        team_caps = dict(zip(teams, caps))
+        draft_picks, contract_amounts = run_free_agency(
+            need_matrix, team_caps, run_scaling_factor, team_order, verbose=False
+        )
+
+        for team, player in draft_picks.items():
+            signings.append((run, player, team, contract_amounts[team]))
+
+    return signings
+
+def simulate_free_agency(need_matrix, team_caps, num_runs=1000, need_noise=0.1, scaling_factor=1.0,
+                         scaling_noise=0.1, shuffle_order=True, max_workers=None, seed=None):
+    """
+    Run many randomized free agency simulations in a process pool.
+
+    Every run adds Gaussian noise to the need scores, draws a log-normal
+    multiplier for the scaling factor and, optionally, shuffles the team pick order.
+
+    Args:
+        need_matrix (DataFrame): Need matrix from calculate_team_needs
+        team_caps (dict): Cap space for each team
+        num_runs (int): Number of simulations to run
+        need_noise (float): Standard deviation of the noise added to need scores
+        scaling_factor (float): Base multiplier turning need scores into bids
+        scaling_noise (float): Standard deviation of the log of the scaling multiplier
+        shuffle_order (bool): If True, teams pick in a random order in every run
+        max_workers (int, optional): Number of worker processes. Defaults to the CPU count.
+        seed (int, optional): Seed that makes the simulations reproducible
+
+    Returns:
+        DataFrame: One row per signing with run, player_name, team_name and contract_amount
+    """
+    players = need_matrix.index.tolist()
+    teams = need_matrix.columns.tolist()
+    values = need_matrix.to_numpy(dtype=float)
+    caps = np.array([team_caps.get(team, 0) for team in teams], dtype=float)
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+
+    # Spread the runs over a few chunks per worker to keep every worker busy
+    seeds = np.random.SeedSequence(seed).spawn(num_runs)
+    chunks = np.array_split(np.arange(num_runs), min(num_runs, max_workers * 4))
+
+    signings = []
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                             initargs=(values, players, teams, caps)) as executor:
+        futures = [
+            executor.submit(_run_simulations, [(run, seeds[run]) for run in chunk],
+                            need_noise, scaling_factor, scaling_noise, shuffle_order)
+            for chunk in chunks if len(chunk)
+        ]
+        for future in futures:
+            signings.extend(future.result())
+
+    return pd.DataFrame(signings, columns=['run', 'player_name', 'team_name', 'contract_amount'])
+
+def get_signing_probabilities(signings, num_runs):
+    """
+    Get how often each free agent signed with each team across the simulations.
+
+    Args:
+        signings (DataFrame): Output of simulate_free_agency
+        num_runs (int): Number of simulations that were run
+
+    Returns:
+        DataFrame: Rows are free agents, columns are teams and values are the
+                   share of runs in which the team signed the player
+    """
+    counts = signings.pivot_table(
+        index='player_name',
+        columns='team_name',
+        values='run',
+        aggfunc='count',
+        fill_value=0
+    )
+    return counts / num_runs
+
+def get_contract_distributions(signings):
+    """
+    Summarize the contract amount each free agent signed for across the simulations.
+
+    Args:
+        signings (DataFrame): Output of simulate_free_agency
+
+    Returns:
+        DataFrame: Count, mean, standard deviation and percentiles per free agent
+    """
+    return signings.groupby('player_name')['contract_amount'].describe(percentiles=[0.05, 0.25, 0.5, 0.75, 0.95])
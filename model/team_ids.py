@@ -0,0 +1,123 @@
+"""
+Canonical team identities.
+
+Every NFL franchise has a dense integer id, its index in FRANCHISES. Each
+name, abbreviation and nickname it has gone by maps to that id, including
+relocations and renames (Oakland/Las Vegas Raiders, San Diego/Los Angeles
+Chargers, St. Louis/Los Angeles Rams, the Washington names), so loaders join
+on ids rather than matching names. The alias table is built once, at import.
+Aliases are matched ignoring case and punctuation, so "Las Vegas Raiders",
+"las_vegas_raiders" and "LV" are the same team.
+"""
+
+import re
+import numpy as np
+import pandas as pd
+
+# Current name, current abbreviation, then the franchise's other names and abbreviations
+FRANCHISES = [
+    ("Arizona Cardinals", "ARI", ["Phoenix Cardinals", "St. Louis Cardinals"], ["ARZ", "PHO"]),
+    ("Atlanta Falcons", "ATL", [], []),
+    ("Baltimore Ravens", "BAL", [], ["BLT"]),
+    ("Buffalo Bills", "BUF", [], []),
+    ("Carolina Panthers", "CAR", [], []),
+    ("Chicago Bears", "CHI", [], []),
+    ("Cincinnati Bengals", "CIN", [], []),
+    ("Cleveland Browns", "CLE", [], ["CLV"]),
+    ("Dallas Cowboys", "DAL", [], []),
+    ("Denver Broncos", "DEN", [], []),
+    ("Detroit Lions", "DET", [], []),
+    ("Green Bay Packers", "GB", [], ["GNB"]),
+    ("Houston Texans", "HOU", [], ["HST"]),
+    ("Indianapolis Colts", "IND", ["Baltimore Colts"], []),
+    ("Jacksonville Jaguars", "JAX", ["Jacksonville Jagaurs"], ["JAC"]),
+    ("Kansas City Chiefs", "KC", [], ["KAN"]),
+    ("Las Vegas Raiders", "LV", ["Oakland Raiders", "Los Angeles Raiders"], ["LVR", "OAK"]),
+    ("Los Angeles Chargers", "LAC", ["San Diego Chargers"], ["SD", "SDG"]),
+    ("Los Angeles Rams", "LAR", ["St. Louis Rams"], ["LA", "STL", "RAM"]),
+    ("Miami Dolphins", "MIA", [], []),
+    ("Minnesota Vikings", "MIN", [], []),
+    ("New England Patriots", "NE", ["Boston Patriots"], ["NWE"]),
+    ("New Orleans Saints", "NO", [], ["NOR"]),
+    ("New York Giants", "NYG", [], []),
+    ("New York Jets", "NYJ", [], []),
+    ("Philadelphia Eagles", "PHI", [], []),
+    ("Pittsburgh Steelers", "PIT", [], []),
+    ("San Francisco 49ers", "SF", [], ["SFO"]),
+    ("Seattle Seahawks", "SEA", [], []),
+    ("Tampa Bay Buccaneers", "TB", [], ["TAM"]),
+    ("Tennessee Titans", "TEN", ["Houston Oilers", "Tennessee Oilers"], ["OTI"]),
+    ("Washington Commanders", "WAS", ["Washington Redskins", "Washington Football Team", "Washington Football"], ["WSH"]),
+]
+
+# Id given to names that are not an NFL team, such as the Averages row of the cap space table
+UNKNOWN_TEAM = -1
+
+# Current name and abbreviation of each team, indexed by id
+TEAM_NAMES = [name for name, _, _, _ in FRANCHISES]
+TEAM_ABBRS = [abbr for _, abbr, _, _ in FRANCHISES]
+
+def normalize_alias(name):
+    """Lower case with every run of other characters (spaces, underscores, dots) made one space."""
+    return re.sub(r'[^a-z0-9]+', ' ', str(name).lower()).strip()
+
+def _build_aliases():
+    aliases = {}
+    for team_id, (name, abbr, former_names, former_abbrs) in enumerate(FRANCHISES):
+        # The nickname alone ("Eagles") is unique among the current names too
+        for alias in [name, abbr, name.split()[-1], *former_names, *former_abbrs]:
+            key = normalize_alias(alias)
+            if aliases.setdefault(key, team_id) != team_id:
+                raise ValueError(f"{alias!r} names both {TEAM_NAMES[aliases[key]]} and {name}")
+    return aliases
+
+# Normalized alias -> team id
+_ALIASES = _build_aliases()
+
+def get_team_id(name):
+    """
+    Get the id of a team from any of its names or abbreviations.
+
+    Args:
+        name (str): Team name, abbreviation or nickname, e.g. "Oakland Raiders", "LV" or "Raiders"
+
+    Returns:
+        int: The team id, or None if the name is not an NFL team
+    """
+    return _ALIASES.get(normalize_alias(name))
+
+def get_team_ids(names):
+    """
+    Get the ids of many team names at once.
+
+    Args:
+        names (iterable): Team names, abbreviations or nicknames
+
+    Returns:
+        ndarray: Team id of each name, UNKNOWN_TEAM where it is not an NFL team
+    """
+    # Each distinct name is normalized once, however often it repeats
+    codes, uniques = pd.factorize(pd.Series(names, dtype=object), use_na_sentinel=False)
+    unique_ids = np.array([_ALIASES.get(normalize_alias(name), UNKNOWN_TEAM) for name in uniques], dtype=np.int64)
+    return unique_ids[codes] if len(codes) else np.empty(0, dtype=np.int64)
+
+def get_team_name(team_id):
+    """Get the current name of a team, e.g. "Las Vegas Raiders" for the Oakland Raiders' id."""
+    return TEAM_NAMES[team_id]
+
+def get_team_abbr(team_id):
+    """Get the current abbreviation of a team."""
+    return TEAM_ABBRS[team_id]
+
+def canonical_team_name(name):
+    """
+    Get the current name of the team a name refers to.
+
+    Args:
+        name (str): Team name, abbreviation or nickname
+
+    Returns:
+        str: The team's current name, or None if the name is not an NFL team
+    """
+    team_id = get_team_id(name)
+    return TEAM_NAMES[team_id] if team_id is not None else None
@@ -3,52 +3,241 @@ import numpy as np
 import torch
 import torch.nn as nn
 import torch.optim as optim
-from torch.utils.data import DataLoader, TensorDataset
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_squared_error, r2_score
 from sklearn.preprocessing import StandardScaler
 import os
+import copy
+import json
 import pickle
 
+try:
+    from model import data_store, instrumentation, model_registry, team_runtime
+    from model.team_needs import POSITION_ALIASES, calculate_team_needs, calculate_team_need, build_need_features
+    from model.depth_chart import get_position_columns, get_position_families, insert_player_ratings
+except ImportError:  # Run as a script from the model directory
+    import data_store
+    import instrumentation
+    import model_registry
+    import team_runtime
+    from team_needs import POSITION_ALIASES, calculate_team_needs, calculate_team_need, build_need_features
+    from depth_chart import get_position_columns, get_position_families, insert_player_ratings
+
+# Frames up to this many rows are converted to features through their values array
+SMALL_FRAME_ROWS = 256
+
+# Batch size the base learning rates are tuned for; larger batches get sqrt(batch_size / 2) times the rate
+BASE_BATCH_SIZE = 2
+
+# Training presets for TeamModel.train; any setting can be overridden per call, e.g. patience=50 for early stopping
+TRAINING_MODES = {
+    # The original schedule: batches of 2 for a fixed 500 epochs
+    'minibatch': {'batch_size': 2, 'epochs': 500, 'learning_rate': 0.001, 'patience': None, 'validation_split': 0.1},
+    'large_batch': {'batch_size': 32, 'epochs': 300, 'learning_rate': 0.001, 'patience': None, 'validation_split': 0.1},
+    'full_batch': {'batch_size': None, 'epochs': 1000, 'learning_rate': 0.001, 'patience': None, 'validation_split': 0.1},
+}
+
+# Hidden layer widths and dropout of the original network
+DEFAULT_HIDDEN_SIZES = (128, 64, 32, 16)
+DEFAULT_DROPOUT = 0.2
+
+# Dropout follows only the first hidden layers, as in the original network
+DROPOUT_LAYERS = 2
+
 class NeuralNetworkRegressor(nn.Module):
-    def __init__(self, input_size):
+    def __init__(self, input_size, hidden_sizes=DEFAULT_HIDDEN_SIZES, dropout=DEFAULT_DROPOUT):
         super(NeuralNetworkRegressor, self).__init__()
-        self.fc1 = nn.Linear(input_size, 128)
-        self.dropout1 = nn.Dropout(0.2)
-        self.fc2 = nn.Linear(128, 64)
-        self.dropout2 = nn.Dropout(0.2)
-        self.fc3 = nn.Linear(64, 32)
-        self.fc4 = nn.Linear(32, 16)
-        self.fc5 = nn.Linear(16, 1)
+        # Layers are named fc1, fc2, ... and dropout1, dropout2 so saved weights of the original network still load
+        sizes = [input_size, *hidden_sizes, 1]
+        self.num_layers = len(sizes) - 1
+        for i in range(self.num_layers):
+            setattr(self, f'fc{i + 1}', nn.Linear(sizes[i], sizes[i + 1]))
+        self.num_dropout_layers = min(DROPOUT_LAYERS, len(hidden_sizes))
+        for i in range(self.num_dropout_layers):
+            setattr(self, f'dropout{i + 1}', nn.Dropout(dropout))
         self.leaky_relu = nn.LeakyReLU(0.1)
 
+    def linear_layers(self):
+        """Return the fully connected layers, first to last."""
+        return [getattr(self, f'fc{i + 1}') for i in range(self.num_layers)]
+
     def forward(self, x):
-        x = self.leaky_relu(self.fc1(x))
-        x = self.dropout1(x)
-        x = self.leaky_relu(self.fc2(x))
-        x = self.dropout2(x)
-        x = self.leaky_relu(self.fc3(x))
-        x = self.leaky_relu(self.fc4(x))
-        x = self.fc5(x)
-        return x
+        layers = self.linear_layers()
+        for i, layer in enumerate(layers[:-1]):
+            x = self.leaky_relu(layer(x))
+            if i < self.num_dropout_layers:
+                x = getattr(self, f'dropout{i + 1}')(x)
+        return layers[-1](x)
+
+def fit_network(X_train, y_train, hidden_sizes=DEFAULT_HIDDEN_SIZES, dropout=DEFAULT_DROPOUT, batch_size=2,
+                epochs=500, learning_rate=0.001, patience=None, X_val=None, y_val=None, verbose=False):
+    """
+    Train a NeuralNetworkRegressor on scaled feature tensors.
+
+    Args:
+        X_train (Tensor): Scaled features, shape (rows, features)
+        y_train (Tensor): Targets, shape (rows, 1), on the same device
+        hidden_sizes (tuple): Width of each hidden layer
+        dropout (float): Dropout rate after the first hidden layers
+        batch_size (int): Rows per step; None trains on every row at once
+        epochs (int): Most passes over the training rows
+        learning_rate (float): Adam learning rate for batches of BASE_BATCH_SIZE, scaled with
+                               the square root of the batch size
+        patience (int, optional): Epochs without a better loss on (X_val, y_val) before stopping.
+                                  The weights of the best epoch are kept. None trains every epoch.
+        X_val (Tensor, optional): Scaled validation features, required with patience
+        y_val (Tensor, optional): Validation targets
+        verbose (bool): If True, print the loss every 10 epochs
+
+    Returns:
+        tuple: (trained model in eval mode, epochs run)
+    """
+    # Batches are sliced straight from the tensors; a full batch is the whole training set
+    num_rows = len(X_train)
+    if batch_size is None or batch_size >= num_rows:
+        batch_size = num_rows
+    learning_rate = learning_rate * (batch_size / BASE_BATCH_SIZE) ** 0.5
+
+    # Initialize the model
+    model = NeuralNetworkRegressor(X_train.shape[1], hidden_sizes, dropout).to(X_train.device)
+
+    # Define loss function and optimizer
+    criterion = nn.MSELoss()
+    optimizer = optim.Adam(model.parameters(), lr=learning_rate)
+
+    # Training loop
+    best_loss = float('inf')
+    best_state = None
+    epochs_since_best = 0
+    for epoch in range(epochs):
+        model.train()
+        # Summed on the device; reading it back every step would wait for the device each time
+        running_loss = torch.zeros((), device=X_train.device)
+
+        order = torch.randperm(num_rows, device=X_train.device) if batch_size < num_rows else None
+        for start in range(0, num_rows, batch_size):
+            if order is None:
+                inputs, targets = X_train, y_train
+            else:
+                batch = order[start:start + batch_size]
+                inputs, targets = X_train[batch], y_train[batch]
+
+            # Zero the parameter gradients
+            optimizer.zero_grad(set_to_none=True)
+
+            # Forward pass
+            outputs = model(inputs)
+            loss = criterion(outputs, targets)
+
+            # Backward pass and optimize
+            loss.backward()
+            optimizer.step()
+
+            running_loss += loss.detach() * len(inputs)
+
+        # Print statistics every 10 epochs
+        if verbose and (epoch + 1) % 10 == 0:
+            print(f'Epoch {epoch+1}/{epochs}, Loss: {running_loss.item() / num_rows:.4f}')
+
+        if patience is not None:
+            model.eval()
+            with torch.no_grad():
+                val_loss = criterion(model(X_val), y_val).item()
+            if val_loss < best_loss:
+                best_loss = val_loss
+                best_state = copy.deepcopy(model.state_dict())
+                epochs_since_best = 0
+            else:
+                epochs_since_best += 1
+                if epochs_since_best >= patience:
+                    if verbose:
+                        print(f"Stopping early after epoch {epoch+1}; best validation loss {best_loss:.4f}")
+                    break
+
+    # Keep the weights that did best on the validation rows
+    if best_state is not None:
+        model.load_state_dict(best_state)
+    model.eval()
+    return model, epoch + 1
+
+class StackedRegressor(nn.Module):
+    """
+    Frozen NeuralNetworkRegressors of the same architecture evaluated as one.
+
+    Each layer's weights are stacked along a leading member axis, so every
+    member runs in a single batched matmul per layer. The scaler is folded into
+    the first layer: with x_scaled = (x - mean) / scale, W x_scaled + b equals
+    (W / scale) x + (b - (W / scale) mean), so unscaled features go straight in.
+    """
+    def __init__(self, networks, mean, scale):
+        """
+        Args:
+            networks (list): Trained NeuralNetworkRegressors with the same architecture
+            mean (ndarray): Scaler mean of each feature
+            scale (ndarray): Scaler scale of each feature
+        """
+        super(StackedRegressor, self).__init__()
+        layers = [network.linear_layers() for network in networks]
+        self.num_layers = len(layers[0])
+        self.negative_slope = networks[0].leaky_relu.negative_slope
+        with torch.no_grad():
+            for i in range(self.num_layers):
+                # (members, inputs, outputs) and (members, 1, outputs), computed in float64 before folding
+                weight = torch.stack([member[i].weight for member in layers]).double().transpose(1, 2)
+                bias = torch.stack([member[i].bias for member in layers]).double().unsqueeze(1)
+                if i == 0:
+                    weight = weight / torch.as_tensor(scale, dtype=torch.float64, device=weight.device)[None, :, None]
+                    mean = torch.as_tensor(mean, dtype=torch.float64, device=weight.device)
+                    bias = bias - mean[None, None, :] @ weight
+                self.register_buffer(f'weight{i + 1}', weight.float().contiguous())
+                self.register_buffer(f'bias{i + 1}', bias.float())
+
+    def forward(self, x):
+        """Return the prediction of every member for each row, shape (rows, members)."""
+        x = x.unsqueeze(0)
+        for i in range(self.num_layers):
+            x = torch.matmul(x, getattr(self, f'weight{i + 1}')) + getattr(self, f'bias{i + 1}')
+            if i < self.num_layers - 1:
+                x = nn.functional.leaky_relu(x, self.negative_slope)
+        return x.squeeze(-1).transpose(0, 1)
 
 class TeamModel:
-    def __init__(self):
+    def __init__(self, hidden_sizes=DEFAULT_HIDDEN_SIZES, dropout=DEFAULT_DROPOUT, ensemble_size=1):
+        """
+        Args:
+            hidden_sizes (tuple): Width of each hidden layer of the network
+            dropout (float): Dropout rate after the first hidden layers
+            ensemble_size (int): Networks trained from different random starts; predictions
+                                 are their mean, and predict can also return their spread
+        """
+        self.hidden_sizes = tuple(hidden_sizes)
+        self.dropout = dropout
+        self.ensemble_size = ensemble_size
+        # The first (or only) network, and all of them for an ensemble
         self.model = None
+        self.members = []
         self.scaler = StandardScaler()
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-        
+        # Built on first predict from the trained model and scaler (see _prepare_inference)
+        self._inference_model = None
+        self._feature_columns = None
+        self._input_buffer = None
+        # Epochs the last call to train ran for, which early stopping can cut short
+        self.epochs_trained = None
+        
+    @property
+    def feature_columns(self):
+        """Feature columns in training order, or None if the scaler does not record them."""
+        columns = getattr(self.scaler, 'feature_names_in_', None)
+        return list(columns) if columns is not None else None
+
     def preprocess_data(self, data):
         """
         Preprocess the Madden team data by removing non-predictive columns
         and scaling the features.
         """
-        # Remove columns that should not be used for prediction
-        columns_to_drop = ['team_name', 'year', 'regular_season_wins', 
-                          'playoff_wins', 'total_wins']
-        
-        # Create X (features) and y (target)
-        X = data.drop(columns_to_drop, axis=1, errors='ignore')
+        # Create X (features) and y (target), without the columns that should not be used for prediction
+        X = data.drop(team_runtime.NON_FEATURE_COLUMNS, axis=1, errors='ignore')
         y = data['total_wins'] if 'total_wins' in data.columns else None
         
         return X, y
@@ -69,27 +258,44 @@ class TeamModel:
             
         os.makedirs(model_dir, exist_ok=True)
         
-        # Save the PyTorch model
+        # Save the PyTorch model; an ensemble is saved as one state dict with every tensor stacked over the members
         model_path = os.path.join(model_dir, "team_model.pt")
-        torch.save(self.model.state_dict(), model_path)
+        if len(self.members) > 1:
+            states = [member.state_dict() for member in self.members]
+            torch.save({name: torch.stack([state[name] for state in states]) for name in states[0]}, model_path)
+        else:
+            torch.save(self.model.state_dict(), model_path)
         
         # Save the scaler
         scaler_path = os.path.join(model_dir, "team_scaler.pkl")
         with open(scaler_path, 'wb') as f:
             pickle.dump(self.scaler, f)
+
+        # Save the architecture, so load_model can rebuild the network the weights belong to
+        config_path = os.path.join(model_dir, "team_model_config.json")
+        with open(config_path, 'w') as f:
+            json.dump({'hidden_sizes': list(self.hidden_sizes), 'dropout': self.dropout,
+                       'ensemble_size': len(self.members), 'input_size': self.scaler.n_features_in_}, f)
             
         print(f"Model saved to {model_dir}")
+
+        # Keep the inference bundles in step with the saved weights
+        self.export(model_dir)
         
-    def load_model(self, model_dir=None, input_size=None):
+    def load_model(self, model_dir=None, input_size=None, feature_columns=None):
         """
         Load a trained model and scaler from disk.
         
         Args:
             model_dir (str, optional): Directory where the model is saved. If None, uses default location.
-            input_size (int, optional): Input size for the model if creating a new one. Required if model file doesn't exist.
+            input_size (int, optional): Number of features the model must take. If None, it is read
+                                        from the saved config or scaler.
+            feature_columns (list, optional): Feature columns the model must have been trained on,
+                                              in any order. If None, any columns are accepted.
             
         Returns:
-            bool: True if model was loaded successfully, False otherwise
+            bool: True if model was loaded successfully, False otherwise (including when
+                  the saved model takes different features)
         """
         if model_dir is None:
             current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -106,17 +312,47 @@ class TeamModel:
         try:
             # Load the scaler
             with open(scaler_path, 'rb') as f:
-                self.scaler = pickle.load(f)
+                scaler = pickle.load(f)
+
+            # A model for other features would only fail later with a shape error
+            saved_columns = getattr(scaler, 'feature_names_in_', None)
+            if input_size is not None and input_size != scaler.n_features_in_:
+                print(f"Saved model takes {scaler.n_features_in_} features, not {input_size}.")
+                return False
+            if (feature_columns is not None and saved_columns is not None
+                    and set(saved_columns) != set(feature_columns)):
+                print("Saved model was trained on different feature columns.")
+                return False
+            input_size = scaler.n_features_in_
+            self.scaler = scaler
                 
-            # Create model instance if needed
-            if self.model is None:
-                if input_size is None:
-                    raise ValueError("input_size must be provided when loading a model for the first time")
-                self.model = NeuralNetworkRegressor(input_size).to(self.device)
+            # Models saved before the architecture was configurable have no config and use the default one
+            config_path = os.path.join(model_dir, "team_model_config.json")
+            if os.path.exists(config_path):
+                with open(config_path) as f:
+                    config = json.load(f)
+                if tuple(config['hidden_sizes']) != self.hidden_sizes or config.get('ensemble_size', 1) != len(self.members):
+                    self.model = None
+                self.hidden_sizes = tuple(config['hidden_sizes'])
+                self.dropout = config['dropout']
+                self.ensemble_size = config.get('ensemble_size', 1)
+
+            # Create model instances if needed
+            if self.model is None or self.model.fc1.in_features != input_size:
+                self.members = [NeuralNetworkRegressor(input_size, self.hidden_sizes, self.dropout).to(self.device)
+                                for _ in range(self.ensemble_size)]
+                self.model = self.members[0]
                 
             # Load the model weights
-            self.model.load_state_dict(torch.load(model_path, map_location=self.device))
-            self.model.eval()  # Set to evaluation mode
+            state = torch.load(model_path, map_location=self.device)
+            if len(self.members) > 1:
+                for i, member in enumerate(self.members):
+                    member.load_state_dict({name: tensor[i] for name, tensor in state.items()})
+            else:
+                self.model.load_state_dict(state)
+            for member in self.members:
+                member.eval()  # Set to evaluation mode
+            self._inference_model = None
             
             print(f"Model loaded from {model_dir}")
             return True
@@ -125,7 +361,7 @@ class TeamModel:
             print(f"Error loading model: {str(e)}")
             return False
     
-    def train(self, data=None, force_train=False):
+    def train(self, data=None, force_train=False, mode='minibatch', save=True, verbose=True, **options):
         """
         Train the model on Madden team data to predict total wins.
         If a saved model exists, it will be loaded unless force_train is True.
@@ -135,8 +371,24 @@ class TeamModel:
                                        If None, loads the default madden_data_processed.xlsx file.
             force_train (bool): If True, train a new model even if saved weights exist.
                                If False, load saved weights if they exist.
+            mode (str): Preset from TRAINING_MODES: 'minibatch' (the original batches of 2 for
+                        500 epochs), 'large_batch' or 'full_batch'
+            save (bool): If True, save the trained model (and export it for inference)
+            verbose (bool): If True, print the loss every 10 epochs
+            **options: Overrides for the preset: seed (each ensemble member i is seeded with seed + i),
+                       batch_size (None for full batch), epochs,
+                       learning_rate (for batches of BASE_BATCH_SIZE; scaled with the square
+                       root of the batch size), patience (epochs without a better validation
+                       loss before stopping; None trains every epoch) and validation_split
+                       (share of the training rows held out for early stopping)
+
+        Returns:
+            tuple: (mse, r2) on the test split, or (None, None) if a saved model was loaded
         """
-        # If no data is provided, load the default dataset
+        # If no data is provided, load the default dataset, from the data store when it has been built
+        if data is None and data_store.has_dataset('teams'):
+            print("Loading default data from the data store")
+            data = data_store.read_dataset('teams')
         if data is None:
             current_dir = os.path.dirname(os.path.abspath(__file__))
             project_root = os.path.dirname(os.path.dirname(os.path.dirname(current_dir)))
@@ -148,113 +400,233 @@ class TeamModel:
         X, y = self.preprocess_data(data)
         input_size = X.shape[1]
         
-        # Try to load the model if not forcing training
-        if not force_train and self.load_model(input_size=input_size):
-            return None, None  # Model loaded successfully, no metrics to return
+        feature_columns = list(X.columns)
+        data_hash = model_registry.get_data_hash(X.to_numpy(dtype=float), y.to_numpy(dtype=float), feature_columns)
         
-        # If we get here, either force_train is True or no saved model exists
-        print("Training new model...")
+        # Try to load the model if not forcing training: the registered one for this data, else the saved one
+        if not force_train:
+            artifact_dir = model_registry.find_model(feature_columns, data_hash)
+            if artifact_dir is not None and self.load_model(artifact_dir, input_size, feature_columns):
+                return None, None  # Model loaded successfully, no metrics to return
+            if self.load_model(input_size=input_size, feature_columns=feature_columns):
+                return None, None
         
+        # If we get here, either force_train is True or no saved model exists
+        settings = {**TRAINING_MODES[mode], **options}
+        batch_size = settings['batch_size']
+        epochs = settings['epochs']
+        patience = settings['patience']
+        print(f"Training new model ({mode})...")
+        
+        # Scaled and trained on in float32, so the scaler's output becomes the tensors without a copy
+        X = X.astype(np.float32)
+        y = y.to_numpy(dtype=np.float32)
+
         # Split data into training and testing sets
         X_train, X_test, y_train, y_test = train_test_split(
             X, y, test_size=0.2, random_state=42
         )
+
+        # Early stopping watches rows held out of the training set, so the test split stays unseen
+        X_val = y_val = None
+        X_val_tensor = y_val_tensor = None
+        if patience is not None:
+            X_train, X_val, y_train, y_val = train_test_split(
+                X_train, y_train, test_size=settings['validation_split'], random_state=42
+            )
         
         # Scale features
         X_train_scaled = self.scaler.fit_transform(X_train)
         X_test_scaled = self.scaler.transform(X_test)
         
-        # Convert to PyTorch tensors
-        X_train_tensor = torch.FloatTensor(X_train_scaled).to(self.device)
-        y_train_tensor = torch.FloatTensor(y_train.values).reshape(-1, 1).to(self.device)
-        X_test_tensor = torch.FloatTensor(X_test_scaled).to(self.device)
-        y_test_tensor = torch.FloatTensor(y_test.values).reshape(-1, 1).to(self.device)
-        
-        # Create DataLoader
-        train_dataset = TensorDataset(X_train_tensor, y_train_tensor)
-        train_loader = DataLoader(train_dataset, batch_size=2, shuffle=True)
-        
-        # Initialize the model
-        input_size = X_train_scaled.shape[1]
-        self.model = NeuralNetworkRegressor(input_size).to(self.device)
-        
-        # Define loss function and optimizer
-        criterion = nn.MSELoss()
-        optimizer = optim.Adam(self.model.parameters(), lr=0.001)
-        
-        # Training loop
-        epochs = 500
-        for epoch in range(epochs):
-            self.model.train()
-            running_loss = 0.0
-            
-            for inputs, targets in train_loader:
-                # Zero the parameter gradients
-                optimizer.zero_grad()
-                
-                # Forward pass
-                outputs = self.model(inputs)
-                loss = criterion(outputs, targets)
-                
-                # Backward pass and optimize
-                loss.backward()
-                optimizer.step()
-                
-                running_loss += loss.item()
-            
-            # Print statistics every 10 epochs
-            if (epoch + 1) % 10 == 0:
-                print(f'Epoch {epoch+1}/{epochs}, Loss: {running_loss/len(train_loader):.4f}')
+        # Convert to PyTorch tensors, sharing memory with the arrays on the CPU
+        X_train_tensor = torch.from_numpy(X_train_scaled).to(self.device)
+        y_train_tensor = torch.from_numpy(y_train).reshape(-1, 1).to(self.device)
+        X_test_tensor = torch.from_numpy(X_test_scaled).to(self.device)
+        y_test_tensor = torch.from_numpy(y_test).reshape(-1, 1).to(self.device)
+        if patience is not None:
+            X_val_tensor = torch.from_numpy(self.scaler.transform(X_val)).to(self.device)
+            y_val_tensor = torch.from_numpy(y_val).reshape(-1, 1).to(self.device)
+        
+        # Ensemble members differ only in their random starts and batch order
+        self.members = []
+        for i in range(self.ensemble_size):
+            if self.ensemble_size > 1:
+                print(f"Training ensemble member {i + 1}/{self.ensemble_size}")
+            if settings.get('seed') is not None:
+                torch.manual_seed(settings['seed'] + i)
+            member, self.epochs_trained = fit_network(
+                X_train_tensor, y_train_tensor, self.hidden_sizes, self.dropout, batch_size, epochs,
+                settings['learning_rate'], patience, X_val_tensor, y_val_tensor, verbose
+            )
+            self.members.append(member)
+        self.model = self.members[0]
+        self._inference_model = None
         
         # Evaluate the model
-        self.model.eval()
         with torch.no_grad():
-            y_pred_tensor = self.model(X_test_tensor)
+            y_pred_tensor = torch.stack([member(X_test_tensor) for member in self.members]).mean(dim=0)
             y_pred = y_pred_tensor.cpu().numpy().flatten()
-            y_test_np = y_test.values
             
-            mse = mean_squared_error(y_test_np, y_pred)
-            r2 = r2_score(y_test_np, y_pred)
+            mse = mean_squared_error(y_test, y_pred)
+            r2 = r2_score(y_test, y_pred)
         
         print(f"Model trained successfully!")
         print(f"Mean Squared Error: {mse:.4f}")
         print(f"R² Score: {r2:.4f}")
         
-        # Save the trained model
-        self.save_model()
+        # Save the trained model, and file a copy in the registry under its schema and data
+        if save:
+            self.save_model()
+            model_registry.register(team_runtime.get_model_dir(), feature_columns, data_hash,
+                                    {'mse': float(mse), 'r2': float(r2)})
         
         return mse, r2
     
-    def predict(self, team_data):
+    def _prepare_inference(self):
         """
-        Predict the total wins for a team based on their Madden ratings.
-        
+        Build the network predict runs: a StackedRegressor of the members with
+        the scaler folded into its first layer, so raw features go straight in.
+        """
+        columns = getattr(self.scaler, 'feature_names_in_', None)
+        self._feature_columns = list(columns) if columns is not None else None
+
+        mean = self.scaler.mean_ if self.scaler.mean_ is not None else np.zeros(self.scaler.n_features_in_)
+        scale = self.scaler.scale_ if self.scaler.scale_ is not None else np.ones(self.scaler.n_features_in_)
+
+        self._inference_model = StackedRegressor(self.members or [self.model], mean, scale).to(self.device).eval()
+        self._input_buffer = None
+
+    def export(self, model_dir=None, exported_program=True):
+        """
+        Freeze the trained model and scaler into single-file artifacts for inference.
+
+        Writes team_model.npz, which model.team_runtime runs with NumPy alone,
+        and optionally team_model.pt2, a torch.export program (the successor to
+        TorchScript) that takes unscaled feature rows in batches of any size,
+        returns one column per ensemble member and can be run with
+        torch.export.load without this class. Both have the
+        scaler folded into the first layer and record the feature columns in
+        training order.
+
         Args:
-            team_data (DataFrame): DataFrame containing team stats without win data
-            
+            model_dir (str, optional): Directory to write to. If None, uses the default location.
+            exported_program (bool): If True, also write the torch.export program
+
+        Returns:
+            TeamPredictor: The NumPy predictor that was exported
+        """
+        if self.model is None:
+            raise ValueError("No model to export. Train the model first.")
+        if self._inference_model is None:
+            self._prepare_inference()
+        if self._feature_columns is None:
+            raise ValueError("The scaler does not record its feature columns; train the model again to export it.")
+
+        model_dir = model_dir or team_runtime.get_model_dir()
+        os.makedirs(model_dir, exist_ok=True)
+
+        stacked = self._inference_model
+        predictor = team_runtime.TeamPredictor(
+            [getattr(stacked, f'weight{i + 1}').cpu().numpy().transpose(0, 2, 1) for i in range(stacked.num_layers)],
+            [getattr(stacked, f'bias{i + 1}').cpu().numpy()[:, 0, :] for i in range(stacked.num_layers)],
+            self._feature_columns,
+            stacked.negative_slope,
+        )
+        predictor.save(os.path.join(model_dir, team_runtime.BUNDLE_FILENAME))
+
+        if exported_program:
+            example = torch.zeros(2, len(self._feature_columns))
+            program = torch.export.export(copy.deepcopy(self._inference_model).cpu(), (example,),
+                                          dynamic_shapes=({0: torch.export.Dim('batch')},))
+            torch.export.save(program, os.path.join(model_dir, "team_model.pt2"),
+                              extra_files={'feature_columns.json': json.dumps(self._feature_columns)})
+
+        print(f"Model exported to {model_dir}")
+        return predictor
+
+    def _to_feature_matrix(self, team_data):
+        # Frames are reduced to the model's columns in training order; arrays are taken to be in that order already
+        if isinstance(team_data, list):
+            return np.concatenate([self._to_feature_matrix(frame) for frame in team_data])
+        if isinstance(team_data, pd.DataFrame):
+            if self._feature_columns is None:
+                team_data, _ = self.preprocess_data(team_data)
+            elif len(team_data) <= SMALL_FRAME_ROWS:
+                # For a few rows, picking the columns out of the frame's values is much cheaper than a column selection
+                positions = team_data.columns.get_indexer(self._feature_columns)
+                if (positions < 0).any():
+                    missing = [col for col, position in zip(self._feature_columns, positions) if position < 0]
+                    raise KeyError(f"Missing feature columns: {missing}")
+                team_data = team_data.to_numpy()[:, positions]
+            else:
+                team_data = team_data[self._feature_columns]
+        return np.ascontiguousarray(team_data, dtype=np.float32).reshape(len(team_data), -1)
+
+    def _to_device(self, X):
+        if self.device.type == 'cpu':
+            return torch.from_numpy(X)
+
+        # Copy through a page-locked buffer, kept between calls, for a fast asynchronous transfer
+        if self._input_buffer is None or self._input_buffer.shape[0] < len(X) or self._input_buffer.shape[1] != X.shape[1]:
+            self._input_buffer = torch.empty(X.shape, dtype=torch.float32).pin_memory()
+        buffer = self._input_buffer[:len(X)]
+        buffer.numpy()[:] = X
+        return buffer.to(self.device, non_blocking=True)
+
+    def predict_members(self, team_data, batch_size=None):
+        """
+        Predict the total wins of each ensemble member, all members in one batched forward pass.
+
+        Args:
+            team_data (DataFrame, list or ndarray): Team rows, as taken by predict
+            batch_size (int, optional): Most rows per forward pass, to bound memory. None runs all at once.
+
         Returns:
-            float: Predicted total wins for the team
+            ndarray: Array of shape (rows, members) with each member's predicted total wins
         """
         if self.model is None:
             raise ValueError("Model has not been trained yet. Call train() first.")
-        
-        # Preprocess the input data
-        X, _ = self.preprocess_data(team_data)
-        
-        # Scale features
-        X_scaled = self.scaler.transform(X)
-        
-        # Convert to PyTorch tensor
-        X_tensor = torch.FloatTensor(X_scaled).to(self.device)
-        
-        # Make prediction
-        self.model.eval()
-        with torch.no_grad():
-            predicted_wins_tensor = self.model(X_tensor)
-            predicted_wins = predicted_wins_tensor.cpu().numpy().flatten()
-        
+        if self._inference_model is None:
+            self._prepare_inference()
+
+        X = self._to_feature_matrix(team_data)
+        batch_size = batch_size or max(len(X), 1)
+
+        predicted_wins = np.empty((len(X), len(self.members) or 1), dtype=np.float32)
+        with torch.inference_mode():
+            for start in range(0, len(X), batch_size):
+                batch = self._to_device(X[start:start + batch_size])
+                instrumentation.count('model.forward_calls')
+                instrumentation.count('model.rows', len(batch))
+                predicted_wins[start:start + batch_size] = self._inference_model(batch).cpu().numpy()
+
         return predicted_wins
 
+    def predict(self, team_data, batch_size=None, return_std=False):
+        """
+        Predict the total wins for teams based on their Madden ratings.
+
+        Any number of teams is evaluated in one forward pass, so callers
+        should gather rows and call this once rather than once per row.
+
+        Args:
+            team_data (DataFrame, list or ndarray): Team rows to evaluate. A DataFrame (or a list
+                                                    of them) may hold extra columns, such as team_name
+                                                    and the wins, which are ignored. An array must hold
+                                                    the unscaled feature columns in training order.
+            batch_size (int, optional): Most rows per forward pass, to bound memory. None runs all at once.
+            return_std (bool): If True, also return the standard deviation across ensemble members
+
+        Returns:
+            ndarray: Predicted total wins for each row (the ensemble mean), and with return_std
+                     a second array with the spread of the members (zero for a single model)
+        """
+        members = self.predict_members(team_data, batch_size)
+        if return_std:
+            return members.mean(axis=1), members.std(axis=1)
+        return members.mean(axis=1)
+
 def load_madden_data(file_path):
     """
     Load Madden team data from an Excel file.
@@ -267,6 +639,18 @@ def load_madden_data(file_path):
     """
     return pd.read_excel(file_path)
 
+def load_team_data():
+    """
+    Load the Madden team data in this repository: from the data store when it
+    has been built, otherwise from model/madden_data_processed.xlsx.
+
+    Returns:
+        DataFrame: DataFrame containing the Madden team data
+    """
+    if data_store.has_dataset('teams'):
+        return data_store.read_dataset('teams')
+    return load_madden_data(os.path.join(os.path.dirname(os.path.abspath(__file__)), "madden_data_processed.xlsx"))
+
 def main():
     # Get the absolute path to the data directory
     current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -293,150 +677,22 @@ def main():
     except Exception as e:
         print(f"Error: {str(e)}")
 
-def calculate_team_needs(free_agents, teams):
-    """
-    Calculate the need matrix for each free agent and team combination.
-    
-    Args:
-        free_agents (DataFrame): DataFrame containing free agent data
-        teams (DataFrame): DataFrame containing team data
-        
-    Returns:
-        DataFrame: A matrix where rows are free agents, columns are teams,
-                  and values represent the projected win improvement
-    """
-    if free_agents.empty or teams.empty:
-        print("Error: Free agents or teams data is empty")
-        return pd.DataFrame()
-    
-    # Initialize team model
-    model = TeamModel()
-    model_loaded = model.load_model(input_size=len(teams.columns) - 5)  # Adjust for non-feature columns
-    
-    if not model_loaded:
-        print("Warning: Could not load team model. Training new model...")
-        model.train(data=teams, force_train=True)
-    
-    # Get unique team names
-    team_names = teams['team_name'].unique()
-    
-    # Create empty DataFrame to store results
-    results = []
-    
-    # For each free agent
-    for _, player in free_agents.iterrows():
-        player_name = player['Player Name'] 
-        player_rating = player['Madden OVR'] 
-        player_position = "HB"
-
-        print(f"Evaluating free agent: {player_name}")
-        
-        # For each team
-        for team_name in team_names:
-            team_data = teams[teams['team_name'] == team_name].copy()
-            
-            if team_data.empty:
-                continue
-                
-            need_result = calculate_team_need(player_rating, player_name, team_name, player_position, team_data, model)
-                    
-            results.append(need_result)
-                
-    # Convert results to DataFrame
-    results_df = pd.DataFrame(results)
-    
-    # Create pivot table for the need matrix
-    if not results_df.empty:
-        need_matrix = results_df.pivot_table(
-            index='player_name',
-            columns='team_name',
-            values='win_improvement'
-        )
-
-        # Shift all values in the need_matrix so that the minimum value starts at 0
-        min_value = need_matrix.values.min()
-        need_matrix = need_matrix - min_value
-        
-        # Print information about the transformation
-        print(f"Shifted all win improvement values by {min_value:.2f} to start at 0")
-        return need_matrix
-    else:
-        return pd.DataFrame()
-
-def calculate_team_need(player_rating, player_name, team_name, player_position, team, team_model):
-    """
-    Calculate how much a team needs a specific free agent based on win prediction difference.
-    
-    Args:
-        player_rating (float): Overall rating of the free agent player
-        player_position (str): Position of the free agent player (e.g., 'HB')
-        team (DataFrame): DataFrame containing the team data
-        team_model (TeamModel): Trained team model for win prediction
-        
-    Returns:
-        dict: Dictionary containing player rating, current win prediction, 
-              win prediction with player, and win improvement
-    """
-    if player_rating is None:
-        return None
-    
-    # Make a copy of team data to avoid modifying the original
-    team_data = team.copy()
-    
-    if team_data.empty:
-        print(f"Team data is empty.")
-        return None
-    
-    # Get current win prediction
-    current_win_prediction = team_model.predict(team_data)[0]
-    
-    # Simulate adding player to team based on position
-    team_with_player = team_data.copy()
-    
-    # Handle different positions
-    position_column = player_position + '1'
-    
-    # Update the team with the player if position column exists
-    if position_column and position_column in team_with_player.columns:
-        # Find all columns for this position (e.g., HB1, HB2, HB3)
-        position_base = player_position # Remove the number
-        position_columns = [col for col in team_with_player.columns if col.startswith(position_base)]
-        
-        # Get current ratings for all positions
-        position_ratings = [team_with_player[col].values[0] for col in position_columns]
-        
-        # Only proceed if the player is better than at least one current player
-        if player_rating > min(position_ratings):
-            # Add the player rating to the list and sort in descending order
-            position_ratings.append(player_rating)
-            position_ratings.sort(reverse=True)
-            
-            # Remove the lowest rating (we're replacing the worst player)
-            position_ratings = position_ratings[:-1]
-            
-            # Update the team with the new ordered ratings
-            for i, col in enumerate(position_columns):
-                if i < len(position_ratings):
-                    team_with_player[col] = position_ratings[i]
-    
-    # Get win prediction with new player
-    win_prediction_with_player = team_model.predict(team_with_player)[0]
-    
-    # Calculate improvement
-    win_improvement = win_prediction_with_player - current_win_prediction
-    
-    return {
-        'player_name': player_name,
-        'player_rating': player_rating,
-        'team_name': team_name,
-        'current_win_prediction': current_win_prediction,
-        'win_prediction_with_player': win_prediction_with_player,
-        'win_improvement': win_improvement
-    }
 if __name__ == "__main__":
+    import argparse
     import free_agency
     import team_model
-    
+
+    parser = argparse.ArgumentParser(description="Compute the need matrix, or export the saved team model")
+    parser.add_argument('--export', action='store_true',
+                        help="write the saved model as team_model.npz (NumPy) and team_model.pt2 (torch.export)")
+    args = parser.parse_args()
+
+    if args.export:
+        model = TeamModel()
+        if model.load_model():
+            model.export()
+        raise SystemExit
+
     # Load free agent data
     free_agents = free_agency.get_free_agents_by_year(2024)
     teams = free_agency.get_teams_by_year(2024)
@@ -0,0 +1,220 @@
+"""
+Need matrix: how many more wins each team is projected to get from signing
+each free agent.
+
+Win predictions come from the model registered for the teams' feature columns
+(model.model_registry), or from the one in saved_models if it takes those
+columns. Its exported NumPy bundle (model.team_runtime) is used when it is up
+to date, so computing needs does not import torch; otherwise the saved
+TeamModel is loaded, or a new one is trained if no saved model fits.
+"""
+
+import logging
+import pandas as pd
+import numpy as np
+
+try:
+    from model import instrumentation, model_registry, team_runtime
+    from model.depth_chart import DepthChart
+except ImportError:  # Run as a script from the model directory
+    import instrumentation
+    import model_registry
+    import team_runtime
+    from depth_chart import DepthChart
+
+logger = logging.getLogger(__name__)
+
+# Free agent positions that map onto a differently named Madden depth chart family
+POSITION_ALIASES = {'RB': 'HB'}
+
+def load_team_model(teams):
+    """
+    Load a team win model that takes the feature columns of the given teams.
+
+    Tries the latest registered model for those columns, then the one in
+    saved_models; for each, the exported NumPy bundle gives the same predictions
+    without importing torch. If neither takes those columns, a new TeamModel is
+    trained on the teams.
+
+    Args:
+        teams (DataFrame): Team rows the model will be evaluated on
+
+    Returns:
+        TeamPredictor or TeamModel: The model
+    """
+    feature_columns = team_runtime.get_feature_columns(teams)
+    model_dirs = [model_dir for model_dir in (model_registry.find_model(feature_columns), team_runtime.get_model_dir())
+                  if model_dir is not None]
+
+    for model_dir in model_dirs:
+        predictor = team_runtime.load_team_predictor(model_dir)
+        if predictor is not None and set(predictor.feature_columns) == set(feature_columns):
+            instrumentation.count('team_model.bundle_loads')
+            return predictor
+
+    try:
+        from model.team_model import TeamModel
+    except ImportError:  # Run as a script from the model directory
+        from team_model import TeamModel
+    model = TeamModel()
+    for model_dir in model_dirs:
+        if model.load_model(model_dir, feature_columns=feature_columns):
+            instrumentation.count('team_model.torch_loads')
+            return model
+
+    logger.warning("Could not load team model. Training new model...")
+    with instrumentation.stage('train_team_model'):
+        model.train(data=teams, force_train=True)
+    return model
+
+def calculate_team_needs(free_agents, teams, return_std=False):
+    """
+    Calculate the need matrix for each free agent and team combination.
+    
+    Args:
+        free_agents (DataFrame): DataFrame containing free agent data
+        teams (DataFrame): DataFrame containing team data
+        return_std (bool): If True, also return how much the ensemble members
+                           disagree on each win improvement
+        
+    Returns:
+        DataFrame: A matrix where rows are free agents, columns are teams,
+                  and values represent the projected win improvement (the
+                  ensemble mean). With return_std, a second matrix of the
+                  same shape holds the standard deviation of the improvement
+                  across ensemble members (zero for a single model).
+    """
+    if free_agents.empty or teams.empty:
+        logger.error("Free agents or teams data is empty")
+        return (pd.DataFrame(), pd.DataFrame()) if return_std else pd.DataFrame()
+    
+    model = load_team_model(teams)
+    
+    # One row per team (the first one, as the per-team filter used to pick)
+    team_rows = teams.drop_duplicates(subset='team_name', keep='first')
+    team_names = team_rows['team_name'].to_numpy()
+
+    player_names = free_agents['Player Name'].to_numpy()
+    player_ratings = free_agents['Madden OVR'].to_numpy(dtype=float)
+
+    # Free agent files without a position column only hold running backs
+    if 'Position' in free_agents.columns:
+        player_positions = free_agents['Position'].replace(POSITION_ALIASES).to_numpy(dtype=object)
+    else:
+        player_positions = "HB"
+
+    logger.info("Evaluating %d free agents against %d teams", len(player_names), len(team_names))
+
+    # Baseline rows for every team followed by every (player, team) pair,
+    # evaluated for every ensemble member in a single forward pass
+    features = build_need_features(player_ratings, player_positions, team_rows, model)
+    member_predictions = model.predict_members(features)
+
+    # Improvements are taken per member before averaging, so the spread reflects
+    # how much the members disagree about the player, not about the team
+    num_teams = len(team_names)
+    member_current = member_predictions[:num_teams]
+    member_with_player = member_predictions[num_teams:].reshape(len(player_names), num_teams, -1)
+    member_improvement = member_with_player - member_current[None, :, :]
+
+    current_win_prediction = member_current.mean(axis=1)
+    win_prediction_with_player = member_with_player.mean(axis=2)
+
+    results_df = pd.DataFrame({
+        'player_name': np.repeat(player_names, num_teams),
+        'player_rating': np.repeat(player_ratings, num_teams),
+        'team_name': np.tile(team_names, len(player_names)),
+        'current_win_prediction': np.tile(current_win_prediction, len(player_names)),
+        'win_prediction_with_player': win_prediction_with_player.ravel(),
+        'win_improvement': (win_prediction_with_player - current_win_prediction).ravel(),
+        'win_improvement_std': member_improvement.std(axis=2).ravel()
+    })
+
+    # Create pivot table for the need matrix
+    if not results_df.empty:
+        need_matrix = results_df.pivot_table(
+            index='player_name',
+            columns='team_name',
+            values='win_improvement'
+        )
+
+        # Shift all values in the need_matrix so that the minimum value starts at 0
+        min_value = need_matrix.values.min()
+        need_matrix = need_matrix - min_value
+        
+        logger.info("Shifted all win improvement values by %.2f to start at 0", min_value)
+        if return_std:
+            need_std = results_df.pivot_table(
+                index='player_name',
+                columns='team_name',
+                values='win_improvement_std'
+            )
+            return need_matrix, need_std
+        return need_matrix
+    else:
+        return (pd.DataFrame(), pd.DataFrame()) if return_std else pd.DataFrame()
+
+def calculate_team_need(player_rating, player_name, team_name, player_position, team, team_model):
+    """
+    Calculate how much a team needs a specific free agent based on win prediction difference.
+    
+    Args:
+        player_rating (float): Overall rating of the free agent player
+        player_position (str): Position of the free agent player (e.g., 'HB')
+        team (DataFrame): DataFrame containing the team data
+        team_model (TeamModel or TeamPredictor): Trained team model for win prediction
+        
+    Returns:
+        dict: Dictionary containing player rating, current win prediction, 
+              win prediction with player, and win improvement
+    """
+    if player_rating is None:
+        return None
+    
+    if team.empty:
+        logger.error("Team data is empty.")
+        return None
+    
+    # The team as it is and with the player, predicted together; the player joins
+    # only if better than the team's worst player at the player's position
+    features = build_need_features([player_rating], player_position, team.iloc[:1], team_model)
+    current_win_prediction, win_prediction_with_player = team_model.predict(features)
+    
+    # Calculate improvement
+    win_improvement = win_prediction_with_player - current_win_prediction
+    
+    return {
+        'player_name': player_name,
+        'player_rating': player_rating,
+        'team_name': team_name,
+        'current_win_prediction': current_win_prediction,
+        'win_prediction_with_player': win_prediction_with_player,
+        'win_improvement': win_improvement
+    }
+
+def build_need_features(player_ratings, player_positions, teams, team_model):
+    """
+    Build the feature matrix used to evaluate every free agent on every team at once.
+
+    The rosters are built on the teams' compact depth charts (model.depth_chart)
+    and laid out as model input only at the end.
+
+    Args:
+        player_ratings (ndarray): Overall ratings of the free agents
+        player_positions (str or array-like): Position of each free agent, or a single
+                                              position shared by all of them (e.g., 'HB')
+        teams (DataFrame): DataFrame with one row per team
+        team_model (TeamModel or TeamPredictor): Team model whose feature columns are laid out
+
+    Returns:
+        ndarray: float32 features in the model's column order. The first len(teams) rows
+                 hold each team as is, followed by one row per (player, team) pair with
+                 the player added.
+    """
+    feature_columns = team_model.feature_columns
+    if feature_columns is None:
+        feature_columns = team_runtime.get_feature_columns(teams)
+
+    depth_chart = DepthChart.from_frame(teams, feature_columns)
+    rosters = depth_chart.with_players(player_ratings, player_positions)
+    return np.concatenate([depth_chart.to_dense(feature_columns), depth_chart.to_dense(feature_columns, rosters)])
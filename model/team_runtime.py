@@ -0,0 +1,191 @@
+"""
+NumPy-only inference for the team win model.
+
+TeamModel.export freezes the trained network and its scaler into
+saved_models/team_model.npz: the weights of each layer, with the scaler
+folded into the first one, and the feature columns in training order. This
+module runs that bundle with nothing but NumPy, so code that only needs win
+predictions (the need matrix, simulation workers) starts without importing
+torch or sklearn. Export the bundle after training:
+
+    python model/team_model.py --export
+"""
+
+import os
+import json
+import numpy as np
+
+try:
+    from model import instrumentation
+    from model.atomic_io import atomic_write
+except ImportError:  # Run as a script from the model directory
+    import instrumentation
+    from atomic_io import atomic_write
+
+def get_model_dir():
+    """Get the default saved_models directory"""
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), "saved_models")
+
+BUNDLE_FILENAME = "team_model.npz"
+
+# Files the bundle is exported from; a bundle older than either is stale
+SOURCE_FILENAMES = ["team_model.pt", "team_scaler.pkl"]
+
+# Columns of the team data that are not model features
+NON_FEATURE_COLUMNS = ['team_name', 'year', 'regular_season_wins', 'playoff_wins', 'total_wins']
+
+def get_feature_columns(data):
+    """Feature columns of a frame of team rows, in the frame's order."""
+    return [col for col in data.columns if col not in NON_FEATURE_COLUMNS]
+
+class TeamPredictor:
+    """
+    Forward pass of NeuralNetworkRegressor in NumPy: fully connected layers with
+    a leaky ReLU between them, taking unscaled feature rows. An ensemble's
+    weights are stacked along a leading member axis, and every member is
+    evaluated with one batched matmul per layer.
+    """
+    def __init__(self, weights, biases, feature_columns, negative_slope=0.1):
+        """
+        Args:
+            weights (list): Weight matrix of each layer, shape (outputs, inputs), or (members, outputs,
+                            inputs) for an ensemble; first layer already scaled
+            biases (list): Bias vector of each layer, shape (outputs,) or (members, outputs)
+            feature_columns (list): Feature column names in training order
+            negative_slope (float): Slope of the leaky ReLU for negative inputs
+        """
+        # Stored as (members, inputs, outputs) and (members, 1, outputs) so each layer is a plain x @ W + b
+        self.weights = [np.ascontiguousarray(np.swapaxes(np.asarray(weight, dtype=np.float32).reshape(
+            (-1,) + np.shape(weight)[-2:]), 1, 2)) for weight in weights]
+        self.biases = [np.asarray(bias, dtype=np.float32).reshape(len(weight), 1, -1)
+                       for weight, bias in zip(self.weights, biases)]
+        self.feature_columns = list(feature_columns)
+        self.negative_slope = np.float32(negative_slope)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load an exported bundle.
+
+        Args:
+            path (str): Path of the .npz bundle
+
+        Returns:
+            TeamPredictor: Predictor running the bundled network
+        """
+        with np.load(path) as bundle:
+            num_layers = int(bundle['num_layers'])
+            return cls(
+                [bundle[f'weight_{i}'] for i in range(num_layers)],
+                [bundle[f'bias_{i}'] for i in range(num_layers)],
+                json.loads(str(bundle['feature_columns'])),
+                float(bundle['negative_slope']),
+            )
+
+    def save(self, path):
+        """
+        Save the predictor as a bundle that load reads back.
+
+        Args:
+            path (str): Path of the .npz bundle to write
+        """
+        arrays = {f'weight_{i}': np.swapaxes(weight, 1, 2) for i, weight in enumerate(self.weights)}
+        arrays.update({f'bias_{i}': bias[:, 0, :] for i, bias in enumerate(self.biases)})
+        with atomic_write(path, 'wb') as f:
+            np.savez(f, num_layers=len(self.weights), negative_slope=self.negative_slope,
+                     feature_columns=json.dumps(self.feature_columns), **arrays)
+
+    def preprocess_data(self, data):
+        """
+        Split a frame of team rows into features and total wins, like TeamModel.preprocess_data.
+
+        Args:
+            data (DataFrame): Team rows
+
+        Returns:
+            tuple: (features in training order, total wins or None)
+        """
+        y = data['total_wins'] if 'total_wins' in data.columns else None
+        return data[self.feature_columns], y
+
+    def _to_feature_matrix(self, team_data):
+        if isinstance(team_data, list):
+            return np.concatenate([self._to_feature_matrix(frame) for frame in team_data])
+        # Frames (anything with columns) are reduced to the feature columns; arrays are taken as is
+        if hasattr(team_data, 'columns'):
+            positions = team_data.columns.get_indexer(self.feature_columns)
+            if (positions < 0).any():
+                missing = [col for col, position in zip(self.feature_columns, positions) if position < 0]
+                raise KeyError(f"Missing feature columns: {missing}")
+            team_data = team_data.to_numpy()[:, positions]
+        return np.asarray(team_data, dtype=np.float32).reshape(len(team_data), -1)
+
+    @property
+    def ensemble_size(self):
+        return len(self.weights[0])
+
+    def predict_members(self, team_data):
+        """
+        Predict the total wins of each ensemble member.
+
+        Args:
+            team_data (DataFrame, list or ndarray): Team rows, as taken by TeamModel.predict
+
+        Returns:
+            ndarray: Array of shape (rows, members) with each member's predicted total wins
+        """
+        x = self._to_feature_matrix(team_data)
+        instrumentation.count('model.forward_calls')
+        instrumentation.count('model.rows', len(x))
+        last = len(self.weights) - 1
+        for i, (weight, bias) in enumerate(zip(self.weights, self.biases)):
+            x = np.matmul(x, weight)
+            x += bias
+            if i < last:
+                np.maximum(x, x * self.negative_slope, out=x)
+        return x[:, :, 0].T
+
+    def predict(self, team_data, return_std=False):
+        """
+        Predict the total wins for teams based on their Madden ratings.
+
+        Args:
+            team_data (DataFrame, list or ndarray): Team rows, as taken by TeamModel.predict
+            return_std (bool): If True, also return the standard deviation across ensemble members
+
+        Returns:
+            ndarray: Predicted total wins for each row (the ensemble mean), and with return_std
+                     a second array with the spread of the members (zero for a single model)
+        """
+        members = self.predict_members(team_data)
+        if return_std:
+            return members.mean(axis=1), members.std(axis=1)
+        return members.mean(axis=1)
+
+def is_bundle_current(model_dir=None):
+    """True if the bundle exists and was exported after the model and scaler were last saved."""
+    model_dir = model_dir or get_model_dir()
+    bundle_path = os.path.join(model_dir, BUNDLE_FILENAME)
+    if not os.path.exists(bundle_path):
+        return False
+    bundle_time = os.path.getmtime(bundle_path)
+    for filename in SOURCE_FILENAMES:
+        path = os.path.join(model_dir, filename)
+        if os.path.exists(path) and os.path.getmtime(path) > bundle_time:
+            return False
+    return True
+
+def load_team_predictor(model_dir=None):
+    """
+    Load the exported bundle if it is up to date.
+
+    Args:
+        model_dir (str, optional): Directory of the saved model. If None, uses the default location.
+
+    Returns:
+        TeamPredictor: The predictor, or None if there is no current bundle
+    """
+    model_dir = model_dir or get_model_dir()
+    if not is_bundle_current(model_dir):
+        return None
+    return TeamPredictor.load(os.path.join(model_dir, BUNDLE_FILENAME))
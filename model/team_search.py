@@ -0,0 +1,250 @@
+"""
+Cross-validated hyperparameter search for the team win model.
+
+Each trial trains a NeuralNetworkRegressor with one configuration (depth,
+width, dropout, learning rate, epochs) on every k-fold split of the Madden
+team data and scores it by its mean held-out MSE. Trials run in worker
+processes, each limited to one torch thread. Finished trials are cached
+under data/store/team_search by a hash of the data and the configuration, so
+repeating or widening a search only runs the new trials. The best
+configuration is written to model/best_team_config.json. Run from the
+project root:
+
+    python model/team_search.py --trials 20
+    python model/team_search.py --grid --train
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import itertools
+import numpy as np
+import torch
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from sklearn.model_selection import KFold
+from sklearn.metrics import mean_squared_error, r2_score
+from sklearn.preprocessing import StandardScaler
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from model import data_store
+from model.atomic_io import atomic_write
+from model.model_registry import get_data_hash
+from model.team_model import TeamModel, TRAINING_MODES, fit_network, load_team_data
+
+CACHE_DIR = os.path.join(data_store.STORE_DIR, "team_search")
+BEST_CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "best_team_config.json")
+
+# Values tried for each setting; the grid is every combination of them
+SEARCH_SPACE = {
+    'depth': [2, 3, 4],
+    'width': [32, 64, 128],
+    'dropout': [0.0, 0.2, 0.4],
+    'learning_rate': [0.0003, 0.001, 0.003],
+    'epochs': [100, 300],
+}
+
+# Data handed to each worker once, when the pool starts
+_shared = {}
+
+def get_hidden_sizes(depth, width):
+    """Hidden layer widths that halve from width at each layer, as in the original 128-64-32-16 network."""
+    return [max(width // 2 ** i, 4) for i in range(depth)]
+
+def get_trial_key(data_hash, config, folds, seed):
+    """Cache key of a trial: the same data, configuration, folds and seed always give the same scores."""
+    trial = json.dumps({'data': data_hash, 'config': config, 'folds': folds, 'seed': seed}, sort_keys=True)
+    return hashlib.sha256(trial.encode()).hexdigest()
+
+def grid_configs(space, batch_size):
+    """Every combination of the search space."""
+    names = list(space)
+    return [dict(zip(names, values), batch_size=batch_size) for values in itertools.product(*space.values())]
+
+def random_configs(space, batch_size, trials, seed):
+    """
+    A random sample of distinct combinations of the search space. The same seed
+    always shuffles the grid the same way, so asking for more trials extends the
+    previous sample and the cached trials are reused.
+    """
+    grid = grid_configs(space, batch_size)
+    order = np.random.default_rng(seed).permutation(len(grid))
+    return [grid[i] for i in order[:trials]]
+
+def _init_worker(X, y):
+    # Trials already run in parallel; more threads per trial would only compete for the same cores
+    torch.set_num_threads(1)
+    _shared['X'] = X
+    _shared['y'] = y
+
+def run_trial(config, folds, seed):
+    """
+    Cross-validate one configuration inside a worker.
+
+    Args:
+        config (dict): depth, width, dropout, learning_rate, epochs and batch_size
+        folds (int): Number of k-fold splits
+        seed (int): Seed for the splits and the network initialisation
+
+    Returns:
+        dict: Mean and standard deviation of the held-out MSE and R² across folds, and the seconds taken
+    """
+    X, y = _shared['X'], _shared['y']
+    start = time.perf_counter()
+    mse, r2 = [], []
+    for fold, (train_rows, test_rows) in enumerate(KFold(folds, shuffle=True, random_state=seed).split(X)):
+        scaler = StandardScaler()
+        X_train = torch.from_numpy(scaler.fit_transform(X[train_rows]))
+        y_train = torch.from_numpy(y[train_rows]).reshape(-1, 1)
+        X_test = torch.from_numpy(scaler.transform(X[test_rows]))
+
+        torch.manual_seed(seed + fold)
+        network, _ = fit_network(X_train, y_train, get_hidden_sizes(config['depth'], config['width']),
+                                 config['dropout'], config['batch_size'], config['epochs'], config['learning_rate'])
+        with torch.no_grad():
+            predicted = network(X_test).numpy().ravel()
+        mse.append(mean_squared_error(y[test_rows], predicted))
+        r2.append(r2_score(y[test_rows], predicted))
+
+    return {'mse': float(np.mean(mse)), 'mse_std': float(np.std(mse)), 'r2': float(np.mean(r2)),
+            'r2_std': float(np.std(r2)), 'seconds': time.perf_counter() - start}
+
+def _load_cached(cache_dir, key):
+    path = os.path.join(cache_dir, f"{key}.json")
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+def _save_cached(cache_dir, key, result):
+    with atomic_write(os.path.join(cache_dir, f"{key}.json")) as f:
+        json.dump(result, f)
+
+def search(data, configs, folds=5, seed=42, max_workers=None, cache_dir=CACHE_DIR):
+    """
+    Cross-validate every configuration, reusing cached trials.
+
+    Args:
+        data (DataFrame): Madden team data with total_wins
+        configs (list): Configurations to try, from grid_configs or random_configs
+        folds (int): Number of k-fold splits
+        seed (int): Seed for the splits and the network initialisation
+        max_workers (int, optional): Number of worker processes. Defaults to the CPU count.
+        cache_dir (str): Directory of cached trial results
+
+    Returns:
+        list: One dict per configuration with its config and scores, best (lowest MSE) first
+    """
+    X, y = TeamModel().preprocess_data(data)
+    data_hash = get_data_hash(X.to_numpy(dtype=float), y.to_numpy(dtype=float), X.columns)
+    # float32 throughout, so the scaled folds become tensors without a copy
+    X = X.to_numpy(dtype=np.float32)
+    y = y.to_numpy(dtype=np.float32)
+
+    results = []
+    pending = {}
+    for config in configs:
+        key = get_trial_key(data_hash, config, folds, seed)
+        cached = _load_cached(cache_dir, key)
+        if cached is not None:
+            results.append(cached)
+        else:
+            pending[key] = config
+
+    print(f"{len(configs)} configurations, {len(configs) - len(pending)} cached, {len(pending)} to run")
+    if pending:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(X, y)) as executor:
+            futures = {executor.submit(run_trial, config, folds, seed): key for key, config in pending.items()}
+            for done, future in enumerate(as_completed(futures), start=1):
+                key = futures[future]
+                result = {'config': pending[key], 'folds': folds, 'seed': seed, 'data_hash': data_hash,
+                          **future.result()}
+                _save_cached(cache_dir, key, result)
+                results.append(result)
+                print(f"  [{done}/{len(pending)}] {format_config(result['config'])}: "
+                      f"MSE {result['mse']:.3f}, R² {result['r2']:.3f} ({result['seconds']:.1f}s)")
+
+    return sorted(results, key=lambda result: result['mse'])
+
+def format_config(config):
+    hidden_sizes = '-'.join(str(size) for size in get_hidden_sizes(config['depth'], config['width']))
+    return (f"{hidden_sizes}, dropout {config['dropout']}, lr {config['learning_rate']}, "
+            f"{config['epochs']} epochs, batch {config['batch_size']}")
+
+def save_best_config(result, path=BEST_CONFIG_PATH):
+    """
+    Write the winning configuration with its scores.
+
+    Args:
+        result (dict): Best entry returned by search
+        path (str): File to write
+    """
+    config = result['config']
+    best = {
+        'hidden_sizes': get_hidden_sizes(config['depth'], config['width']),
+        'dropout': config['dropout'],
+        'learning_rate': config['learning_rate'],
+        'epochs': config['epochs'],
+        'batch_size': config['batch_size'],
+        'cv_mse': result['mse'],
+        'cv_r2': result['r2'],
+        'folds': result['folds'],
+        'data_hash': result['data_hash'],
+    }
+    with open(path, 'w') as f:
+        json.dump(best, f, indent=4)
+    print(f"Best configuration written to {path}")
+
+def load_best_config(path=BEST_CONFIG_PATH):
+    """Read the configuration written by save_best_config, or None if there is none."""
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+def train_best(path=BEST_CONFIG_PATH):
+    """
+    Train and save TeamModel with the best configuration found.
+
+    Returns:
+        tuple: (mse, r2) on TeamModel's test split
+    """
+    best = load_best_config(path)
+    if best is None:
+        raise ValueError(f"No best configuration at {path}. Run a search first.")
+    model = TeamModel(best['hidden_sizes'], best['dropout'])
+    return model.train(force_train=True, batch_size=best['batch_size'], epochs=best['epochs'],
+                       learning_rate=best['learning_rate'])
+
+def main():
+    parser = argparse.ArgumentParser(description="Cross-validated hyperparameter search for TeamModel")
+    parser.add_argument('--grid', action='store_true', help="try every combination of SEARCH_SPACE instead of a random sample")
+    parser.add_argument('--trials', type=int, default=20, help="configurations sampled for a random search")
+    parser.add_argument('--folds', type=int, default=5, help="number of cross-validation folds")
+    parser.add_argument('--mode', type=str, default='large_batch', choices=list(TRAINING_MODES),
+                        help="training mode whose batch size every trial uses")
+    parser.add_argument('--seed', type=int, default=42, help="seed for sampling, folds and initialisation")
+    parser.add_argument('--workers', type=int, default=None, help="number of worker processes (default: CPU count)")
+    parser.add_argument('--train', action='store_true', help="train and save TeamModel with the best configuration")
+    args = parser.parse_args()
+
+    batch_size = TRAINING_MODES[args.mode]['batch_size']
+    if args.grid:
+        configs = grid_configs(SEARCH_SPACE, batch_size)
+    else:
+        configs = random_configs(SEARCH_SPACE, batch_size, args.trials, args.seed)
+
+    results = search(load_team_data(), configs, args.folds, args.seed, args.workers)
+
+    print(f"\nBest configurations ({args.folds}-fold CV):")
+    for result in results[:10]:
+        print(f"  MSE {result['mse']:.3f} ± {result['mse_std']:.3f}, R² {result['r2']:.3f}  {format_config(result['config'])}")
+    save_best_config(results[0])
+
+    if args.train:
+        train_best()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""
+Atomic file writes for the scripts: a file written through atomic_write
+replaces its destination only once it is complete, so a reader (or a run that
+was interrupted) never sees a half-written cached page or manifest.
+"""
+
+import os
+import contextlib
+
+@contextlib.contextmanager
+def atomic_write(path, mode='w'):
+    """
+    Open a temporary file next to path that replaces it when the block exits cleanly.
+
+    If the block raises, the temporary file is removed and path is left as it was.
+
+    Args:
+        path (str): Path of the file to write; its directory is created if needed
+        mode (str): 'w' for text or 'wb' for bytes
+
+    Yields:
+        file: The open temporary file
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    # The pid keeps processes writing the same path from sharing a temporary file
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, mode) as f:
+            yield f
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
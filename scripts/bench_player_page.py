@@ -0,0 +1,96 @@
+"""
+Time the streaming player page parser against the BeautifulSoup + pd.read_html one.
+
+Pages come from a folder of saved player pages (--pages) or, by default, from
+the player pages already in the HTTP cache. Run from the project root:
+
+    python scripts/bench_player_page.py --pages saved_pages/
+"""
+
+import os
+import glob
+import json
+import time
+import argparse
+import warnings
+import numpy as np
+import pandas as pd
+
+import http_cache
+from rb_data import parse_player_data, parse_player_data_soup
+
+def load_cached_pages(cache):
+    """Return (url, html) for every pro-football-reference player page in the HTTP cache."""
+    pages = []
+    for entry_path in glob.glob(os.path.join(cache.cache_dir, "index", "*", "*.json")):
+        with open(entry_path) as f:
+            url = json.load(f)['url']
+        if "/players/" in url and url.endswith(".htm"):
+            response = cache.lookup(url)
+            if response is not None:
+                pages.append((url, response.text))
+    return pages
+
+def load_saved_pages(folder):
+    """Return (file name, html) for every .htm or .html file in a folder."""
+    pages = []
+    for path in sorted(glob.glob(os.path.join(folder, "*.htm*"))):
+        with open(path, encoding="utf-8") as f:
+            pages.append((os.path.basename(path), f.read()))
+    return pages
+
+def time_parser(parse, pages, repeat):
+    """Return the best total time over repeat passes and the frames of the last pass."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        frames = [parse(html, name) for name, html in pages]
+        best = min(best, time.perf_counter() - start)
+    return best, frames
+
+def _as_numbers(column):
+    # pd.read_html leaves a column as text when any row (e.g. a repeated header) is not a number
+    return pd.to_numeric(column.astype(str).str.replace(',', '', regex=False).replace('nan', ''), errors='coerce')
+
+def frames_match(a, b):
+    """True if two parsed tables have the same columns and rows, comparing numbers by value."""
+    if list(a.columns) != list(b.columns) or a.shape != b.shape:
+        return False
+    for col in a.columns:
+        x, y = a[col].reset_index(drop=True), b[col].reset_index(drop=True)
+        x_numbers, y_numbers = _as_numbers(x), _as_numbers(y)
+        if x_numbers.notna().sum() == x.notna().sum() and y_numbers.notna().sum() == y.notna().sum():
+            if not np.allclose(x_numbers, y_numbers, equal_nan=True):
+                return False
+        elif not x.fillna('').astype(str).equals(y.fillna('').astype(str)):
+            return False
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark player page parsing")
+    parser.add_argument('--pages', type=str, help="folder of saved player pages (default: player pages in the HTTP cache)")
+    parser.add_argument('--repeat', type=int, default=3, help="passes over the pages; the best one counts")
+    args = parser.parse_args()
+
+    pages = load_saved_pages(args.pages) if args.pages else load_cached_pages(http_cache.get_cache())
+    if not pages:
+        print("No player pages found")
+        return
+    print(f"{len(pages)} pages, {sum(len(html) for _, html in pages) / len(pages) / 1024:.0f} KB on average")
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        soup_time, soup_frames = time_parser(parse_player_data_soup, pages, args.repeat)
+    stream_time, stream_frames = time_parser(parse_player_data, pages, args.repeat)
+
+    mismatches = [name for (name, _), a, b in zip(pages, soup_frames, stream_frames) if not frames_match(a, b)]
+
+    print(f"BeautifulSoup + read_html: {soup_time / len(pages) * 1000:.2f} ms per page")
+    print(f"Streaming parser:          {stream_time / len(pages) * 1000:.2f} ms per page")
+    print(f"Speedup:                   {soup_time / stream_time:.1f}x")
+    print(f"Pages with different output: {len(mismatches)}")
+    for name in mismatches[:10]:
+        print(f"  {name}")
+
+if __name__ == "__main__":
+    main()
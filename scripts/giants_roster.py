@@ -1,6 +1,7 @@
 import requests
 import json
 from datetime import datetime
+import http_cache
 
 class GiantsRosterFetcher:
     def __init__(self):
@@ -12,7 +13,8 @@ class GiantsRosterFetcher:
     def fetch_roster(self):
         try:
             # Make request to ESPN API
-            response = requests.get(f"{self.base_url}/roster", headers=self.headers)
+            # The roster changes during the season, so cached copies are kept for an hour only
+            response = http_cache.get(f"{self.base_url}/roster", headers=self.headers, ttl=60 * 60)
             response.raise_for_status()
             
             # Parse the JSON response
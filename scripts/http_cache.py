@@ -0,0 +1,193 @@
+"""
+On-disk cache of HTTP responses shared by the scrapers.
+
+Responses are indexed by URL. Bodies are gzipped and stored under the hash of
+their content, so pages that come back identical are only stored once. Each
+index entry keeps the response's ETag and Last-Modified headers: once an entry
+is older than the TTL it is revalidated with a conditional request, and a
+304 Not Modified answer reuses the stored body.
+
+In offline mode nothing is fetched and only cached responses are served, so
+parsing code can be rerun and timed without the scrapers' throttling.
+The default cache can be set up from the environment:
+
+    HTTP_CACHE_DIR      cache directory (default data/http_cache)
+    HTTP_CACHE_TTL      seconds a response is used without revalidating (default one week)
+    HTTP_CACHE_OFFLINE  set to 1 to serve only from the cache
+"""
+
+import os
+import gzip
+import json
+import time
+import hashlib
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from atomic_io import atomic_write
+
+def get_project_root():
+    """Get the absolute path to the project root directory"""
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.dirname(current_dir)
+
+DEFAULT_CACHE_DIR = os.path.join(get_project_root(), "data", "http_cache")
+DEFAULT_TTL = 7 * 24 * 60 * 60
+
+# Response headers kept with the body
+STORED_HEADERS = ['Content-Type', 'ETag', 'Last-Modified']
+
+class CacheMissError(requests.exceptions.ConnectionError):
+    """Raised in offline mode for a URL that is not in the cache."""
+
+class HttpCache:
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, ttl=DEFAULT_TTL, offline=False):
+        """
+        Args:
+            cache_dir (str): Directory holding the index and the stored bodies
+            ttl (float): Seconds a cached response is used without revalidating it.
+                         None never revalidates; 0 always does.
+            offline (bool): If True, never go to the network
+        """
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.offline = offline
+
+    def _entry_path(self, url):
+        key = hashlib.sha256(url.encode()).hexdigest()
+        return os.path.join(self.cache_dir, "index", key[:2], f"{key}.json")
+
+    def _body_path(self, digest):
+        return os.path.join(self.cache_dir, "bodies", digest[:2], f"{digest}.gz")
+
+    def _write(self, path, data):
+        with atomic_write(path, 'wb') as f:
+            f.write(data)
+
+    def _load_entry(self, url):
+        try:
+            with open(self._entry_path(url)) as f:
+                entry = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        if not os.path.exists(self._body_path(entry['digest'])):
+            return None
+        return entry
+
+    def _store(self, url, response):
+        body = response.content
+        digest = hashlib.sha256(body).hexdigest()
+        body_path = self._body_path(digest)
+        if not os.path.exists(body_path):
+            self._write(body_path, gzip.compress(body))
+
+        entry = {
+            'url': url,
+            'digest': digest,
+            'encoding': response.encoding,
+            'headers': {name: response.headers[name] for name in STORED_HEADERS if name in response.headers},
+            'fetched_at': time.time(),
+        }
+        self._write(self._entry_path(url), json.dumps(entry).encode())
+        return entry
+
+    def _to_response(self, entry):
+        with open(self._body_path(entry['digest']), 'rb') as f:
+            body = gzip.decompress(f.read())
+
+        response = requests.Response()
+        response._content = body
+        response.status_code = 200
+        response.url = entry['url']
+        response.encoding = entry['encoding']
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response.from_cache = True
+        return response
+
+    def is_fresh(self, entry, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        return ttl is None or time.time() - entry['fetched_at'] < ttl
+
+    def lookup(self, url, ttl=None):
+        """
+        Get a cached response without going to the network.
+
+        Args:
+            url (str): URL of the response
+            ttl (float, optional): Overrides the cache's TTL
+
+        Returns:
+            Response: The cached response if it is fresh (or the cache is offline), otherwise None
+        """
+        entry = self._load_entry(url)
+        if entry is None or not (self.offline or self.is_fresh(entry, ttl)):
+            return None
+        return self._to_response(entry)
+
+    def get(self, url, session=None, headers=None, timeout=30, ttl=None):
+        """
+        Drop-in replacement for requests.get that goes through the cache.
+
+        Only 200 responses are cached; other responses are returned as they came.
+
+        Args:
+            url (str): URL to fetch
+            session (Session, optional): Session to fetch with, for connection reuse
+            headers (dict, optional): Request headers
+            timeout (float): Seconds to wait for a response
+            ttl (float, optional): Overrides the cache's TTL for this URL
+
+        Returns:
+            Response: The response, with from_cache set to True if no body was downloaded
+
+        Raises:
+            CacheMissError: If the cache is offline and the URL is not cached
+        """
+        entry = self._load_entry(url)
+        if entry is not None and (self.offline or self.is_fresh(entry, ttl)):
+            return self._to_response(entry)
+        if self.offline:
+            raise CacheMissError(f"{url} is not in the cache")
+
+        # Stale entries are revalidated instead of downloaded again
+        request_headers = dict(headers or {})
+        if entry is not None:
+            if 'ETag' in entry['headers']:
+                request_headers['If-None-Match'] = entry['headers']['ETag']
+            if 'Last-Modified' in entry['headers']:
+                request_headers['If-Modified-Since'] = entry['headers']['Last-Modified']
+
+        response = (session or requests).get(url, headers=request_headers, timeout=timeout)
+        if response.status_code == 304 and entry is not None:
+            entry['fetched_at'] = time.time()
+            self._write(self._entry_path(url), json.dumps(entry).encode())
+            return self._to_response(entry)
+
+        response.from_cache = False
+        if response.status_code == 200:
+            self._store(url, response)
+        return response
+
+_default_cache = None
+
+def get_cache():
+    """Get the cache shared by the scrapers, set up from the environment on first use."""
+    global _default_cache
+    if _default_cache is None:
+        ttl = os.environ.get("HTTP_CACHE_TTL")
+        _default_cache = HttpCache(
+            cache_dir=os.environ.get("HTTP_CACHE_DIR", DEFAULT_CACHE_DIR),
+            ttl=float(ttl) if ttl else DEFAULT_TTL,
+            offline=os.environ.get("HTTP_CACHE_OFFLINE", "") not in ("", "0"),
+        )
+    return _default_cache
+
+def configure(**kwargs):
+    """Replace the shared cache, e.g. configure(offline=True)."""
+    global _default_cache
+    _default_cache = HttpCache(**kwargs)
+    return _default_cache
+
+def get(url, **kwargs):
+    """Fetch a URL through the shared cache. Takes the same arguments as HttpCache.get."""
+    return get_cache().get(url, **kwargs)
@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""
+Build madden_data_processed.xlsx from the downloaded Madden ratings workbooks.
+
+Does what preprocessing.ipynb does, as a script: each team workbook becomes one
+row holding the overall ratings of the team's players, best first, in the
+depth chart columns C1..WR13, followed by the team name, year and wins.
+
+Workbooks are parsed in a process pool, reading only the position and
+overall rating columns straight from the sheet XML. A manifest keeps the
+content hash and parsed row of every workbook, and is saved after each one,
+so a rerun (e.g. after adding a new Madden year) only parses the new or
+changed files. Run from anywhere:
+
+    python scripts/madden-scraper/madden_ingest.py
+"""
+
+import os
+import re
+import sys
+import zipfile
+import argparse
+import pandas as pd
+from lxml import etree
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(os.path.dirname(SCRIPT_DIR))
+
+sys.path.insert(0, PROJECT_ROOT)
+from model import team_ids
+from manifest import get_file_hash, load_manifest, save_manifest
+
+RATINGS_DIR = os.path.join(SCRIPT_DIR, "madden_ratings")
+OUTPUT_PATH = os.path.join(PROJECT_ROOT, "model", "madden_data_processed.xlsx")
+MANIFEST_PATH = os.path.join(PROJECT_ROOT, "data", "store", "madden_manifest.json")
+WINS_PATH = os.path.join(PROJECT_ROOT, "data", "wins", "NFL_Team_Wins_2015_2024_ESPN.csv")
+
+# Most players any team had at each position, plus one spare slot
+POSITION_MAXIMUMS = [
+    ("C", 5), ("CB", 11), ("DT", 9), ("FB", 3), ("FS", 6), ("HB", 7), ("K", 3),
+    ("LE", 6), ("LG", 5), ("LOLB", 6), ("LT", 4), ("MLB", 9), ("P", 2), ("QB", 5),
+    ("RE", 6), ("RG", 4), ("ROLB", 5), ("RT", 5), ("SS", 6), ("TE", 9), ("WR", 12)
+]
+DEPTH_CHART_COLUMNS = [f"{position}{i}" for position, max_count in POSITION_MAXIMUMS for i in range(1, max_count + 2)]
+WINS_COLUMNS = ['regular_season_wins', 'playoff_wins', 'total_wins']
+OUTPUT_COLUMNS = DEPTH_CHART_COLUMNS + ['team_name', 'year'] + WINS_COLUMNS
+
+# Column names used by the different Madden years, in order of preference
+POSITION_COLUMNS = ['Position', 'POSITION']
+OVERALL_COLUMNS = ['OVERALL RATING', 'OVR', 'Overall', 'Overall Rating', 'OverallRating']
+
+XLSX_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+RELATIONSHIP_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+
+def normalize_team_name(team_name):
+    """Map a team name from a Madden file name to the team's current name, or None if it is not an NFL team"""
+    # Clean up the team name by removing any Madden-specific suffixes
+    cleaned_name = re.sub(r'__madden_nfl_\d+_', '', team_name)
+    cleaned_name = re.sub(r'__madden_ratings_\d+', '', cleaned_name)
+    cleaned_name = re.sub(r'_madden_\d+', '', cleaned_name)
+    cleaned_name = re.sub(r'\(madden_nfl_\d+\)', '', cleaned_name)
+    cleaned_name = cleaned_name.strip('_')
+
+    return team_ids.canonical_team_name(cleaned_name)
+
+def extract_year_from_filename(filename):
+    """Get the season (e.g. 2019) a Madden file is for"""
+    patterns = [
+        r'madden_(\d+)_',  # Standard pattern: madden_19_team.xlsx or madden_15_arizona_cardinals
+        r'madden_nfl_(\d+)_',  # Pattern: madden_nfl_24_team.xlsx
+        r'__madden_nfl_(\d+)_',  # Pattern with double underscore
+        r'__madden_ratings_(\d+)',  # Another possible pattern
+        r'\(madden_nfl_(\d+)\)',  # Pattern with parentheses
+    ]
+
+    for pattern in patterns:
+        match = re.search(pattern, filename)
+        if match:
+            year = int(match.group(1))
+            # Convert to full year (e.g., 15 -> 2015)
+            return 2000 + year if year < 100 else year
+
+    return None
+
+def extract_team_from_filename(filename):
+    """Get the team part of a Madden file name"""
+    patterns = [
+        r'madden_\d+_(.*?)\.xlsx?',  # Standard pattern like madden_15_arizona_cardinals.xlsx
+        r'madden_nfl_\d+_(.*?)\.xlsx?',  # NFL pattern
+        r'(.*?)__madden_nfl_\d+_\.xlsx?',  # Pattern with team name first
+        r'(.*?)_\(madden_nfl_\d+\)\.xlsx?',  # Pattern with parentheses
+    ]
+
+    for pattern in patterns:
+        match = re.search(pattern, filename)
+        if match:
+            return match.group(1)
+    return None
+
+def get_file_team(filename):
+    """
+    Get the team and year of a Madden file.
+
+    Returns:
+        tuple: (team_name, year), or None for files that are not an NFL team
+               (Pro Bowl rosters, full player lists, legends, ...)
+    """
+    year = extract_year_from_filename(filename)
+    team_name = extract_team_from_filename(filename)
+    if not year or not team_name or 'pro_bowl' in team_name.lower():
+        return None
+
+    team_name = normalize_team_name(team_name)
+    if team_name is None:
+        return None
+    return team_name, year
+
+def _column_letters(reference):
+    # "AB12" -> "AB"
+    return reference.rstrip('0123456789')
+
+def _read_xml(workbook, path):
+    with workbook.open(path) as f:
+        return etree.parse(f).getroot()
+
+def read_sheet_columns(file_path, columns):
+    """
+    Read some columns of the first sheet of an xlsx workbook.
+
+    Only the sheet's XML is parsed, and only cells under the wanted headers
+    are picked out and converted, instead of loading the whole workbook with
+    its styles. Values come out as pd.read_excel gives them: whole numbers
+    become ints and columns of numbers stored as text become numbers.
+
+    Args:
+        file_path (str): Path to the workbook
+        columns (list): Header names of the columns to read; missing ones are skipped
+
+    Returns:
+        DataFrame: The requested columns that exist in the sheet, in sheet order
+    """
+    with zipfile.ZipFile(file_path) as workbook:
+        # First sheet listed in the workbook, as pd.read_excel uses by default
+        sheet_id = _read_xml(workbook, 'xl/workbook.xml').find(f'{XLSX_NS}sheets/{XLSX_NS}sheet').get(f'{RELATIONSHIP_NS}id')
+        relationships = _read_xml(workbook, 'xl/_rels/workbook.xml.rels')
+        target = next(rel.get('Target') for rel in relationships if rel.get('Id') == sheet_id)
+        sheet_path = target.lstrip('/') if target.startswith('/') else f"xl/{target}"
+
+        shared_strings = []
+        if 'xl/sharedStrings.xml' in workbook.namelist():
+            for item in _read_xml(workbook, 'xl/sharedStrings.xml'):
+                shared_strings.append(''.join(text.text or '' for text in item.iter(f'{XLSX_NS}t')))
+
+        def value(cell):
+            cell_type = cell.get('t')
+            if cell_type == 'inlineStr':
+                return ''.join(text.text or '' for text in cell.iter(f'{XLSX_NS}t'))
+            raw = cell.findtext(f'{XLSX_NS}v')
+            if raw is None:
+                return None
+            if cell_type == 's':
+                return shared_strings[int(raw)]
+            if cell_type in ('str', 'e'):
+                return raw
+            if cell_type == 'b':
+                return raw == '1'
+            number = float(raw)
+            return int(number) if number.is_integer() else number
+
+        sheet = _read_xml(workbook, sheet_path)
+
+    # Header row: find the letters of the wanted columns
+    header = sheet.find(f'{XLSX_NS}sheetData/{XLSX_NS}row')
+    if header is None:
+        return pd.DataFrame()
+    if header.get('r') is None or any(cell.get('r') is None for cell in header.iterchildren(f'{XLSX_NS}c')):
+        # Cell references are optional in the format; without them fall back to pandas
+        return pd.read_excel(file_path, usecols=lambda col: col in columns)
+    headers = {value(cell): _column_letters(cell.get('r')) for cell in header.iterchildren(f'{XLSX_NS}c')}
+    header_row = int(header.get('r'))
+
+    # Cells of one column are selected by their reference ("C2", "C3", ...) inside lxml
+    data = {}
+    for col in columns:
+        letters = headers.get(col)
+        if letters is None or col in data:
+            continue
+        cells = sheet.xpath(
+            f"x:sheetData/x:row/x:c[starts-with(@r, '{letters}') and "
+            f"translate(substring(@r, {len(letters) + 1}), '0123456789', '') = '']",
+            namespaces={'x': XLSX_NS[1:-1]}
+        )
+        data[col] = {int(cell.get('r')[len(letters):]): value(cell) for cell in cells}
+
+    last_row = max((max(values, default=header_row) for values in data.values()), default=header_row)
+    rows = range(header_row + 1, last_row + 1)
+    order = sorted(data, key=lambda col: (len(headers[col]), headers[col]))
+    frame = pd.DataFrame({col: [data[col].get(row) for row in rows] for col in order})
+
+    # Columns of numbers saved as text are read as numbers, like pd.read_excel does
+    for col in frame.columns:
+        try:
+            frame[col] = pd.to_numeric(frame[col])
+        except (ValueError, TypeError):
+            pass
+    return frame
+
+def _first_valid(frame, columns):
+    # Value of the first of the columns that is filled in, row by row
+    columns = [col for col in columns if col in frame.columns]
+    if not columns:
+        return pd.Series(index=frame.index, dtype=object)
+    return frame[columns].bfill(axis=1).iloc[:, 0]
+
+def parse_workbook(file_path):
+    """
+    Turn one team workbook into its depth chart.
+
+    Args:
+        file_path (str): Path to the workbook
+
+    Returns:
+        dict: Depth chart column (e.g. "HB1") to overall rating. Positions with
+              more players than there are columns keep only the best ones.
+    """
+    players = read_sheet_columns(file_path, POSITION_COLUMNS + OVERALL_COLUMNS)
+
+    players = pd.DataFrame({
+        'position': _first_valid(players, POSITION_COLUMNS),
+        'overall': _first_valid(players, OVERALL_COLUMNS),
+    }).dropna()
+
+    # Best player first at each position
+    players = players.sort_values('overall', ascending=False, kind='stable')
+    players['column'] = players['position'].astype(str) + (players.groupby('position').cumcount() + 1).astype(str)
+    players = players[players['column'].isin(DEPTH_CHART_COLUMNS)]
+    return {column: overall.item() if hasattr(overall, 'item') else overall
+            for column, overall in zip(players['column'], players['overall'])}
+
+def load_wins(wins_path, output_path):
+    """
+    Get regular season, playoff and total wins by team and year.
+
+    Reads the ESPN wins CSV if it exists, otherwise keeps the wins already in
+    the processed file.
+
+    Returns:
+        DataFrame: team_name, year and the wins columns
+    """
+    if os.path.exists(wins_path):
+        wins = pd.read_csv(wins_path)
+        # ESPN lists teams under the name of that season (Oakland Raiders); rows are matched on the current one
+        return pd.DataFrame({
+            'team_name': [team_ids.canonical_team_name(team) or team for team in wins['Team']],
+            'year': wins['Season'],
+            'regular_season_wins': wins['Regular Season Wins'],
+            'playoff_wins': wins['Playoff Wins'],
+            'total_wins': wins['Total Wins'],
+        }).drop_duplicates(['team_name', 'year'])
+    if os.path.exists(output_path):
+        previous = pd.read_excel(output_path, usecols=['team_name', 'year'] + WINS_COLUMNS)
+        return previous.drop_duplicates(['team_name', 'year'])
+    return pd.DataFrame(columns=['team_name', 'year'] + WINS_COLUMNS)
+
+def build_frame(manifest, wins, previous_order=None):
+    """
+    Assemble the processed frame from the parsed workbooks in the manifest.
+
+    Args:
+        manifest (dict): File name to its manifest entry
+        wins (DataFrame): Output of load_wins
+        previous_order (list, optional): (team_name, year) pairs in the order of
+                                         the previous output; those rows keep their
+                                         place and new ones go after them
+
+    Returns:
+        DataFrame: One row per team and year with OUTPUT_COLUMNS
+    """
+    rows = []
+    for filename in sorted(manifest):
+        entry = manifest[filename]
+        if entry.get('team_name') is not None and entry.get('ratings') is not None:
+            rows.append({**entry['ratings'], 'team_name': entry['team_name'], 'year': entry['year']})
+
+    frame = pd.DataFrame(rows, columns=DEPTH_CHART_COLUMNS + ['team_name', 'year'])
+    frame = frame.merge(wins, on=['team_name', 'year'], how='left')
+
+    if previous_order:
+        rank = {key: i for i, key in enumerate(previous_order)}
+        order = [rank.get((team, year), len(rank)) for team, year in zip(frame['team_name'], frame['year'])]
+        frame = frame.iloc[pd.Series(order).argsort(kind='stable')].reset_index(drop=True)
+
+    return frame[OUTPUT_COLUMNS].fillna(0)
+
+def ingest(ratings_dir=RATINGS_DIR, output_path=OUTPUT_PATH, manifest_path=MANIFEST_PATH,
+           wins_path=WINS_PATH, max_workers=None, force=False):
+    """
+    Parse new and changed workbooks and write the processed frame.
+
+    Args:
+        ratings_dir (str): Folder of downloaded Madden workbooks
+        output_path (str): Where to write madden_data_processed.xlsx
+        manifest_path (str): Manifest of parsed workbooks
+        wins_path (str): ESPN wins CSV
+        max_workers (int, optional): Number of worker processes. Defaults to the CPU count.
+        force (bool): If True, parse every workbook again
+
+    Returns:
+        DataFrame: The processed frame that was written
+    """
+    manifest = {} if force else load_manifest(manifest_path)
+    filenames = sorted(f for f in os.listdir(ratings_dir) if f.endswith(('.xlsx', '.xls')))
+
+    # Forget files that are gone
+    for filename in set(manifest) - set(filenames):
+        del manifest[filename]
+
+    pending = {}
+    for filename in filenames:
+        file_hash = get_file_hash(os.path.join(ratings_dir, filename))
+        entry = manifest.get(filename)
+        if entry is not None and entry['hash'] == file_hash:
+            continue
+
+        team = get_file_team(filename)
+        if team is None:
+            # Not an NFL team, so there is nothing to read
+            manifest[filename] = {'hash': file_hash, 'team_name': None, 'year': None, 'ratings': None}
+        else:
+            pending[filename] = (file_hash, team)
+
+    print(f"{len(filenames)} workbooks, {len(pending)} to parse")
+    if pending:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(parse_workbook, os.path.join(ratings_dir, filename)): filename
+                for filename in pending
+            }
+            for future in as_completed(futures):
+                filename = futures[future]
+                file_hash, (team_name, year) = pending[filename]
+                try:
+                    ratings = future.result()
+                except Exception as e:
+                    print(f"Error processing {filename}: {e}")
+                    continue  # Left out of the manifest so the next run tries again
+                manifest[filename] = {'hash': file_hash, 'team_name': team_name, 'year': year, 'ratings': ratings}
+                save_manifest(manifest, manifest_path)
+    save_manifest(manifest, manifest_path)
+
+    previous_order = None
+    if os.path.exists(output_path):
+        previous = pd.read_excel(output_path, usecols=['team_name', 'year'])
+        previous_order = list(zip(previous['team_name'], previous['year']))
+
+    frame = build_frame(manifest, load_wins(wins_path, output_path), previous_order)
+    frame.to_excel(output_path, index=False)
+    print(f"Wrote {len(frame)} teams to {output_path}")
+    return frame
+
+def main():
+    parser = argparse.ArgumentParser(description="Build madden_data_processed.xlsx from the Madden ratings workbooks")
+    parser.add_argument('--ratings', type=str, default=RATINGS_DIR, help="folder of downloaded Madden workbooks")
+    parser.add_argument('--output', type=str, default=OUTPUT_PATH, help="processed file to write")
+    parser.add_argument('--manifest', type=str, default=MANIFEST_PATH, help="manifest of already parsed workbooks")
+    parser.add_argument('--wins', type=str, default=WINS_PATH, help="ESPN wins CSV; without it the wins in --output are kept")
+    parser.add_argument('--workers', type=int, default=None, help="number of worker processes (default: CPU count)")
+    parser.add_argument('--force', action='store_true', help="parse every workbook again")
+    args = parser.parse_args()
+
+    ingest(args.ratings, args.output, args.manifest, args.wins, args.workers, args.force)
+
+if __name__ == "__main__":
+    main()
@@ -2,16 +2,45 @@
 """
 Working script to download Madden NFL team ratings from maddenratings.weebly.com
 This version correctly handles the direct Excel file links
+
+Workbooks are downloaded over a few connections at once at a limited rate.
+Each one is streamed to a temporary file, checked to be a complete xlsx
+workbook and only then renamed into place, so a cut-off download never
+replaces a good file. The size and hash of every saved workbook are kept in a
+manifest, and workbooks that still match it are not downloaded again.
+
+Point --base-url at a local server (e.g. python -m http.server in a folder
+holding madden-nfl-15.html and the workbooks it links to) to try it out
+without touching the site.
 """
 
 import requests
 from bs4 import BeautifulSoup
 import os
 import time
+import sys
 import re
+import asyncio
+import hashlib
+import zipfile
+import argparse
+from urllib.parse import urljoin
+
+# Shared HTTP cache and rate limiter live in the scripts folder
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import http_cache
+from pfr_scraper import RETRY_STATUSES, TokenBucket
+from manifest import get_file_hash, load_manifest, save_manifest
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(os.path.dirname(SCRIPT_DIR))
 
-# Create a directory to store the downloaded files
-os.makedirs("madden_ratings", exist_ok=True)
+BASE_URL = "https://maddenratings.weebly.com"
+OUTPUT_DIR = os.path.join(SCRIPT_DIR, "madden_ratings")
+MANIFEST_PATH = os.path.join(PROJECT_ROOT, "data", "store", "madden_downloads.json")
+
+# Parts every xlsx workbook has
+WORKBOOK_PARTS = ['[Content_Types].xml', 'xl/workbook.xml']
 
 # User-Agent to mimic a real browser
 headers = {
@@ -50,90 +79,300 @@ def extract_team_name_from_url(url):
     
     return team_name
 
-def download_ratings(year):
-    """Download Madden NFL ratings for a specific year"""
-    url = f"https://maddenratings.weebly.com/madden-nfl-{year}.html"
-    print(f"\nDownloading Madden NFL {year}...")
-    
+def get_year_links(year, base_url=BASE_URL):
+    """
+    Find the workbooks linked from a Madden year's page.
+
+    Args:
+        year (int): Two digit Madden year, e.g. 15
+        base_url (str): Site the year pages are on
+
+    Returns:
+        list: (file name, absolute URL) of each workbook, without duplicates
+    """
+    url = f"{base_url}/madden-nfl-{year}.html"
+    response = http_cache.get(url, headers=headers, timeout=30)
+    response.raise_for_status()
+
+    soup = BeautifulSoup(response.text, 'html.parser')
+
+    links = {}
+    for link in soup.find_all('a', href=True):
+        href = link['href']
+
+        # Check if this is an Excel file
+        if any(ext in href.lower() for ext in ['.xlsx', '.xls']):
+            team_name = extract_team_name_from_url(href)
+            filename = f"madden_{year}_{team_name}.xlsx"
+            # A workbook linked twice is downloaded once
+            links.setdefault(filename, urljoin(url, href))
+    return list(links.items())
+
+def check_workbook(path):
+    """
+    Make sure a file is a complete xlsx workbook.
+
+    Args:
+        path (str): File to check
+
+    Raises:
+        ValueError: If the file is not a zip archive, a member fails its CRC
+                    check or the workbook parts are missing
+    """
+    if not zipfile.is_zipfile(path):
+        raise ValueError("not a zip archive (download cut short?)")
     try:
-        response = requests.get(url, headers=headers, timeout=30)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        download_count = 0
-        
-        # Find all links
-        links = soup.find_all('a', href=True)
-        
-        for link in links:
-            href = link['href']
-            
-            # Check if this is an Excel file
-            if any(ext in href.lower() for ext in ['.xlsx', '.xls']):
-                # Get team/file name from URL
-                team_name = extract_team_name_from_url(href)
-                
-                # Create filename
-                filename = f"madden_ratings/madden_{year}_{team_name}.xlsx"
-                
-                # Construct absolute URL
-                if not href.startswith('http'):
-                    if href.startswith('/'):
-                        absolute_url = f"https://maddenratings.weebly.com{href}"
-                    else:
-                        absolute_url = f"https://maddenratings.weebly.com/{href}"
-                else:
-                    absolute_url = href
-                
-                # Download the file
-                try:
-                    print(f"  Downloading: {team_name}")
-                    
-                    file_response = requests.get(absolute_url, headers=headers, timeout=30)
-                    file_response.raise_for_status()
-                    
-                    with open(filename, 'wb') as f:
-                        f.write(file_response.content)
-                    
-                    print(f"  ✓ Saved: {filename}")
-                    download_count += 1
-                    time.sleep(0.5)  # Be nice to the server
-                    
-                except Exception as e:
-                    print(f"  ✗ Failed: {str(e)}")
-        
-        if download_count == 0:
-            print(f"  ⚠️ No files downloaded for Madden NFL {year}")
+        with zipfile.ZipFile(path) as workbook:
+            bad_member = workbook.testzip()
+            names = set(workbook.namelist())
+    except (zipfile.BadZipFile, OSError, EOFError) as e:
+        raise ValueError(f"broken zip archive: {e}")
+    if bad_member is not None:
+        raise ValueError(f"corrupt member {bad_member}")
+    missing = [part for part in WORKBOOK_PARTS if part not in names]
+    if missing:
+        raise ValueError(f"not an xlsx workbook, missing {', '.join(missing)}")
+
+def is_up_to_date(entry, path):
+    """True if the file exists with the size and hash recorded in its manifest entry."""
+    if entry is None or not os.path.exists(path):
+        return False
+    return os.path.getsize(path) == entry['size'] and get_file_hash(path) == entry['sha256']
+
+def stream_to_file(session, url, path, timeout=30):
+    """
+    Download a workbook into place without ever leaving a partial file at path.
+
+    The body is streamed into path + ".part", checked against Content-Length
+    and with check_workbook, then renamed over path.
+
+    Args:
+        session (Session): Session whose connection is reused
+        url (str): Workbook URL
+        path (str): Where to save the workbook
+        timeout (float): Seconds to wait for the server
+
+    Returns:
+        Response or dict: The response if its status was not 200, else
+                          the saved file's size and sha256
+
+    Raises:
+        RequestException: If the connection fails
+        ValueError: If the download is incomplete or not a workbook
+    """
+    temp_path = f"{path}.part"
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with session.get(url, headers=headers, timeout=timeout, stream=True) as response:
+            if response.status_code != 200:
+                return response
+            with open(temp_path, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=1 << 16):
+                    f.write(chunk)
+                    digest.update(chunk)
+                    size += len(chunk)
+            expected = response.headers.get('Content-Length')
+            # Content-Length counts encoded bytes, so it only applies to unencoded bodies
+            if expected is not None and 'Content-Encoding' not in response.headers and int(expected) != size:
+                raise ValueError(f"got {size} of {expected} bytes")
+        check_workbook(temp_path)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return {'size': size, 'sha256': digest.hexdigest()}
+
+async def download_file(session, bucket, url, path, retries=3, backoff=5.0, timeout=30):
+    """
+    Download a workbook through the rate limiter, retrying busy responses and bad downloads.
+
+    Args:
+        session (Session): Session whose connection is reused
+        bucket (TokenBucket): Rate limiter shared by every connection
+        url (str): Workbook URL
+        path (str): Where to save the workbook
+        retries (int): Times to retry a 429, a 5xx, a connection error or an invalid workbook
+        backoff (float): Seconds to wait before the first retry, doubled after each one
+        timeout (float): Seconds to wait for the server
+
+    Returns:
+        dict: Size and sha256 of the saved file
+
+    Raises:
+        Exception: If every attempt failed
+    """
+    delay = backoff
+    for attempt in range(retries + 1):
+        await bucket.acquire()
+        try:
+            result = await asyncio.to_thread(stream_to_file, session, url, path, timeout)
+        except (requests.exceptions.RequestException, ValueError) as e:
+            error = e
         else:
-            print(f"  ✅ Downloaded {download_count} files for Madden NFL {year}")
-        
+            if isinstance(result, dict):
+                return result
+            if result.status_code not in RETRY_STATUSES:
+                raise Exception(f"HTTP {result.status_code}")
+            error = f"HTTP {result.status_code}"
+        if attempt < retries:
+            await asyncio.sleep(delay)
+            delay *= 2
+    raise Exception(str(error))
+
+def _new_session(connections):
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=connections)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+async def _download_worker(queue, session, bucket, manifest, manifest_path, output_dir, stats, retries, backoff):
+    while True:
+        try:
+            filename, url = queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return
+        try:
+            result = await download_file(session, bucket, url, os.path.join(output_dir, filename), retries, backoff)
+        except Exception as e:
+            print(f"  ✗ Failed: {filename}: {e}")
+            stats['failed'] += 1
+            continue
+        manifest[filename] = {'url': url, **result}
+        save_manifest(manifest, manifest_path)
+        stats['downloaded'] += 1
+        stats['bytes'] += result['size']
+        print(f"  ✓ Saved: {filename}")
+
+async def download_ratings(year, session, bucket, manifest, manifest_path=MANIFEST_PATH, output_dir=OUTPUT_DIR,
+                           base_url=BASE_URL, connections=4, retries=3, backoff=5.0, force=False):
+    """
+    Download the Madden NFL ratings workbooks of one year that are missing or changed.
+
+    Args:
+        year (int): Two digit Madden year, e.g. 15
+        session (Session): Session the downloads share
+        bucket (TokenBucket): Rate limiter shared by every connection
+        manifest (dict): Size, hash and URL of every saved workbook, updated in place
+        manifest_path (str): Where the manifest is saved after each download
+        output_dir (str): Folder the workbooks are saved in
+        base_url (str): Site the year pages are on
+        connections (int): Number of downloads at once
+        retries (int): Times to retry a failed download
+        backoff (float): Seconds to wait before the first retry
+        force (bool): If True, download workbooks that match the manifest too
+
+    Returns:
+        dict: Counts of downloaded, skipped and failed files, bytes downloaded and seconds taken
+    """
+    print(f"\nDownloading Madden NFL {year}...")
+    start = time.perf_counter()
+    stats = {'downloaded': 0, 'skipped': 0, 'failed': 0, 'bytes': 0}
+
+    try:
+        links = get_year_links(year, base_url)
     except Exception as e:
         print(f"  ❌ Error accessing Madden NFL {year}: {str(e)}")
+        stats['seconds'] = time.perf_counter() - start
+        return stats
+
+    queue = asyncio.Queue()
+    for filename, url in links:
+        if not force and is_up_to_date(manifest.get(filename), os.path.join(output_dir, filename)):
+            stats['skipped'] += 1
+        else:
+            queue.put_nowait((filename, url))
+
+    if http_cache.get_cache().offline and not queue.empty():
+        # Offline runs only use the workbooks already saved
+        print(f"  ⚠️ Offline, not downloading {queue.qsize()} workbooks")
+        stats['failed'] += queue.qsize()
+        queue = asyncio.Queue()
+
+    await asyncio.gather(*[
+        _download_worker(queue, session, bucket, manifest, manifest_path, output_dir, stats, retries, backoff)
+        for _ in range(min(connections, queue.qsize()))
+    ])
+    stats['seconds'] = time.perf_counter() - start
+
+    if not links:
+        print(f"  ⚠️ No files found for Madden NFL {year}")
+    else:
+        megabytes = stats['bytes'] / 1e6
+        print(f"  ✅ Madden NFL {year}: {stats['downloaded']} downloaded ({megabytes:.1f} MB in "
+              f"{stats['seconds']:.1f}s, {megabytes / stats['seconds']:.2f} MB/s), "
+              f"{stats['skipped']} up to date, {stats['failed']} failed")
+    return stats
+
+async def download_all(years, output_dir=OUTPUT_DIR, manifest_path=MANIFEST_PATH, base_url=BASE_URL,
+                       connections=4, requests_per_second=2.0, retries=3, backoff=5.0, force=False):
+    """
+    Download the workbooks of several Madden years, one year after another.
+
+    Args:
+        years (iterable): Two digit Madden years
+        output_dir (str): Folder the workbooks are saved in
+        manifest_path (str): Manifest of saved workbooks
+        base_url (str): Site the year pages are on
+        connections (int): Number of downloads at once
+        requests_per_second (float): Average download rate across all connections
+        retries (int): Times to retry a failed download
+        backoff (float): Seconds to wait before the first retry
+        force (bool): If True, download every workbook again
+
+    Returns:
+        dict: Stats from download_ratings for each year
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = load_manifest(manifest_path)
+    bucket = TokenBucket(requests_per_second, capacity=connections)
+    session = _new_session(connections)
+    try:
+        return {
+            year: await download_ratings(year, session, bucket, manifest, manifest_path, output_dir,
+                                         base_url, connections, retries, backoff, force)
+            for year in years
+        }
+    finally:
+        session.close()
 
 def main():
+    parser = argparse.ArgumentParser(description="Download Madden NFL team ratings workbooks")
+    parser.add_argument('--years', type=int, nargs=2, metavar=('FIRST', 'LAST'), default=[years[0], years[-1]],
+                        help="first and last two digit Madden year (default 15 24)")
+    parser.add_argument('--output', type=str, default=OUTPUT_DIR, help="folder to save the workbooks in")
+    parser.add_argument('--manifest', type=str, default=MANIFEST_PATH, help="size and hash of saved workbooks")
+    parser.add_argument('--base-url', type=str, default=BASE_URL, help="site to download from, e.g. a local test server")
+    parser.add_argument('--connections', type=int, default=4, help="number of downloads at once")
+    parser.add_argument('--rate', type=float, default=2.0, help="downloads started per second, on average")
+    parser.add_argument('--retries', type=int, default=3, help="times to retry a failed or invalid download")
+    parser.add_argument('--force', action='store_true', help="download workbooks that match the manifest too")
+    args = parser.parse_args()
+
     print("Madden NFL Ratings Downloader")
     print("============================")
-    
-    for year in years:
-        download_ratings(year)
-        time.sleep(2)  # Pause between years
-    
+
+    start = time.perf_counter()
+    stats = asyncio.run(download_all(range(args.years[0], args.years[1] + 1), args.output, args.manifest,
+                                     args.base_url, args.connections, args.rate, args.retries, force=args.force))
+    seconds = time.perf_counter() - start
+
     print("\n" + "="*50)
     print("Download complete!")
     print("="*50)
-    
+
     print("\nDownloaded files:")
-    
+
     # Get all files
     files = []
-    for file in os.listdir("madden_ratings"):
+    for file in os.listdir(args.output):
         if file.endswith(('.xlsx', '.xls')):
             files.append(file)
-    
+
     # Sort files by year and team
     files.sort()
-    
+
     # Group by year for display
     files_by_year = {}
     for file in files:
@@ -143,14 +382,16 @@ def main():
             if year not in files_by_year:
                 files_by_year[year] = []
             files_by_year[year].append(file)
-    
+
     for year in sorted(files_by_year.keys()):
         print(f"\nMadden NFL {year} ({len(files_by_year[year])} files):")
         for file in files_by_year[year]:
             print(f"  - {file}")
-    
+
     # Summary
-    print(f"\nTotal files downloaded: {len(files)}")
+    downloaded = sum(year_stats['downloaded'] for year_stats in stats.values())
+    megabytes = sum(year_stats['bytes'] for year_stats in stats.values()) / 1e6
+    print(f"\nTotal files: {len(files)} ({downloaded} downloaded this run, {megabytes:.1f} MB in {seconds:.1f}s)")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,33 @@
+"""
+Manifests shared by the Madden scripts: a JSON file mapping each workbook
+to what is known about it (its hash, and for madden_script its size and URL,
+for madden_ingest its parsed ratings), so reruns skip unchanged workbooks.
+"""
+
+import os
+import sys
+import json
+import hashlib
+
+# atomic_io lives one directory up, in scripts/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from atomic_io import atomic_write
+
+def get_file_hash(file_path):
+    """sha256 of a file, read in 1 MB blocks."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def load_manifest(manifest_path):
+    """Read a manifest, or return an empty one if it does not exist yet."""
+    if not os.path.exists(manifest_path):
+        return {}
+    with open(manifest_path) as f:
+        return json.load(f)
+
+def save_manifest(manifest, manifest_path):
+    with atomic_write(manifest_path) as f:
+        json.dump(manifest, f)
@@ -0,0 +1,240 @@
+import os
+import json
+import time
+import asyncio
+import requests
+import pandas as pd
+from tqdm import tqdm
+import http_cache
+
+BASE_URL = "https://www.pro-football-reference.com"
+HEADERS = {"User-Agent": "Mozilla/5.0"}
+
+# Statuses worth asking for again later; any other failure means the page has no data
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+class TokenBucket:
+    """
+    Async rate limiter. Tokens refill at a fixed rate up to a burst capacity and
+    every request takes one, so requests never exceed the rate on average no
+    matter how many connections are open.
+    """
+    def __init__(self, rate, capacity=1):
+        """
+        Args:
+            rate (float): Tokens added per second
+            capacity (int): Most tokens that can be saved up for a burst
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait until a token is available and take it."""
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+class Checkpoint:
+    """
+    Append-only JSON lines file holding the scraped rows of every finished
+    player, one line per player. Each line is flushed to disk as soon as the
+    player is done, so an interrupted run resumes with the players it has not
+    finished yet. Players whose page could not be parsed get a line with the
+    error instead; they are not done, so the next run tries them again.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.players = {}
+        self.failures = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # Last line cut short by a crash; that player is scraped again
+                    if 'error' in record:
+                        self.failures[record['link']] = record
+                    else:
+                        self.failures.pop(record['link'], None)
+                        self.players[record['link']] = record
+
+    def is_done(self, link):
+        return link in self.players
+
+    def append(self, link, name, player_data):
+        """
+        Save a finished player. Players without data are saved too, so they are not fetched again.
+
+        Args:
+            link (str): Player page link, e.g. /players/A/AbanIs00.htm
+            name (str): Player name
+            player_data (DataFrame): Rows scraped from the player's page, possibly empty
+        """
+        record = {'link': link, 'name': name, **json.loads(player_data.to_json(orient='split', index=False))}
+        self._write(record)
+        self.failures.pop(link, None)
+        self.players[link] = record
+
+    def append_failure(self, link, name, error):
+        """
+        Save a player whose page could not be parsed. The player is not done and is scraped again next run.
+
+        Args:
+            link (str): Player page link, e.g. /players/A/AbanIs00.htm
+            name (str): Player name
+            error (Exception): What went wrong
+        """
+        record = {'link': link, 'name': name, 'error': f"{type(error).__name__}: {error}"}
+        self._write(record)
+        self.failures[link] = record
+
+    def _write(self, record):
+        with open(self.path, 'a') as f:
+            f.write(json.dumps(record) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def to_frame(self, links=None, columns=None):
+        """
+        Combine the saved rows into one DataFrame.
+
+        Args:
+            links (list, optional): Players to include, in order. If None, includes every saved player.
+            columns (list, optional): Columns to put first, as in the empty frame --type pull starts from
+
+        Returns:
+            DataFrame: Rows of every included player
+        """
+        if links is None:
+            links = list(self.players)
+        frames = [pd.DataFrame(columns=columns or [])]
+        for link in links:
+            record = self.players.get(link)
+            if record is not None and record['data']:
+                frames.append(pd.DataFrame(record['data'], columns=record['columns']))
+        return pd.concat(frames, ignore_index=True)
+
+def _new_session():
+    # One keep-alive connection per session; each worker reuses its own
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=1)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update(HEADERS)
+    return session
+
+async def fetch_page(session, bucket, url, retries=3, backoff=30.0, timeout=30):
+    """
+    Fetch a page through the HTTP cache and the rate limiter, retrying when the site is busy.
+
+    Args:
+        session (Session): Session whose connection is reused
+        bucket (TokenBucket): Rate limiter shared by every connection
+        url (str): Page to fetch
+        retries (int): Times to retry a 429, a 5xx or a connection error
+        backoff (float): Seconds to wait before the first retry, doubled after each one.
+                         A Retry-After header takes precedence.
+        timeout (float): Seconds to wait for a response
+
+    Returns:
+        str: Page HTML, or None if the page does not exist
+
+    Raises:
+        Exception: If every attempt failed
+    """
+    # Cached pages cost no request
+    cache = http_cache.get_cache()
+    response = cache.lookup(url)
+    if response is not None:
+        return response.text
+
+    delay = backoff
+    for attempt in range(retries + 1):
+        await bucket.acquire()
+        try:
+            response = await asyncio.to_thread(cache.get, url, session=session, timeout=timeout)
+        except http_cache.CacheMissError:
+            raise
+        except requests.exceptions.RequestException as e:
+            error = e
+            wait = delay
+        else:
+            if response.status_code == 200:
+                return response.text
+            if response.status_code not in RETRY_STATUSES:
+                return None
+            error = response.status_code
+            retry_after = response.headers.get("Retry-After", "")
+            wait = float(retry_after) if retry_after.isdigit() else delay
+        if attempt < retries:
+            await asyncio.sleep(wait)
+            delay *= 2
+    raise Exception(f"Failed to retrieve {url}: {error}")
+
+async def _scrape_worker(queue, session, bucket, checkpoint, parse, base_url, progress, retries, backoff):
+    while True:
+        try:
+            link, name = queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return
+        try:
+            html = await fetch_page(session, bucket, f"{base_url}{link}", retries, backoff)
+        except Exception as e:
+            print(e)  # Left out of the checkpoint so the next run tries again
+        else:
+            try:
+                player_data = parse(html, name) if html is not None else pd.DataFrame()
+            except Exception as e:
+                # One unreadable page must not stop the other workers
+                print(f"Failed to parse {link} ({name}): {e}")
+                checkpoint.append_failure(link, name, e)
+            else:
+                checkpoint.append(link, name, player_data)
+        progress.update(1)
+
+async def scrape_players(players, checkpoint, parse, base_url=BASE_URL, requests_per_minute=5.0,
+                         connections=4, retries=3, backoff=30.0):
+    """
+    Scrape every player page not yet in the checkpoint.
+
+    Args:
+        players (DataFrame): Players from players.csv, with the name in the first column and a link column
+        checkpoint (Checkpoint): Where finished players are saved
+        parse (function): Turns (page html, player name) into a DataFrame of the player's seasons
+        base_url (str): Site the player links are relative to
+        requests_per_minute (float): Average request rate across all connections
+        connections (int): Number of keep-alive connections fetching at once
+        retries (int): Times to retry a busy or failed request
+        backoff (float): Seconds to wait before the first retry
+
+    Returns:
+        int: Number of players fetched in this run
+    """
+    queue = asyncio.Queue()
+    for link, name in zip(players['link'], players.iloc[:, 0]):
+        if not checkpoint.is_done(link):
+            queue.put_nowait((link, name))
+    remaining = queue.qsize()
+
+    bucket = TokenBucket(requests_per_minute / 60)
+    sessions = [_new_session() for _ in range(min(connections, remaining))]
+    try:
+        with tqdm(total=remaining) as progress:
+            await asyncio.gather(*[
+                _scrape_worker(queue, session, bucket, checkpoint, parse, base_url, progress, retries, backoff)
+                for session in sessions
+            ])
+    finally:
+        for session in sessions:
+            session.close()
+    return remaining
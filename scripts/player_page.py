@@ -0,0 +1,108 @@
+import re
+import numpy as np
+import pandas as pd
+from lxml import etree
+
+# Bytes of HTML fed to the parser at a time; parsing stops once the table is found
+CHUNK_SIZE = 16 * 1024
+
+WHITESPACE = re.compile(r'[\r\n\t\xa0]+')
+
+def find_table(html, table_id):
+    """
+    Parse a page only as far as the end of the table with the given id.
+
+    Tables inside HTML comments are not found, just as with BeautifulSoup.
+
+    Args:
+        html (str): Page HTML
+        table_id (str): id attribute of the table
+
+    Returns:
+        Element: The table, or None if the page has no such table
+    """
+    parser = etree.HTMLPullParser(events=('end',), tag='table')
+    for start in range(0, len(html), CHUNK_SIZE):
+        parser.feed(html[start:start + CHUNK_SIZE])
+        for _, table in parser.read_events():
+            if table.get('id') == table_id:
+                return table
+    parser.close()
+    return None
+
+def _cell_text(cell):
+    return WHITESPACE.sub(' ', cell.xpath('string()')).strip()
+
+def _expand(row):
+    # One entry per column, repeating the text of cells that span several columns
+    cells = []
+    for cell in row.iterchildren('th', 'td'):
+        span = int(cell.get('colspan') or 1)
+        cells.extend([_cell_text(cell)] * span)
+    return cells
+
+def get_table_columns(table):
+    """
+    Column names of a table, joining the header rows the way rb_data.combine_levels
+    joins the levels read by pd.read_html: "Rushing" over "Att" becomes "Rushing_Att",
+    and a blank group header leaves just "G".
+
+    Args:
+        table (Element): Table from find_table
+
+    Returns:
+        list: Column names
+    """
+    header_rows = [_expand(row) for row in table.iterfind('thead/tr')]
+    if not header_rows:
+        return []
+    width = max(len(row) for row in header_rows)
+    header_rows = [row + [''] * (width - len(row)) for row in header_rows]
+    return ['_'.join(level for level in levels if level) for levels in zip(*header_rows)]
+
+def _to_column(values):
+    # Numbers (with thousands separators) become numbers; blank cells become NaN
+    numbers = [value.replace(',', '') for value in values]
+    try:
+        if all(number.lstrip('-').isdigit() for number in numbers):
+            return np.array([int(number) for number in numbers], dtype=np.int64)
+        return np.array([float(number) if number else np.nan for number in numbers], dtype=float)
+    except ValueError:
+        return np.array([value if value else np.nan for value in values], dtype=object)
+
+def parse_player_table(html, name, table_id="rushing_and_receiving", league="NFL"):
+    """
+    Read a player's season table straight from the page into a DataFrame.
+
+    Gives the same rows and columns as parsing the page with BeautifulSoup and
+    pd.read_html, in a single pass over only the part of the page up to the
+    table: body and footer rows are kept if their Lg column mentions the
+    league, and numeric columns are typed.
+
+    Args:
+        html (str): Player page HTML
+        name (str): Player name, added as the Name column
+        table_id (str): id attribute of the table to read
+        league (str): League the rows must belong to
+
+    Returns:
+        DataFrame: One row per season, or an empty DataFrame if the page has no table
+    """
+    table = find_table(html, table_id)
+    if table is None:
+        return pd.DataFrame()
+
+    columns = get_table_columns(table)
+    if 'Lg' not in columns:
+        return pd.DataFrame()
+    league_column = columns.index('Lg')
+
+    # Career rows in the footer are kept like pd.read_html keeps them
+    rows = [_expand(row) for row in table.iterfind('tbody/tr')] + [_expand(row) for row in table.iterfind('tfoot/tr')]
+    rows = [row + [''] * (len(columns) - len(row)) for row in rows]
+    rows = [row[:len(columns)] for row in rows if league.lower() in row[league_column].lower()]
+
+    player_data = pd.DataFrame({i: _to_column([row[i] for row in rows]) for i in range(len(columns))})
+    player_data.columns = columns
+    player_data['Name'] = name
+    return player_data
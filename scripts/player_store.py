@@ -0,0 +1,111 @@
+import os
+import numpy as np
+import pandas as pd
+
+# Binary copy of player_data.csv, next to the other generated data stores
+DEFAULT_STORE_DIR = "./data/store/player_stats"
+
+STRING_COLUMNS = ["Team", "Lg", "Pos", "Awards"]
+
+class PlayerStore:
+    """
+    Season-by-season player stats kept as a memory-mapped NumPy structured array.
+
+    Rows are sorted by (Name, Season) and every player owns one contiguous range
+    of rows, so reading the free agents' careers touches only their slices of
+    the mapped file rather than the whole CSV. Names are stored with periods
+    removed, the same way rb_data matches free agents to their stats.
+    """
+    def __init__(self, store_dir=DEFAULT_STORE_DIR):
+        self.store_dir = store_dir
+        self.stats = np.load(os.path.join(store_dir, "stats.npy"), mmap_mode='r')
+        self.names = np.load(os.path.join(store_dir, "names.npy"))
+        self.offsets = np.load(os.path.join(store_dir, "offsets.npy"))
+        self.name_index = {name: i for i, name in enumerate(self.names.tolist())}
+
+    @classmethod
+    def build(cls, csv_path, store_dir=DEFAULT_STORE_DIR):
+        """
+        Build the store from a player_data.csv file.
+
+        Career total rows (whose season reads e.g. "NFL (3 Yrs)") are skipped.
+
+        Args:
+            csv_path (str): Path to the player data CSV written by --type pull
+            store_dir (str): Directory to write the store to
+
+        Returns:
+            PlayerStore: The newly built store
+        """
+        player_data = pd.read_csv(csv_path)
+        player_data['Name'] = player_data['Name'].str.replace('.', '')
+
+        seasons = pd.to_numeric(player_data['Season'], errors='coerce')
+        player_data = player_data[seasons.notna()].copy()
+        player_data['Season'] = seasons[seasons.notna()].astype('int16')
+        player_data = player_data.sort_values(['Name', 'Season'], kind='stable').reset_index(drop=True)
+
+        fields = []
+        for col in player_data.columns:
+            if col == 'Name':
+                continue
+            if col == 'Season':
+                fields.append((col, 'i2'))
+            elif col in STRING_COLUMNS:
+                width = max(int(player_data[col].fillna('').str.len().max()), 1)
+                fields.append((col, f'U{width}'))
+            else:
+                fields.append((col, 'f8'))
+
+        stats = np.zeros(len(player_data), dtype=fields)
+        for col, _ in fields:
+            if col in STRING_COLUMNS:
+                stats[col] = player_data[col].fillna('').to_numpy(dtype=str)
+            else:
+                stats[col] = pd.to_numeric(player_data[col], errors='coerce').to_numpy()
+
+        # Row range of each player: offsets[i] to offsets[i + 1]
+        names, starts = np.unique(player_data['Name'].to_numpy(dtype=str), return_index=True)
+        offsets = np.append(starts, len(player_data)).astype(np.int64)
+
+        os.makedirs(store_dir, exist_ok=True)
+        np.save(os.path.join(store_dir, "stats.npy"), stats)
+        np.save(os.path.join(store_dir, "names.npy"), names)
+        np.save(os.path.join(store_dir, "offsets.npy"), offsets)
+
+        return cls(store_dir)
+
+    def get_row_range(self, name):
+        """Return the (start, stop) rows of a player, or (0, 0) if the player is not in the store."""
+        i = self.name_index.get(name)
+        if i is None:
+            return 0, 0
+        return int(self.offsets[i]), int(self.offsets[i + 1])
+
+    def get_career(self, name):
+        """Return every season of a player as a read-only view into the store."""
+        start, stop = self.get_row_range(name)
+        return self.stats[start:stop]
+
+    def to_frame(self, names=None):
+        """
+        Convert the stats of some or all players to a DataFrame laid out like player_data.csv.
+
+        Args:
+            names (list, optional): Players to include. If None, includes everyone.
+
+        Returns:
+            DataFrame: One row per player season
+        """
+        if names is None:
+            names = self.names.tolist()
+        names = [name for name in dict.fromkeys(names) if name in self.name_index]
+        ranges = [self.get_row_range(name) for name in names]
+
+        rows = np.concatenate([np.arange(start, stop) for start, stop in ranges]) if ranges else np.array([], dtype=np.int64)
+        frame = pd.DataFrame(self.stats[rows])
+        for col in STRING_COLUMNS:
+            if col in frame.columns:
+                frame[col] = frame[col].replace('', np.nan)
+        frame.insert(0, 'Name', np.repeat(names, [stop - start for start, stop in ranges]).astype(object))
+        return frame
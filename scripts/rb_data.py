@@ -1,13 +1,18 @@
 import re
 import time
 import string
+import asyncio
 import argparse
-import requests
+import numpy as np
 import pandas as pd
 from tqdm import tqdm
 from io import StringIO
 from functools import reduce
 from bs4 import BeautifulSoup
+import http_cache
+from player_store import PlayerStore, DEFAULT_STORE_DIR
+from pfr_scraper import Checkpoint, scrape_players
+from player_page import parse_player_table
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
 from sklearn.linear_model import LinearRegression
@@ -16,8 +21,14 @@ from sklearn.metrics import mean_squared_error
 
 HEADERS={"User-Agent": "Mozilla/5.0"}
 
+# Columns player_data.csv starts with; any other columns of the scraped tables follow
+PULL_COLUMNS = ["Name", "Season", "Age", "Team", "Lg", "Pos", "G", "GS", "Rushing_Att", 
+                "Rushing_Yds", "Rushing_TD", "Receiving_Lng", "Receiving_R/G", 
+                "Receiving_Y/G", "Scrimmage_Touch", "Scrimmage_Y/Tch", 
+                "Scrimmage_YScm", "Scrimmage_RRTD", "Fmb", "AV", "Awards"]
+
 def get_players(url):
-    response = requests.get(url, headers=HEADERS)
+    response = http_cache.get(url, headers=HEADERS)
     # Check if request was successful
     if response.status_code == 200:
         soup = BeautifulSoup(response.text, "html.parser")
@@ -77,11 +88,18 @@ def combine_levels(col_tuple):
 
 def get_player_data(url, name):
         # Fetch the page
-    response = requests.get(url, headers=HEADERS)
+    response = http_cache.get(url, headers=HEADERS)
     if response.status_code != 200:
         return pd.DataFrame()
+    return parse_player_data(response.text, name)
+
+def parse_player_data(html, name):
+    # Stops parsing at the end of the table instead of reading the page three times
+    return parse_player_table(html, name, "rushing_and_receiving")
+
+def parse_player_data_soup(html, name):
     # Parse the HTML
-    soup = BeautifulSoup(response.text, "html.parser")
+    soup = BeautifulSoup(html, "html.parser")
 
     # Find the table with id "rushing_and_receiving"
     table = soup.find("table", id="rushing_and_receiving")
@@ -108,7 +126,7 @@ def safe_divide(a, b):
         return 0
     
 def get_free_agent_data(url, year):
-    response = requests.get(url)
+    response = http_cache.get(url)
     soup = BeautifulSoup(response.text, 'html.parser')
     # Find all player names
     players= []
@@ -171,19 +189,25 @@ def get_free_agent_data(url, year):
             players.append(player)
     return players
 
+# Columns not used as features
+DROPPED_COLUMNS = ['Team', 'Lg', 'Pos','Scrimmage_Touch', 'Scrimmage_Y/Tch', 'Scrimmage_YScm', 'Scrimmage_RRTD']
+
+# How each stat is combined over the seasons before free agency
+CAREER_AGGREGATIONS = {'G': 'sum', 'GS': 'sum', 'Rushing_Att': 'sum', "Rushing_Yds": 'sum', "Rushing_TD": 'sum', "Receiving_R/G": "mean", "Receiving_Y/G": "mean",
+                       "Fmb": "sum", "AV": "sum", "Awards": "sum", "Rushing_1D": "sum", "Rushing_Succ%": "mean", "Rushing_Y/A": "mean", "Rushing_A/G": "mean",
+                       "Receiving_Tgt": "sum", "Receiving_Rec": "sum", "Receiving_Yds": "sum", "Receiving_Y/R": "mean", "Receiving_TD": "sum", "Receiving_1D": "sum",
+                       "Receiving_Succ%": "mean", "Receiving_Ctch%": "mean", "Receiving_Y/Tgt": "mean"}
+
 def get_filtered_data(player_data, free_agents, year):
     player_data = player_data[player_data['Name'].isin([agent["Name"] for agent in free_agents])]
     player_data['Awards'] = player_data['Awards'].apply(lambda x: len(x) if isinstance(x, list) else 0)
-    player_data = player_data.drop(columns=['Team', 'Lg', 'Pos','Scrimmage_Touch', 'Scrimmage_Y/Tch', 'Scrimmage_YScm', 'Scrimmage_RRTD'])
+    player_data = player_data.drop(columns=DROPPED_COLUMNS)
     player_data = player_data.drop_duplicates(subset=['Name', 'Season'], keep='first')
     last_season_stats = player_data.copy(deep=True)
 
     player_data = player_data[player_data["Season"] < year]
     player_data = player_data.drop(columns=['Age','Season', 'Receiving_Lng', "Rushing_Lng"])
-    player_data = player_data.groupby('Name', as_index=False).agg({'G': 'sum', 'GS': 'sum', 'Rushing_Att': 'sum', "Rushing_Yds": 'sum', "Rushing_TD": 'sum', "Receiving_R/G": "mean", "Receiving_Y/G": "mean",
-                                                                   "Fmb": "sum", "AV": "sum", "Awards": "sum", "Rushing_1D": "sum", "Rushing_Succ%": "mean", "Rushing_Y/A": "mean", "Rushing_A/G": "mean",
-                                                                   "Receiving_Tgt": "sum", "Receiving_Rec": "sum", "Receiving_Yds": "sum", "Receiving_Y/R": "mean", "Receiving_TD": "sum", "Receiving_1D": "sum",
-                                                                   "Receiving_Succ%": "mean", "Receiving_Ctch%": "mean", "Receiving_Y/Tgt": "mean"})
+    player_data = player_data.groupby('Name', as_index=False).agg(CAREER_AGGREGATIONS)
 
 
     last_season_stats = last_season_stats.loc[last_season_stats.groupby('Name')['Season'].idxmax()]
@@ -194,6 +218,89 @@ def get_filtered_data(player_data, free_agents, year):
     final_df = final_df.fillna(0).replace('', 0)
     return final_df
 
+def get_filtered_data_by_year(player_data, free_agents_by_year):
+    """
+    Same output as get_filtered_data, for several free agency years in one pass,
+    except that the _last_season columns never come from a career total row.
+
+    Player seasons are filtered, cleaned and sorted once. Running sums (and
+    running counts for the averaged stats) are taken over each player's
+    seasons, so the career totals before any year are just the running values
+    at the player's last season before it.
+
+    Args:
+        player_data (DataFrame): Season-by-season player stats, names without periods
+        free_agents_by_year (dict): Free agency year to the list of free agents from get_free_agent_data
+
+    Returns:
+        dict: Free agency year to its free agent DataFrame
+    """
+    names = {agent["Name"] for free_agents in free_agents_by_year.values() for agent in free_agents}
+    player_data = player_data[player_data['Name'].isin(names)]
+    player_data['Awards'] = player_data['Awards'].apply(lambda x: len(x) if isinstance(x, list) else 0)
+    player_data = player_data.drop(columns=DROPPED_COLUMNS)
+    player_data = player_data.drop_duplicates(subset=['Name', 'Season'], keep='first')
+
+    # Career total rows have no season and never count towards a free agency year
+    player_data['Season'] = pd.to_numeric(player_data['Season'], errors='coerce')
+    player_data = player_data[player_data['Season'].notna()]
+    player_data = player_data.sort_values(['Name', 'Season'], kind='stable').reset_index(drop=True)
+
+    # Each player's seasons are one block of rows
+    player_names = player_data['Name'].to_numpy()
+    new_player = np.r_[True, player_names[1:] != player_names[:-1]] if len(player_names) else np.array([], dtype=bool)
+    groups = np.cumsum(new_player) - 1
+    starts = np.flatnonzero(new_player)
+    ends = np.r_[starts[1:], len(player_data)].astype(int)
+    group_names = pd.Index(player_names[starts])
+
+    # Running totals within each player's career
+    sum_columns = [col for col, how in CAREER_AGGREGATIONS.items() if how == 'sum']
+    mean_columns = [col for col, how in CAREER_AGGREGATIONS.items() if how == 'mean']
+    running_sums = player_data[sum_columns].fillna(0).groupby(groups).cumsum()
+    running_totals = player_data[mean_columns].fillna(0).groupby(groups).cumsum()
+    running_counts = player_data[mean_columns].notna().groupby(groups).cumsum()
+
+    # Last season before each year: search the (player, season) keys sorted above
+    season_keys = groups * 10000 + player_data['Season'].to_numpy(dtype=np.int64)
+    years = list(free_agents_by_year)
+    pair_years, pair_groups = [], []
+    for year in years:
+        agent_groups = group_names.get_indexer(sorted({agent["Name"] for agent in free_agents_by_year[year]}))
+        agent_groups = agent_groups[agent_groups >= 0]
+        pair_groups.append(agent_groups)
+        pair_years.append(np.full(len(agent_groups), int(year), dtype=np.int64))
+    pair_groups = np.concatenate(pair_groups) if pair_groups else np.array([], dtype=np.int64)
+    pair_years = np.concatenate(pair_years) if pair_years else np.array([], dtype=np.int64)
+
+    # Players who had not played before a year are left out of that year
+    rows = np.searchsorted(season_keys, pair_groups * 10000 + pair_years, side='left') - 1
+    played = rows >= starts[pair_groups]
+    pair_groups, pair_years, rows = pair_groups[played], pair_years[played], rows[played]
+
+    # Career totals for every (year, player) pair, followed by the last season played
+    career = {'Name': group_names[pair_groups]}
+    for col in CAREER_AGGREGATIONS:
+        if col in running_sums:
+            career[col] = running_sums[col].to_numpy()[rows]
+        else:
+            counts = running_counts[col].to_numpy()[rows]
+            career[col] = np.where(counts > 0, running_totals[col].to_numpy()[rows] / np.maximum(counts, 1), np.nan)
+    career = pd.DataFrame(career)
+    # The _last_season columns come from the player's latest real season. get_filtered_data's
+    # idxmax over the Season strings picks the "NFL (n Yrs)" career row instead when a page has
+    # one, so for those players these columns differ from get_filtered_data's.
+    last_season_stats = player_data.drop(columns='Name').iloc[ends[pair_groups] - 1].reset_index(drop=True)
+    pairs = pd.merge(career, last_season_stats, left_index=True, right_index=True, suffixes=('', '_last_season'))
+    pairs = pairs.drop(columns='Season')
+
+    filtered_data = {}
+    for year in years:
+        final_df = pairs[pair_years == int(year)]
+        final_df = pd.merge(final_df, pd.DataFrame(free_agents_by_year[year]), on="Name", how="left")
+        filtered_data[year] = final_df.fillna(0).replace('', 0)
+    return filtered_data
+
 def model(train_data, test_data,  columns, model_name, standardize=True):
     d = train_data.copy(deep=True)
     t = test_data.copy(deep=True)
@@ -224,7 +331,7 @@ def main():
     parser.add_argument(
         '--type', 
         type=str, 
-        help="name: gets all running back names; pull: gets data for each year given running back names; sum: sum data before a given year for free agency purposes", 
+        help="name: gets all running back names; pull: gets data for each year given running back names; store: build the binary player stat store from player data; sum: sum data before a given year for free agency purposes; sum_all: sum data for every year in --years in one pass", 
         required=True
     )
     parser.add_argument(
@@ -239,39 +346,103 @@ def main():
         help="file location for player data", 
         required=False
     )
+    parser.add_argument(
+        '--store', 
+        type=str, 
+        help=f"directory of the binary player stat store (built with --type store, default {DEFAULT_STORE_DIR})", 
+        required=False
+    )
     parser.add_argument(
         '--year', 
         type=str, 
         help="year of free agency", 
         required=False
     )
+    parser.add_argument(
+        '--checkpoint', 
+        type=str, 
+        default="./data/player_data.checkpoint.jsonl",
+        help="file where pull saves each finished player so an interrupted run can resume", 
+        required=False
+    )
+    parser.add_argument(
+        '--rate', 
+        type=float, 
+        default=5.0,
+        help="requests per minute for pull (default 5)", 
+        required=False
+    )
+    parser.add_argument(
+        '--connections', 
+        type=int, 
+        default=4,
+        help="connections pull fetches pages over at once (default 4)", 
+        required=False
+    )
+    parser.add_argument(
+        '--years', 
+        type=int, 
+        nargs=2,
+        default=[2011, 2025],
+        metavar=('FIRST', 'LAST'),
+        help="first and last year of free agency for sum_all (default 2011 2025)", 
+        required=False
+    )
+    parser.add_argument(
+        '--offline', 
+        action='store_true',
+        help="only use pages already in the HTTP cache (data/http_cache) instead of fetching them", 
+        required=False
+    )
     args = parser.parse_args()
+    if args.offline:
+        http_cache.get_cache().offline = True
     if(args.type == "name"):
         urls = [f"https://www.pro-football-reference.com/players/{letter}/" for letter in string.ascii_uppercase]
         players = pd.DataFrame(columns=['name', 'position', 'years', 'link'])
         for url in tqdm(urls):
-            time.sleep(30)
+            if http_cache.get_cache().lookup(url) is None:
+                time.sleep(30)
             players = pd.concat([players, get_players(url)], ignore_index=True)
         players.to_csv("./data/players.csv", index=False) 
     elif(args.players and args.type == "pull"):
         players = pd.read_csv(args.players)
-        player_data = pd.DataFrame(columns = [
-                                    "Name", "Season", "Age", "Team", "Lg", "Pos", "G", "GS", "Rushing_Att", 
-                                    "Rushing_Yds", "Rushing_TD", "Receiving_Lng", "Receiving_R/G", 
-                                    "Receiving_Y/G", "Scrimmage_Touch", "Scrimmage_Y/Tch", 
-                                    "Scrimmage_YScm", "Scrimmage_RRTD", "Fmb", "AV", "Awards"
-                                    ])
-        for _, player in tqdm(players.iterrows()):
-            player_data = pd.concat([player_data, get_player_data(f'https://www.pro-football-reference.com{player.link}', player.iloc[0])], ignore_index=True)
-            time.sleep(12)
+        # Finished players are saved as they come in, so rerunning after a crash picks up where it stopped
+        checkpoint = Checkpoint(args.checkpoint)
+        asyncio.run(scrape_players(players, checkpoint, parse_player_data,
+                                   requests_per_minute=args.rate, connections=args.connections))
+        player_data = checkpoint.to_frame(players['link'].tolist(), PULL_COLUMNS)
         player_data.to_csv("./data/player_data.csv", index=False)
-    elif(args.data and args.year and args.type == "sum"):
-        player_data = pd.read_csv(args.data)
-        player_data['Name'] = player_data['Name'].str.replace('.', '')
+    elif(args.data and args.type == "store"):
+        store = PlayerStore.build(args.data, args.store or DEFAULT_STORE_DIR)
+        print(f"Stored {len(store.stats)} seasons for {len(store.names)} players in {store.store_dir}")
+    elif((args.data or args.store) and args.year and args.type == "sum"):
         url  = f"https://www.spotrac.com/nfl/free-agents/_/year/{args.year}/position/rb"
         free_agents = get_free_agent_data(url, args.year)
-        free_agent_df = get_filtered_data(player_data, free_agents, args.year)
+        if args.store:
+            # Only the free agents' seasons are read from the memory-mapped store
+            player_data = PlayerStore(args.store).to_frame([agent["Name"] for agent in free_agents])
+            year = int(args.year)
+        else:
+            player_data = pd.read_csv(args.data)
+            player_data['Name'] = player_data['Name'].str.replace('.', '')
+            year = args.year
+        free_agent_df = get_filtered_data(player_data, free_agents, year)
         free_agent_df.to_csv(f"./data/freeAgents{args.year}.csv", index=False) 
+    elif((args.data or args.store) and args.type == "sum_all"):
+        free_agents_by_year = {}
+        for year in tqdm(range(args.years[0], args.years[1] + 1)):
+            url  = f"https://www.spotrac.com/nfl/free-agents/_/year/{year}/position/rb"
+            free_agents_by_year[year] = get_free_agent_data(url, str(year))
+        names = [agent["Name"] for free_agents in free_agents_by_year.values() for agent in free_agents]
+        if args.store:
+            player_data = PlayerStore(args.store).to_frame(names)
+        else:
+            player_data = pd.read_csv(args.data)
+            player_data['Name'] = player_data['Name'].str.replace('.', '')
+        # Player data is read and summed once for all years
+        for year, free_agent_df in get_filtered_data_by_year(player_data, free_agents_by_year).items():
+            free_agent_df.to_csv(f"./data/freeAgents{year}.csv", index=False) 
 
     elif(args.data and args.type == "model"):
         dfs =  [pd.read_csv(f'{args.data}{year}.csv') for year in range(2011,2025)]
@@ -0,0 +1,89 @@
+"""
+Shared fixtures: a local stand-in HTTP server for the scrapers, and an empty
+HTTP cache per test so no test reads pages cached by another or by a real run.
+"""
+
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES_DIR = os.path.join(PROJECT_ROOT, "tests", "fixtures")
+
+# The model package is imported from the project root, as main.py does; the scrapers
+# import each other as top-level modules, the way they are run
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "scripts"))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "scripts", "madden-scraper"))
+
+import http_cache
+
+class StandInServer:
+    """
+    Serves canned responses by path and records every request it gets.
+
+    Each path has a list of responses. They are served in order and the
+    last one is repeated, so [busy, page] answers 429 once and then the page.
+    Paths without responses get a 404.
+    """
+    def __init__(self):
+        self.routes = {}
+        self.requests = []
+        self.lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with server.lock:
+                    server.requests.append(self.path)
+                    responses = server.routes.get(self.path)
+                    response = (responses.pop(0) if len(responses) > 1 else responses[0]) if responses else None
+                if response is None:
+                    response = {'status': 404, 'body': b"Not found"}
+                body = response.get('body', b"")
+                self.send_response(response.get('status', 200))
+                headers = {'Content-Length': str(len(body)), **response.get('headers', {})}
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                # A truncated response announces the whole body but stops part way and hangs up
+                self.wfile.write(body[:response.get('send_bytes', len(body))])
+                self.close_connection = True
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def add(self, path, body=b"", status=200, headers=None, send_bytes=None):
+        """Queue a response for a path, after any already queued."""
+        if isinstance(body, str):
+            body = body.encode()
+        response = {'status': status, 'body': body, 'headers': headers or {}}
+        if send_bytes is not None:
+            response['send_bytes'] = send_bytes
+        self.routes.setdefault(path, []).append(response)
+
+    def count(self, path):
+        """Number of requests for a path so far."""
+        with self.lock:
+            return self.requests.count(path)
+
+@pytest.fixture
+def server():
+    stand_in = StandInServer()
+    stand_in.thread.start()
+    yield stand_in
+    stand_in.httpd.shutdown()
+    stand_in.httpd.server_close()
+
+@pytest.fixture(autouse=True)
+def empty_http_cache(tmp_path, monkeypatch):
+    """Point the shared HTTP cache at an empty directory for the test."""
+    cache = http_cache.HttpCache(cache_dir=str(tmp_path / "http_cache"))
+    monkeypatch.setattr(http_cache, "_default_cache", cache)
+    return cache
@@ -0,0 +1,122 @@
+"""
+Madden workbook downloads (scripts/madden-scraper/madden_script.py) against
+a local stand-in for maddenratings.weebly.com.
+"""
+
+import io
+import os
+import asyncio
+import zipfile
+import pytest
+
+from madden_script import check_workbook, download_all
+from manifest import get_file_hash, load_manifest
+
+CONTENT_TYPES = b'<?xml version="1.0"?><Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types"/>'
+WORKBOOK = b'<?xml version="1.0"?><workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"/>'
+
+GOOD = "/uploads/arizona_cardinals_madden_nfl_15.xlsx"
+OTHER = "/uploads/atlanta_falcons_madden_nfl_15.xlsx"
+FILENAMES = {GOOD: "madden_15_arizona_cardinals.xlsx", OTHER: "madden_15_atlanta_falcons.xlsx"}
+
+def make_workbook(team):
+    """Bytes of a minimal xlsx workbook, stored uncompressed so a flipped byte fails only the CRC check."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_STORED) as workbook:
+        workbook.writestr('[Content_Types].xml', CONTENT_TYPES)
+        workbook.writestr('xl/workbook.xml', WORKBOOK)
+        workbook.writestr('xl/worksheets/sheet1.xml', f'<worksheet><team>{team}</team></worksheet>')
+    return buffer.getvalue()
+
+def with_bad_crc(body):
+    # Same length and a valid archive layout, but one member's bytes no longer match its CRC
+    position = body.index(b'<team>') + len(b'<team>')
+    return body[:position] + bytes([body[position] ^ 0x20]) + body[position + 1:]
+
+def serve_year_page(server, links=(GOOD, OTHER)):
+    anchors = ''.join(f'<a href="{link}">{os.path.basename(link)}</a>' for link in links)
+    server.add("/madden-nfl-15.html", f"<html><body>{anchors}</body></html>", headers={'Content-Type': 'text/html'})
+
+def download(server, tmp_path):
+    return asyncio.run(download_all([15], str(tmp_path / "ratings"), str(tmp_path / "manifest.json"), server.url,
+                                    connections=2, requests_per_second=1000, retries=1, backoff=0))[15]
+
+def test_good_workbook_is_saved_and_recorded(server, tmp_path):
+    serve_year_page(server, [GOOD])
+    body = make_workbook("ARI")
+    server.add(GOOD, body)
+
+    stats = download(server, tmp_path)
+
+    path = tmp_path / "ratings" / FILENAMES[GOOD]
+    assert stats['downloaded'] == 1 and stats['failed'] == 0
+    assert path.read_bytes() == body
+    entry = load_manifest(str(tmp_path / "manifest.json"))[FILENAMES[GOOD]]
+    assert entry == {'url': f"{server.url}{GOOD}", 'size': len(body), 'sha256': get_file_hash(str(path))}
+
+@pytest.mark.parametrize("response", [
+    {'send_bytes': 100},                      # Cut off part way through the body
+    {'headers': {'Content-Length': '5000'}},  # Announces more bytes than it sends
+])
+def test_incomplete_download_is_rejected(server, tmp_path, response):
+    serve_year_page(server, [GOOD])
+    body = make_workbook("ARI")
+    server.add(GOOD, body, **response)
+
+    stats = download(server, tmp_path)
+
+    ratings_dir = tmp_path / "ratings"
+    assert stats['failed'] == 1 and stats['downloaded'] == 0
+    assert server.count(GOOD) == 2  # Retried once
+    assert not (ratings_dir / FILENAMES[GOOD]).exists()
+    assert not (ratings_dir / f"{FILENAMES[GOOD]}.part").exists()
+    assert load_manifest(str(tmp_path / "manifest.json")) == {}
+
+def test_incomplete_download_keeps_previous_file(server, tmp_path):
+    serve_year_page(server, [GOOD])
+    server.add(GOOD, make_workbook("ARI"), send_bytes=100)
+    ratings_dir = tmp_path / "ratings"
+    ratings_dir.mkdir()
+    previous = make_workbook("old ARI")
+    (ratings_dir / FILENAMES[GOOD]).write_bytes(previous)
+
+    download(server, tmp_path)
+
+    assert (ratings_dir / FILENAMES[GOOD]).read_bytes() == previous
+    assert os.listdir(ratings_dir) == [FILENAMES[GOOD]]
+
+@pytest.mark.parametrize("body", [
+    b"<html><body>Sorry, this page is unavailable</body></html>",
+    with_bad_crc(make_workbook("ARI")),
+], ids=["not_a_zip", "bad_crc"])
+def test_invalid_workbook_fails_validation(server, tmp_path, body):
+    serve_year_page(server, [GOOD])
+    server.add(GOOD, body)
+
+    stats = download(server, tmp_path)
+
+    assert stats['failed'] == 1
+    assert not (tmp_path / "ratings" / FILENAMES[GOOD]).exists()
+    assert os.listdir(tmp_path / "ratings") == []
+
+    path = tmp_path / "invalid.xlsx"
+    path.write_bytes(body)
+    with pytest.raises(ValueError):
+        check_workbook(str(path))
+
+def test_second_run_skips_matching_files(server, tmp_path):
+    serve_year_page(server)
+    server.add(GOOD, make_workbook("ARI"))
+    server.add(OTHER, make_workbook("ATL"))
+
+    first = download(server, tmp_path)
+    assert first['downloaded'] == 2
+
+    # A file changed on disk no longer matches the manifest, so only it is downloaded again
+    (tmp_path / "ratings" / FILENAMES[OTHER]).write_bytes(make_workbook("ATL, edited"))
+    second = download(server, tmp_path)
+
+    assert second['skipped'] == 1 and second['downloaded'] == 1
+    assert server.count(GOOD) == 1
+    assert server.count(OTHER) == 2
+    assert (tmp_path / "ratings" / FILENAMES[OTHER]).read_bytes() == make_workbook("ATL")
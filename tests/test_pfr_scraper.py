@@ -0,0 +1,127 @@
+"""
+Concurrent player page scraping (scripts/pfr_scraper.py) against a local
+stand-in for pro-football-reference serving saved player pages.
+"""
+
+import os
+import json
+import asyncio
+import pandas as pd
+
+import http_cache
+from pfr_scraper import Checkpoint, scrape_players
+from rb_data import PULL_COLUMNS, get_player_data, parse_player_data
+from conftest import FIXTURES_DIR
+
+PAGES = {
+    "/players/B/BarkSa00.htm": "Saquon Barkley",
+    "/players/E/EkelAu00.htm": "Austin Ekeler",
+}
+MISSING_PAGE = "/players/Z/ZzzzZz00.htm"
+
+def serve_pages(server, busy=()):
+    """Serve the saved pages, answering 429 once first for the links in busy."""
+    for link in PAGES:
+        if link in busy:
+            server.add(link, status=429, headers={'Retry-After': '0'})
+        with open(os.path.join(FIXTURES_DIR, "player_pages", os.path.basename(link)), encoding="utf-8") as f:
+            server.add(link, f.read(), headers={'Content-Type': 'text/html; charset=utf-8'})
+
+def get_players(links):
+    return pd.DataFrame({'name': [PAGES.get(link, "Nobody") for link in links], 'link': links})
+
+def scrape(server, players, checkpoint):
+    return asyncio.run(scrape_players(players, checkpoint, parse_player_data, base_url=server.url,
+                                      requests_per_minute=6000, connections=2, retries=2, backoff=0))
+
+def test_checkpoint_has_a_line_per_player(server, tmp_path):
+    serve_pages(server)
+    path = tmp_path / "player_data.checkpoint.jsonl"
+    links = list(PAGES) + [MISSING_PAGE]
+
+    fetched = scrape(server, get_players(links), Checkpoint(str(path)))
+
+    assert fetched == 3
+    with open(path) as f:
+        records = {record['link']: record for record in map(json.loads, f)}
+    assert set(records) == set(links)
+    # A page that does not exist is saved without rows, so it is not asked for again
+    assert records[MISSING_PAGE]['data'] == []
+    assert len(records["/players/B/BarkSa00.htm"]['data']) == 4
+
+def test_rerun_fetches_only_missing_players(server, tmp_path, monkeypatch):
+    serve_pages(server)
+    path = str(tmp_path / "player_data.checkpoint.jsonl")
+    first, second = list(PAGES)
+
+    scrape(server, get_players([first]), Checkpoint(path))
+    assert server.count(first) == 1
+
+    # A fresh cache, so only the checkpoint can keep the first player from being fetched again
+    monkeypatch.setattr(http_cache, "_default_cache", http_cache.HttpCache(cache_dir=str(tmp_path / "fresh_cache")))
+    checkpoint = Checkpoint(path)
+    fetched = scrape(server, get_players([first, second]), checkpoint)
+
+    assert fetched == 1
+    assert server.count(first) == 1
+    assert server.count(second) == 1
+    assert checkpoint.is_done(first) and checkpoint.is_done(second)
+
+def test_parse_error_is_recorded_and_retried(server, tmp_path, monkeypatch):
+    serve_pages(server)
+    path = str(tmp_path / "player_data.checkpoint.jsonl")
+    broken, working = list(PAGES)
+
+    def parse(html, name):
+        if name == PAGES[broken]:
+            raise ValueError("unexpected table layout")
+        return parse_player_data(html, name)
+
+    # The other worker keeps going and the failure is written down
+    fetched = asyncio.run(scrape_players(get_players(list(PAGES)), Checkpoint(path), parse, base_url=server.url,
+                                         requests_per_minute=6000, connections=2, retries=2, backoff=0))
+    assert fetched == 2
+    checkpoint = Checkpoint(path)
+    assert checkpoint.is_done(working) and not checkpoint.is_done(broken)
+    assert checkpoint.failures[broken]['error'] == "ValueError: unexpected table layout"
+
+    # The next run parses only the failed player again
+    monkeypatch.setattr(http_cache, "_default_cache", http_cache.HttpCache(cache_dir=str(tmp_path / "fresh_cache")))
+    fetched = scrape(server, get_players(list(PAGES)), checkpoint)
+    assert fetched == 1
+    assert server.count(working) == 1
+    checkpoint = Checkpoint(path)
+    assert checkpoint.is_done(broken) and not checkpoint.failures
+    assert len(checkpoint.to_frame([broken])) == 4
+
+def test_busy_response_is_retried(server, tmp_path):
+    busy = "/players/E/EkelAu00.htm"
+    serve_pages(server, busy=[busy])
+    checkpoint = Checkpoint(str(tmp_path / "player_data.checkpoint.jsonl"))
+
+    scrape(server, get_players(list(PAGES)), checkpoint)
+
+    assert server.count(busy) == 2
+    assert checkpoint.is_done(busy)
+    assert len(checkpoint.to_frame([busy])) == 3
+
+def test_player_data_matches_serial_pull(server, tmp_path):
+    serve_pages(server, busy=["/players/B/BarkSa00.htm"])
+    links = list(PAGES) + [MISSING_PAGE]
+    players = get_players(links)
+    checkpoint = Checkpoint(str(tmp_path / "player_data.checkpoint.jsonl"))
+
+    # The concurrent pull, assembled the way rb_data.py --type pull writes player_data.csv
+    scrape(server, players, checkpoint)
+    concurrent_path = tmp_path / "player_data.csv"
+    checkpoint.to_frame(players['link'].tolist(), PULL_COLUMNS).to_csv(concurrent_path, index=False)
+
+    # The original serial pull: one get_player_data after another
+    serial = pd.DataFrame(columns=PULL_COLUMNS)
+    for _, player in players.iterrows():
+        serial = pd.concat([serial, get_player_data(f"{server.url}{player.link}", player.iloc[0])], ignore_index=True)
+    serial_path = tmp_path / "player_data_serial.csv"
+    serial.to_csv(serial_path, index=False)
+
+    assert concurrent_path.read_text() == serial_path.read_text()
+    assert len(pd.read_csv(concurrent_path)) == 7
@@ -0,0 +1,33 @@
+"""
+Auctions and free agency rounds (model/simulation.py) with cap space that is
+unknown or that no team can bid with.
+"""
+
+import numpy as np
+
+from model.need_matrix import NeedMatrix
+from model.simulation import run_auctions, run_auction_for_player, run_free_agency
+
+def test_unknown_cap_does_not_bid():
+    winners, winning_bids = run_auctions([[1, 2, 3]], np.array([np.nan, 5.0, 5.0]))
+
+    assert winners.tolist() == [2]
+    assert winning_bids.tolist() == [3.2]
+
+def test_no_bidders_means_no_winner():
+    winners, _ = run_auctions([[1, 2]], np.array([np.nan, np.nan]))
+    assert winners.tolist() == [-1]
+
+    need_matrix = NeedMatrix.from_values(np.array([[1.0, 2.0]]), ["Player"], ["A", "B"])
+    assert run_auction_for_player("Player", need_matrix, np.array([np.nan, np.nan])) == (None, None)
+
+def test_free_agency_with_unknown_cap():
+    need_matrix = NeedMatrix.from_values(np.array([[3.0, 1.0], [2.0, 1.5]]), ["P1", "P2"], ["A", "B"])
+    team_caps = {"A": np.nan, "B": 10.0}
+
+    draft_picks, contract_amounts = run_free_agency(need_matrix, team_caps, verbose=False)
+
+    # A can never bid, so B signs the first player nominated and the other goes unsigned
+    assert draft_picks == {"B": "P1"}
+    assert contract_amounts == {"B": 1.0}
+    assert np.isnan(team_caps["A"]) and team_caps["B"] == 9.0